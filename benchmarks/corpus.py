@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List
+
+# Histories end here, so runs are reproducible regardless of the date
+END = int(datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp())
+LANGUAGES = ["Python", "Go", "TypeScript", "Rust", "Java", None]
+
+
+def _hash(*parts: object) -> int:
+    key = "|".join(map(str, parts)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def _iso(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+@dataclass(frozen=True)
+class SyntheticRepo:
+    """
+    One repository's commit history, computed on demand: commit ``i``
+    (0 = oldest) falls in its own slot of an evenly divided span, so
+    any page can be produced without materializing the others.
+    """
+
+    owner: str
+    name: str
+    commits: int
+    span_days: int
+    seed: int
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+    @property
+    def _slot(self) -> float:
+        return self.span_days * 86400 / max(self.commits, 1)
+
+    def timestamp(self, index: int) -> int:
+        jitter = (_hash(self.seed, self.name, index) % 1000) / 2000  # [0, 0.5)
+        start = END - self.span_days * 86400
+        return int(start + (index + jitter) * self._slot)
+
+    def index_range(self, since: int | None, until: int | None) -> range:
+        """
+        Indices of the commits dated within [since, until].
+        """
+        indices = range(self.commits)
+        low = bisect_left(indices, since, key=self.timestamp) if since else 0
+        high = (
+            bisect_left(indices, until + 1, key=self.timestamp)
+            if until is not None
+            else self.commits
+        )
+        return range(low, high)
+
+    def commit(self, index: int) -> dict:
+        """
+        A commit shaped like the REST API's list entries, including the
+        fields a real payload spends its bytes on.
+        """
+        sha = hashlib.sha1(f"{self.full_name}:{index}".encode()).hexdigest()
+        login = f"dev{_hash(self.seed, self.name, index, 'author') % 25}"
+        date = _iso(self.timestamp(index))
+        person = {"name": login, "email": f"{login}@example.com", "date": date}
+        url = f"https://api.github.com/repos/{self.full_name}"
+        user = {
+            "login": login,
+            "id": _hash(login) % 10**8,
+            "type": "User",
+            "url": f"https://api.github.com/users/{login}",
+            "html_url": f"https://github.com/{login}",
+        }
+        return {
+            "sha": sha,
+            "node_id": f"C_{sha[:20]}",
+            "commit": {
+                "author": person,
+                "committer": person,
+                "message": f"Change {index} in {self.name}\n\nSynthetic commit.",
+                "tree": {"sha": sha[::-1], "url": f"{url}/git/trees/{sha[::-1]}"},
+                "url": f"{url}/git/commits/{sha}",
+                "comment_count": 0,
+                "verification": {"verified": False, "reason": "unsigned"},
+            },
+            "url": f"{url}/commits/{sha}",
+            "html_url": f"https://github.com/{self.full_name}/commit/{sha}",
+            "comments_url": f"{url}/commits/{sha}/comments",
+            "author": user,
+            "committer": user,
+            "parents": [],
+        }
+
+    def metadata(self) -> dict:
+        pushed_at = _iso(self.timestamp(self.commits - 1)) if self.commits else None
+        return {
+            "name": self.name,
+            "full_name": self.full_name,
+            "fork": False,
+            "size": 100 + self.commits,
+            "language": LANGUAGES[_hash(self.seed, self.name) % len(LANGUAGES)],
+            "created_at": _iso(END - self.span_days * 86400),
+            "updated_at": pushed_at,
+            "pushed_at": pushed_at,
+        }
+
+
+class SyntheticCorpus:
+    """
+    Deterministic users/orgs with ``repos`` repositories each and
+    ``commits`` commits spread over them with a long-tailed distribution,
+    like real accounts: a few busy repositories and many quiet ones.
+    """
+
+    def __init__(
+        self, owners: List[str], repos: int, commits: int, seed: int = 0
+    ) -> None:
+        self.seed = seed
+        self.repos: Dict[str, List[SyntheticRepo]] = {}
+        self._by_name: Dict[str, SyntheticRepo] = {}
+
+        weights = [1 / (i + 1) ** 0.8 for i in range(repos)]
+        scale = commits / sum(weights) if weights else 0
+        counts = [int(w * scale) for w in weights]
+        if counts:
+            counts[0] += commits - sum(counts)
+
+        for owner in owners:
+            listing = []
+            for i, count in enumerate(counts):
+                repo = SyntheticRepo(
+                    owner=owner,
+                    name=f"repo-{i:05d}",
+                    commits=count,
+                    span_days=30 + _hash(seed, owner, i) % 1500,
+                    seed=seed,
+                )
+                listing.append(repo)
+                self._by_name[repo.full_name] = repo
+            self.repos[owner] = listing
+
+    def repo(self, full_name: str) -> SyntheticRepo | None:
+        return self._by_name.get(full_name)
+
+    @property
+    def total_commits(self) -> int:
+        return sum(repo.commits for repo in self._by_name.values())
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.corpus import SyntheticCorpus
+
+RATE_LIMIT_HEADERS = {
+    "X-RateLimit-Limit": "1000000",
+    "X-RateLimit-Remaining": "1000000",
+    "X-RateLimit-Reset": "4102444800",  # 2100-01-01
+}
+
+
+def _epoch(value: str | None) -> int | None:
+    if not value:
+        return None
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+class MockGitHubServer(ThreadingHTTPServer):
+    """
+    Serves a SyntheticCorpus through the REST endpoints GitHubClient
+    uses: ``/users/{u}/repos``, ``/orgs/{o}/repos`` and
+    ``/repos/{owner}/{repo}/commits``, with page/per_page pagination,
+    since/until filtering, ETags and 304 revalidation.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self, corpus: SyntheticCorpus, address: Tuple[str, int] = ("127.0.0.1", 0)
+    ) -> None:
+        self.corpus = corpus
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        super().__init__(address, _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockGitHubServer:
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def record(self, status: int, size: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.not_modified += status == 304
+            self.bytes_sent += size
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockGitHubServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        status, body = self._route(url.path.strip("/").split("/"), query)
+        data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+        # The corpus never changes, so a content hash is a stable ETag
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+
+        self.send_response(status)
+        for name, value in RATE_LIMIT_HEADERS.items():
+            self.send_header(name, value)
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        # Counted before anything goes out (end_headers already completes
+        # an empty 304), so a client that has its response sees it counted
+        self.server.record(status, len(data))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self, parts: list, query: dict) -> Tuple[int, object]:
+        corpus = self.server.corpus
+        page = max(int(query.get("page", 1)), 1)
+        per_page = min(max(int(query.get("per_page", 30)), 1), 100)
+        start = (page - 1) * per_page
+
+        if len(parts) == 3 and parts[0] in ("users", "orgs") and parts[2] == "repos":
+            repos = corpus.repos.get(parts[1])
+            if repos is None:
+                return 404, {"message": "Not Found"}
+            return 200, [r.metadata() for r in repos[start:start + per_page]]
+
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "commits":
+            repo = corpus.repo(f"{parts[1]}/{parts[2]}")
+            if repo is None:
+                return 404, {"message": "Not Found"}
+            indices = repo.index_range(
+                _epoch(query.get("since")), _epoch(query.get("until"))
+            )
+            # Newest first, like the API
+            newest_first = indices[::-1][start:start + per_page]
+            return 200, [repo.commit(i) for i in newest_first]
+
+        return 404, {"message": "Not Found"}
+
+    def log_message(self, format: str, *args) -> None:
+        pass
@@ -0,0 +1,194 @@
+"""
+Offline benchmarks: analyze a synthetic account served by a local mock
+of the GitHub REST API, with a cold cache, a warm cache and a stale cache
+that is revalidated with 304s.
+
+    python -m benchmarks.run run --preset medium --workers 8
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import typer
+
+from benchmarks.corpus import SyntheticCorpus
+from benchmarks.mock_github import MockGitHubServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OWNER = "bench"
+
+# name -> (repositories, commits)
+PRESETS = {
+    "tiny": (3, 100),
+    "small": (10, 1_000),
+    "medium": (1_000, 100_000),
+    "large": (10_000, 1_000_000),
+}
+
+# cold: empty cache; warm: fresh HTTP cache and commit timelines;
+# revalidate: timelines dropped and every HTTP entry stale, so each page
+# is revalidated (and answered with a 304)
+PHASES = ("cold", "warm", "revalidate")
+
+app = typer.Typer(help="Offline benchmarks against a mock GitHub API")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@app.command()
+def phase(
+    api_url: str,
+    cache_dir: str,
+    kind: str = "user",
+    ttl: int = 3600,
+    workers: int = 1,
+    cache_backend: str = "sqlite",
+):
+    """
+    One timed analysis in a fresh process; prints a JSON result line.
+    """
+    from core.github_client import GitHubClient
+    from core.use_cases import analyze_repositories
+
+    # A fixed token keeps any real GITHUB_TOKEN away from the mock
+    client = GitHubClient(
+        token="bench",
+        cache_dir=cache_dir,
+        ttl_seconds=ttl,
+        workers=workers,
+        cache_backend=cache_backend,
+        api_url=api_url,
+    )
+    start = time.perf_counter()
+    if kind == "org":
+        repos = list(client.iter_org_repositories(OWNER))
+    else:
+        repos = list(client.iter_user_repositories(OWNER))
+    analyze_repositories(client, repos, fmt="json")
+    elapsed = time.perf_counter() - start
+
+    stats = client.stats.to_dict()
+    typer.echo(
+        json.dumps(
+            {
+                "seconds": round(elapsed, 3),
+                "repos": len(repos),
+                "peak_rss_mb": _peak_rss_mb(),
+                **stats,
+            }
+        )
+    )
+
+
+def _run_phase(name: str, server: MockGitHubServer, cache_dir: str, **options) -> dict:
+    ttl = 0 if name == "revalidate" else 3600
+    if name == "revalidate":
+        from core.timeline_store import TimelineStore
+
+        TimelineStore(os.path.join(cache_dir, "timelines"), 0).clear()
+
+    command = [
+        sys.executable, "-m", "benchmarks.run", "phase", server.url, cache_dir,
+        "--ttl", str(ttl),
+    ]
+    for option, value in options.items():
+        command += [f"--{option.replace('_', '-')}", str(value)]
+    result = subprocess.run(
+        command, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _row(name: str, result: dict, commits: int) -> str:
+    counters = result["counters"]
+    seconds = result["seconds"] or 1e-9
+    rss = result["peak_rss_mb"]
+    return (
+        f"{name:<11}{result['seconds']:>9.2f}{counters['requests']:>10.0f}"
+        f"{counters['revalidations']:>8.0f}{counters['cache_hits']:>8.0f}"
+        f"{counters['bytes_downloaded'] / 1024 / 1024:>9.1f}"
+        f"{commits / seconds:>13,.0f}"
+        + (f"{rss:>10.0f}" if rss is not None else f"{'-':>10}")
+    )
+
+
+@app.command()
+def run(
+    preset: str = typer.Option("small", help=f"Corpus size ({', '.join(PRESETS)})"),
+    repos: Optional[int] = typer.Option(None, help="Override the preset's repos"),
+    commits: Optional[int] = typer.Option(None, help="Override the preset's commits"),
+    kind: str = typer.Option("user", help="Account type to analyze (user, org)"),
+    workers: int = typer.Option(1, help="Concurrent API requests"),
+    cache_backend: str = typer.Option("sqlite", help="Cache store (sqlite, file)"),
+    seed: int = typer.Option(0, help="Corpus seed"),
+    output: Optional[str] = typer.Option(None, help="Also write results as JSON"),
+):
+    """
+    Time cold, warm and revalidation runs over a synthetic corpus.
+    """
+    if preset not in PRESETS:
+        raise typer.BadParameter(f"unknown preset {preset!r}", param_hint="--preset")
+    preset_repos, preset_commits = PRESETS[preset]
+    repos = preset_repos if repos is None else repos
+    commits = preset_commits if commits is None else commits
+
+    corpus = SyntheticCorpus([OWNER], repos=repos, commits=commits, seed=seed)
+    server = MockGitHubServer(corpus).start()
+    typer.echo(
+        f"{kind} with {repos:,} repositories and {corpus.total_commits:,} commits, "
+        f"{workers} worker(s), {cache_backend} cache"
+    )
+    typer.echo(
+        f"{'phase':<11}{'seconds':>9}{'requests':>10}{'304s':>8}{'hits':>8}"
+        f"{'MB':>9}{'commits/s':>13}{'peak MB':>10}"
+    )
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for name in PHASES:
+                results[name] = _run_phase(
+                    name,
+                    server,
+                    cache_dir,
+                    kind=kind,
+                    workers=workers,
+                    cache_backend=cache_backend,
+                )
+                typer.echo(_row(name, results[name], corpus.total_commits))
+    finally:
+        server.stop()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "repos": repos,
+                    "commits": corpus.total_commits,
+                    "kind": kind,
+                    "workers": workers,
+                    "cache_backend": cache_backend,
+                    "phases": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    app()
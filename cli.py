@@ -1,40 +1,260 @@
+import os
 import typer
-from typing import Optional
+from typing import Callable, Iterable, List, Optional
 from typing_extensions import Annotated
 
-from core.github_client import GitHubClient
-from core.use_cases import analyze_repositories
+from core.cache import CACHE_BACKENDS, make_cache
+from core.github_client import (
+    COMMIT_BACKENDS,
+    GITHUB_API_URL,
+    GitHubClient,
+    Repository,
+)
+from core.instrumentation import STATS_FORMATS
+from core.repository_filter import RepositoryFilter
+from core.use_cases import (
+    LOGIN,
+    Target,
+    analyze_batch,
+    analyze_contributors,
+    analyze_repositories,
+    since_iso,
+)
+
+# Modules that pull in NumPy are imported inside the commands that use
+# them; tests/test_startup.py keeps them off the startup path
 
 app = typer.Typer(help="Git Career Telemetry CLI")
+cache_app = typer.Typer(help="Inspect and maintain the API cache")
+app.add_typer(cache_app, name="cache")
+
+MB = 1024 * 1024
+DEFAULT_SINCE_DAYS = 180
+
+def _one_of(choices: Iterable[str]) -> Callable[[str], str]:
+    choices = tuple(choices)
+
+    def check(value: str) -> str:
+        if value not in choices:
+            raise typer.BadParameter(
+                f"must be one of {', '.join(choices)}, not {value!r}"
+            )
+        return value
+
+    return check
+
+
+CacheDir = Annotated[str, typer.Option(help="Cache directory")]
+SinceOpt = Annotated[
+    Optional[int],
+    typer.Option(
+        help="Only analyze commits from the last N days "
+        f"(0 = all; default {DEFAULT_SINCE_DAYS}, none with --incremental)",
+        show_default=False,
+    ),
+]
+BackendOpt = Annotated[
+    str,
+    typer.Option(
+        help="Commit backend (rest, graphql; graphql needs a token)",
+        callback=_one_of(COMMIT_BACKENDS),
+    ),
+]
+CacheBackendOpt = Annotated[
+    str,
+    typer.Option(help="Cache store (sqlite, file)", callback=_one_of(CACHE_BACKENDS)),
+]
+StatsOpt = Annotated[
+    bool, typer.Option("--stats", help="Print request, cache and timing statistics")
+]
+StatsFormatOpt = Annotated[
+    str,
+    typer.Option(
+        help="Statistics format (text, json, prometheus)",
+        callback=_one_of(STATS_FORMATS),
+    ),
+]
+StatsFileOpt = Annotated[
+    Optional[str], typer.Option(help="Write statistics to a file (implies --stats)")
+]
+ExcludeForksOpt = Annotated[
+    bool, typer.Option("--exclude-forks", help="Skip forked repositories")
+]
+ExcludeArchivedOpt = Annotated[
+    bool, typer.Option("--exclude-archived", help="Skip archived repositories")
+]
+MinSizeOpt = Annotated[
+    int, typer.Option(help="Skip repositories under N KB (1 skips empty ones)")
+]
+ActiveWithinOpt = Annotated[
+    int,
+    typer.Option(
+        help="Skip repositories not pushed to or updated in N days (0 = all)"
+    ),
+]
+LanguageOpt = Annotated[
+    Optional[List[str]],
+    typer.Option("--language", help="Only repositories in this language (repeatable)"),
+]
+ExcludeLanguageOpt = Annotated[
+    Optional[List[str]],
+    typer.Option("--exclude-language", help="Skip this language (repeatable)"),
+]
+
+
+def _report_stats(
+    client: GitHubClient, stats: bool, stats_format: str, stats_file: Optional[str]
+) -> None:
+    if not (stats or stats_file):
+        return
+    text = client.stats.format(stats_format)
+    if stats_file:
+        with open(stats_file, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        # stderr, so a report printed to stdout stays parseable
+        typer.echo(text, err=True)
+
+
+def _repo_filter(
+    exclude_forks: bool,
+    exclude_archived: bool,
+    min_size: int,
+    active_within: int,
+    language: Optional[List[str]],
+    exclude_language: Optional[List[str]],
+) -> RepositoryFilter:
+    return RepositoryFilter.from_options(
+        exclude_forks=exclude_forks,
+        exclude_archived=exclude_archived,
+        min_size_kb=min_size,
+        active_since=since_iso(active_within),
+        languages=language or (),
+        exclude_languages=exclude_language or (),
+    )
+
+
+def _filter_repos(
+    repo_filter: RepositoryFilter, repos: list[Repository]
+) -> list[Repository]:
+    kept = repo_filter.apply(repos)
+    if len(kept) < len(repos):
+        typer.echo(f"Skipping {len(repos) - len(kept)} filtered repositories.")
+    return kept
+
+
+def _require_token(client: GitHubClient, backend: str) -> None:
+    # Checked before any request, rather than failing after the listing
+    if backend == "graphql" and not client.token:
+        raise typer.BadParameter(
+            "graphql needs a token; set GITHUB_TOKEN", param_hint="'--backend'"
+        )
+
+
+def _since_window(since: Optional[int], incremental: bool) -> Optional[str]:
+    if not incremental:
+        return since_iso(DEFAULT_SINCE_DAYS if since is None else since)
+    # The since window moves every day, which would invalidate the saved
+    # aggregates; incremental runs track the full history
+    if since is not None:
+        raise typer.BadParameter(
+            "can't be combined with --incremental, which analyzes the full history",
+            param_hint="'--since'",
+        )
+    return None
+
+
+def _parse_targets(lines) -> list[Target]:
+    """
+    Read ``user:NAME`` / ``org:NAME`` lines (a bare name is a user),
+    skipping blank lines and ``#`` comments.
+    """
+    targets: list[Target] = []
+    for number, line in enumerate(lines, start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        kind, _, name = line.rpartition(":")
+        kind = kind.strip().lower() or "user"
+        name = name.strip()
+        if kind not in ("user", "org") or not LOGIN.fullmatch(name):
+            raise typer.BadParameter(f"line {number}: invalid target {line!r}")
+        targets.append((kind, name))
+    return targets
+
 
 @app.command()
 def user(
     username: str,
-    since: int = 180,
+    since: SinceOpt = None,
     fmt: Annotated[
         str, typer.Option("--format", help="Output format (md, html, json)")
     ] = "md",
     output: Optional[str] = typer.Option(None, help="Output file path"),
     ttl: int = typer.Option(12, help="Cache TTL in hours"),
+    workers: int = typer.Option(1, help="Concurrent API requests"),
+    backend: BackendOpt = "rest",
+    cache_backend: CacheBackendOpt = "sqlite",
+    cache_max_mb: int = typer.Option(
+        0, help="Evict least recently used entries above N MB (0 = unlimited)"
+    ),
+    incremental: bool = typer.Option(
+        False, help="Only fetch commits newer than the previous run"
+    ),
+    exclude_forks: ExcludeForksOpt = False,
+    exclude_archived: ExcludeArchivedOpt = False,
+    min_size: MinSizeOpt = 0,
+    active_within: ActiveWithinOpt = 0,
+    language: LanguageOpt = None,
+    exclude_language: ExcludeLanguageOpt = None,
+    stats: StatsOpt = False,
+    stats_format: StatsFormatOpt = "text",
+    stats_file: StatsFileOpt = None,
 ):
     """
     Analyze consistency for a specific GitHub user.
     """
-    client = GitHubClient(ttl_seconds=ttl * 3600)
+    since_window = _since_window(since, incremental)
+    client = GitHubClient(
+        ttl_seconds=ttl * 3600,
+        workers=workers,
+        cache_backend=cache_backend,
+        cache_max_bytes=cache_max_mb * MB or None,
+    )
+    _require_token(client, backend)
     typer.echo(f"Fetching repositories for user: {username}...")
-    repos = list(client.iter_user_repositories(username))
+    repo_filter = _repo_filter(
+        exclude_forks,
+        exclude_archived,
+        min_size,
+        active_within,
+        language,
+        exclude_language,
+    )
+    repos = _filter_repos(repo_filter, list(client.iter_user_repositories(username)))
     
     if not repos:
         typer.echo("No repositories found.")
         raise typer.Exit(code=1)
         
     typer.echo(f"Found {len(repos)} repositories. Analyzing...")
-    result = analyze_repositories(client, repos, output_path=output, fmt=fmt)
+    from core.state import AnalysisState
+
+    result = analyze_repositories(
+        client,
+        repos,
+        output_path=output,
+        fmt=fmt,
+        since=since_window,
+        backend=backend,
+        state=AnalysisState.in_dir(".cache") if incremental else None,
+    )
     
     if not output:
         typer.echo(result)
     else:
         typer.echo(f"Report saved to {output}")
+    _report_stats(client, stats, stats_format, stats_file)
 
 @app.command()
 def org(
@@ -43,13 +263,62 @@ def org(
     fmt: Annotated[str, typer.Option("--format")] = "md",
     output: Optional[str] = None,
     ttl: int = 12,
+    workers: int = typer.Option(1, help="Concurrent API requests"),
+    backend: BackendOpt = "rest",
+    cache_backend: CacheBackendOpt = "sqlite",
+    cache_max_mb: int = typer.Option(
+        0, help="Evict least recently used entries above N MB (0 = unlimited)"
+    ),
+    incremental: bool = typer.Option(
+        False, help="Only fetch commits newer than the previous run"
+    ),
+    by_contributor: bool = typer.Option(
+        False, help="Report consistency per contributor instead of per org"
+    ),
+    exclude_forks: ExcludeForksOpt = False,
+    exclude_archived: ExcludeArchivedOpt = False,
+    min_size: MinSizeOpt = 0,
+    active_within: ActiveWithinOpt = 0,
+    language: LanguageOpt = None,
+    exclude_language: ExcludeLanguageOpt = None,
+    stats: StatsOpt = False,
+    stats_format: StatsFormatOpt = "text",
+    stats_file: StatsFileOpt = None,
 ):
     """
     Analyze consistency for a GitHub organization.
     """
-    client = GitHubClient(ttl_seconds=ttl * 3600)
+    # Per-contributor analysis needs each commit's author, which neither
+    # the graphql backend nor the incremental aggregates keep
+    if by_contributor and backend != "rest":
+        raise typer.BadParameter(
+            "--by-contributor only supports the rest backend",
+            param_hint="'--backend'",
+        )
+    if by_contributor and incremental:
+        raise typer.BadParameter(
+            "--by-contributor can't be combined with --incremental",
+            param_hint="'--incremental'",
+        )
+    client = GitHubClient(
+        ttl_seconds=ttl * 3600,
+        workers=workers,
+        cache_backend=cache_backend,
+        cache_max_bytes=cache_max_mb * MB or None,
+    )
+    _require_token(client, backend)
     typer.echo(f"Fetching repositories for org: {organization}...")
-    repos = list(client.iter_org_repositories(organization))
+    repo_filter = _repo_filter(
+        exclude_forks,
+        exclude_archived,
+        min_size,
+        active_within,
+        language,
+        exclude_language,
+    )
+    repos = _filter_repos(
+        repo_filter, list(client.iter_org_repositories(organization))
+    )
     
     if top:
         repos = repos[:top]
@@ -59,12 +328,209 @@ def org(
         raise typer.Exit(code=1)
 
     typer.echo(f"Found {len(repos)} repositories. Analyzing...")
-    result = analyze_repositories(repos, output_path=output, fmt=fmt)
+    if by_contributor:
+        result = analyze_contributors(client, repos, output_path=output, fmt=fmt)
+    else:
+        from core.state import AnalysisState
+
+        result = analyze_repositories(
+            client,
+            repos,
+            output_path=output,
+            fmt=fmt,
+            backend=backend,
+            state=AnalysisState.in_dir(".cache") if incremental else None,
+        )
 
     if not output:
         typer.echo(result)
     else:
         typer.echo(f"Report saved to {output}")
+    _report_stats(client, stats, stats_format, stats_file)
+
+
+@app.command()
+def batch(
+    targets_file: typer.FileText = typer.Argument(
+        "-", help="Targets, one per line: user:NAME or org:NAME (- reads stdin)"
+    ),
+    output_dir: str = typer.Option(
+        "reports/batch", help="Directory for per-target reports and the summary"
+    ),
+    since: SinceOpt = None,
+    top: int = typer.Option(None, help="Limit each org to its top N repositories"),
+    fmt: Annotated[
+        str, typer.Option("--format", help="Output format (md, html, json)")
+    ] = "md",
+    ttl: int = typer.Option(12, help="Cache TTL in hours"),
+    workers: int = typer.Option(1, help="Concurrent API requests"),
+    backend: BackendOpt = "rest",
+    cache_backend: CacheBackendOpt = "sqlite",
+    cache_max_mb: int = typer.Option(
+        0, help="Evict least recently used entries above N MB (0 = unlimited)"
+    ),
+    incremental: bool = typer.Option(
+        False, help="Only fetch commits newer than the previous run"
+    ),
+    exclude_forks: ExcludeForksOpt = False,
+    exclude_archived: ExcludeArchivedOpt = False,
+    min_size: MinSizeOpt = 0,
+    active_within: ActiveWithinOpt = 0,
+    language: LanguageOpt = None,
+    exclude_language: ExcludeLanguageOpt = None,
+    stats: StatsOpt = False,
+    stats_format: StatsFormatOpt = "text",
+    stats_file: StatsFileOpt = None,
+):
+    """
+    Analyze many users and organizations with one shared client and cache.
+    """
+    since_window = _since_window(since, incremental)
+    targets = _parse_targets(targets_file)
+    if not targets:
+        typer.echo("No targets given.")
+        raise typer.Exit(code=1)
+
+    client = GitHubClient(
+        ttl_seconds=ttl * 3600,
+        workers=workers,
+        cache_backend=cache_backend,
+        cache_max_bytes=cache_max_mb * MB or None,
+    )
+    _require_token(client, backend)
+    typer.echo(f"Analyzing {len(targets)} targets...")
+    from core.state import AnalysisState
+
+    result = analyze_batch(
+        client,
+        targets,
+        output_dir=output_dir,
+        fmt=fmt,
+        since=since_window,
+        backend=backend,
+        state=AnalysisState.in_dir(".cache") if incremental else None,
+        top=top,
+        repo_filter=_repo_filter(
+            exclude_forks,
+            exclude_archived,
+            min_size,
+            active_within,
+            language,
+            exclude_language,
+        ),
+    )
+    typer.echo(result)
+    typer.echo(f"Reports saved to {output_dir}")
+    _report_stats(client, stats, stats_format, stats_file)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to bind"),
+    port: int = typer.Option(8000, help="Port to listen on"),
+    max_concurrency: int = typer.Option(
+        4, help="Analyses running at once (each uses --workers requests)"
+    ),
+    ttl: int = typer.Option(12, help="Cache TTL in hours"),
+    workers: int = typer.Option(1, help="Concurrent API requests per analysis"),
+    cache_backend: CacheBackendOpt = "sqlite",
+    cache_max_mb: int = typer.Option(
+        0, help="Evict least recently used entries above N MB (0 = unlimited)"
+    ),
+    api_url: str = typer.Option(GITHUB_API_URL, help="GitHub REST API base URL"),
+):
+    """
+    Serve JSON reports over HTTP from one warm client and cache.
+    """
+    from core.server import TelemetryServer, TelemetryService
+
+    client = GitHubClient(
+        ttl_seconds=ttl * 3600,
+        workers=workers,
+        cache_backend=cache_backend,
+        cache_max_bytes=cache_max_mb * MB or None,
+        api_url=api_url,
+    )
+    service = TelemetryService(client, max_concurrency=max_concurrency)
+    server = TelemetryServer((host, port), service)
+    typer.echo(f"Serving on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def _timeline_store(cache_dir: str):
+    from core.timeline_store import TimelineStore
+
+    return TimelineStore(os.path.join(cache_dir, "timelines"), 0)
+
+
+@cache_app.command("stats")
+def cache_stats(
+    cache_dir: CacheDir = ".cache", cache_backend: CacheBackendOpt = "sqlite"
+):
+    """
+    Show cache size and hit/miss counts.
+    """
+    stats = make_cache(cache_backend, cache_dir).stats()
+    typer.echo(f"Entries: {stats.entries}")
+    typer.echo(f"Size: {stats.size_bytes / MB:.2f} MB")
+    if stats.hits is not None:
+        lookups = stats.hits + stats.misses
+        ratio = stats.hits / lookups if lookups else 0.0
+        typer.echo(f"Hits: {stats.hits}")
+        typer.echo(f"Misses: {stats.misses}")
+        typer.echo(f"Hit ratio: {ratio:.1%}")
+    timelines = _timeline_store(cache_dir).stats()
+    typer.echo(
+        f"Commit timelines: {timelines.entries} "
+        f"({timelines.size_bytes / MB:.2f} MB)"
+    )
+
+
+@cache_app.command("prune")
+def cache_prune(
+    cache_dir: CacheDir = ".cache",
+    cache_backend: CacheBackendOpt = "sqlite",
+    max_mb: int = typer.Option(0, help="Keep at most N MB (0 = no limit)"),
+    max_entries: int = typer.Option(0, help="Keep at most N entries (0 = no limit)"),
+    max_age_days: int = typer.Option(
+        0, help="Drop entries unused for N days (0 = no limit)"
+    ),
+):
+    """
+    Evict least recently used cache entries, and with --max-age-days
+    commit timelines unused for that long.
+    """
+    removed = make_cache(cache_backend, cache_dir).prune(
+        max_entries=max_entries or None,
+        max_bytes=max_mb * MB or None,
+        max_idle_seconds=max_age_days * 86400 or None,
+    )
+    typer.echo(f"Removed {removed} entries.")
+    if max_age_days:
+        timelines = _timeline_store(cache_dir).prune(max_age_days * 86400)
+        if timelines:
+            typer.echo(f"Removed {timelines} commit timelines.")
+
+
+@cache_app.command("clear")
+def cache_clear(
+    cache_dir: CacheDir = ".cache", cache_backend: CacheBackendOpt = "sqlite"
+):
+    """
+    Remove every cache entry.
+    """
+    removed = make_cache(cache_backend, cache_dir).clear()
+    timelines = _timeline_store(cache_dir).clear()
+    typer.echo(f"Removed {removed} entries.")
+    if timelines:
+        typer.echo(f"Removed {timelines} commit timelines.")
+
 
 if __name__ == "__main__":
     app()
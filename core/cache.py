@@ -0,0 +1,728 @@
+from __future__ import annotations
+
+import atexit
+import glob
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from core import jsonlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# A cache entry is a dict shaped like
+#   {"timestamp": float, "headers": {"ETag": ..., ...}, "data": <decoded JSON>}
+# Disk backends store the JSON body compressed and decode it on read hits.
+
+# Response headers worth keeping: the validators for conditional requests
+# and the pagination links
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link")
+
+# Size limits are enforced every N writes rather than on each one
+PRUNE_EVERY = 256
+
+# SQLiteCache records access times and hit/miss counts in memory and
+# writes them every N reads, so lookups stay read-only
+ACCESS_FLUSH_EVERY = 256
+
+# How long a process waits for another one fetching the same key before
+# fetching it itself; guards against a peer that hung while holding it
+LOCK_TIMEOUT_SECONDS = 60.0
+
+# Subdirectory of the cache holding the (empty) lock files. Keys share a
+# fixed pool of them, picked by hash, so their number stays bounded; two
+# keys in one slot merely take turns.
+LOCK_DIR = "locks"
+LOCK_SLOTS = 256
+
+# FileCache entries are md5-named; other files in the directory are left
+# alone. Any extension matches so entries in the old uncompressed ``.json``
+# layout are still counted, pruned and cleared.
+_ENTRY_GLOB = "[0-9a-f]" * 32 + ".*"
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress(body: bytes) -> bytes:
+    """
+    zstd when the ``zstandard`` package is installed, gzip otherwise.
+    """
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def decompress(blob: bytes) -> bytes:
+    """
+    Inverse of ``compress`` for either format. Raises ValueError for
+    unreadable input, including zstd data without ``zstandard``.
+    """
+    if blob.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("zstd-compressed entry; install zstandard")
+        try:
+            return zstandard.ZstdDecompressor().decompress(blob)
+        except zstandard.ZstdError as exc:
+            raise ValueError(str(exc)) from exc
+    try:
+        return gzip.decompress(blob)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ValueError(str(exc)) from exc
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _atomic_write(directory: str, path: str, payload: bytes) -> bool:
+    """
+    Write to a temp file and rename so concurrent readers, in this or
+    another process, never see a partially written file.
+    """
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    except OSError:
+        return False
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def _flush_at_exit(ref: weakref.ref) -> None:
+    cache = ref()
+    if cache is not None:
+        cache.flush()
+
+
+def _remove_locks(cache_dir: str) -> None:
+    for path in glob.glob(os.path.join(cache_dir, LOCK_DIR, "*.lock")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _encode_body(entry: dict, body: bytes | None) -> bytes:
+    if body is None:
+        body = jsonlib.dumps(entry["data"]).encode("utf-8")
+    return compress(body)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    size_bytes: int
+    # None when the backend does not persist counters across runs
+    hits: Optional[int] = None
+    misses: Optional[int] = None
+
+
+class CacheBackend:
+    """
+    Key/value store for API responses, keyed by URL + params.
+
+    ``max_entries``/``max_bytes`` cap the store; least recently used
+    entries are evicted first once a cap is exceeded.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._writes = 0
+
+    def get(self, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: dict, body: bytes | None = None) -> None:
+        """
+        Store ``entry``. ``body`` is the JSON encoding of ``entry["data"]``
+        when the caller already has it (e.g. the raw response), which
+        saves encoding the data again.
+        """
+        raise NotImplementedError
+
+    def refresh(self, key: str, entry: dict) -> None:
+        """
+        Update the timestamp and headers of a stored entry whose data is
+        unchanged (after a 304), without re-encoding the body.
+        """
+        self.set(key, entry)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[bool]:
+        """
+        Hold an exclusive lock on ``key``'s slot, shared by every thread and process
+        using the same cache directory, so only one of them fetches a
+        given URL. Yields True if another holder had to be waited for, in
+        which case the entry is worth reading again.
+
+        After LOCK_TIMEOUT_SECONDS the caller proceeds without the lock.
+        Backends without a directory don't lock.
+        """
+        cache_dir = getattr(self, "cache_dir", None)
+        if not cache_dir:
+            yield False
+            return
+
+        lock_dir = os.path.join(cache_dir, LOCK_DIR)
+        digest = hashlib.md5(key.encode("utf-8")).digest()
+        slot = int.from_bytes(digest[:4], "big") % LOCK_SLOTS
+        try:
+            os.makedirs(lock_dir, exist_ok=True)
+            fd = os.open(
+                os.path.join(lock_dir, f"{slot:02x}.lock"), os.O_RDWR | os.O_CREAT
+            )
+        except OSError:
+            yield False
+            return
+
+        try:
+            locked = _try_lock(fd)
+            waited = not locked
+            delay = 0.01
+            deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+            while not locked and time.monotonic() < deadline:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.25)
+                locked = _try_lock(fd)
+            try:
+                yield waited
+            finally:
+                if locked:
+                    _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+    def prune(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_idle_seconds: Optional[float] = None,
+    ) -> int:
+        """
+        Evict entries unused for ``max_idle_seconds``, then least recently
+        used entries until both caps hold. Returns the number removed.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        raise NotImplementedError
+
+    def _after_write(self) -> None:
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 1:
+            self.prune(max_entries=self.max_entries, max_bytes=self.max_bytes)
+
+
+class FileCache(CacheBackend):
+    """
+    One md5-named file per key in ``cache_dir``: a JSON line with the
+    timestamp and headers, then the compressed body. File mtimes are
+    touched on read and serve as the LRU clock.
+    """
+
+    def __init__(self, cache_dir: str, **limits: Optional[int]) -> None:
+        super().__init__(**limits)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        hashed = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{hashed}.entry")
+
+    def get(self, key: str) -> dict | None:
+        cache_path = self.path(key)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                meta, _, blob = f.read().partition(b"\n")
+            entry = jsonlib.loads(meta)
+            entry["data"] = jsonlib.loads(decompress(blob))
+            os.utime(cache_path)
+            return entry
+        except (ValueError, OSError):
+            return None
+
+    def set(self, key: str, entry: dict, body: bytes | None = None) -> None:
+        blob = _encode_body(entry, body)
+        if _atomic_write(self.cache_dir, self.path(key), self._meta(entry) + blob):
+            self._after_write()
+
+    def refresh(self, key: str, entry: dict) -> None:
+        cache_path = self.path(key)
+        try:
+            with open(cache_path, "rb") as f:
+                _, _, blob = f.read().partition(b"\n")
+        except OSError:
+            blob = b""
+        if not blob:
+            self.set(key, entry)
+            return
+        _atomic_write(self.cache_dir, cache_path, self._meta(entry) + blob)
+
+    @staticmethod
+    def _meta(entry: dict) -> bytes:
+        meta = {"timestamp": entry["timestamp"], "headers": entry.get("headers") or {}}
+        return jsonlib.dumps(meta).encode("utf-8") + b"\n"
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """
+        (mtime, size, path) for every entry, least recently used first.
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.cache_dir, _ENTRY_GLOB)):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def stats(self) -> CacheStats:
+        entries = self._entries()
+        return CacheStats(
+            entries=len(entries), size_bytes=sum(size for _, size, _ in entries)
+        )
+
+    def prune(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_idle_seconds: Optional[float] = None,
+    ) -> int:
+        entries = self._entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_idle_seconds if max_idle_seconds else None
+        removed = 0
+
+        for mtime, size, path in entries:
+            remaining = len(entries) - removed
+            if not (
+                (cutoff is not None and mtime < cutoff)
+                or (max_entries is not None and remaining > max_entries)
+                or (max_bytes is not None and total_bytes > max_bytes)
+            ):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            total_bytes -= size
+
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for pattern in (_ENTRY_GLOB, "*.tmp"):
+            for path in glob.glob(os.path.join(self.cache_dir, pattern)):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        _remove_locks(self.cache_dir)
+        return removed
+
+
+class SQLiteCache(CacheBackend):
+    """
+    All entries in a single indexed SQLite database.
+
+    Bodies are stored compressed, next to the CACHED_HEADERS. WAL journaling
+    lets readers proceed while another thread or process writes. Hit and
+    miss counts are persisted so ``gct cache stats`` covers past runs.
+
+    Lookups only read. Access times (the LRU clock) and hit/miss counts
+    are buffered and written in one transaction every
+    ACCESS_FLUSH_EVERY reads, before ``stats``/``prune``, and at exit.
+    """
+
+    FILENAME = "cache.sqlite3"
+    # Bumped whenever the responses table changes
+    SCHEMA_VERSION = 1
+
+    def __init__(self, cache_dir: str, **limits: Optional[int]) -> None:
+        super().__init__(**limits)
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, self.FILENAME)
+        self._local = threading.local()
+        # key -> [last access time, hits] not yet written
+        self._pending: dict[str, list] = {}
+        self._pending_misses = 0
+        self._pending_lock = threading.Lock()
+        self._reads = 0
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            # Entries can always be refetched, so a cache written with
+            # another layout is dropped rather than migrated
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != self.SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS responses")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    timestamp REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    link TEXT,
+                    data BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters "
+                "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads; keep one each
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            # Under WAL this only defers fsyncs to checkpoints; a crash can
+            # lose the last commits (cache entries) but not corrupt the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _record_access(self, key: str, hit: bool) -> None:
+        with self._pending_lock:
+            if hit:
+                pending = self._pending.setdefault(key, [0.0, 0])
+                pending[0] = time.time()
+                pending[1] += 1
+            else:
+                self._pending_misses += 1
+            self._reads += 1
+            due = self._reads % ACCESS_FLUSH_EVERY == 0
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered access times and hit/miss counts.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            misses, self._pending_misses = self._pending_misses, 0
+        if not pending and not misses:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE responses SET accessed = MAX(accessed, ?), "
+                    "hits = hits + ? WHERE key = ?",
+                    [(at, hits, key) for key, (at, hits) in pending.items()],
+                )
+                if misses:
+                    conn.execute(
+                        "INSERT INTO counters VALUES ('misses', ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                        (misses, misses),
+                    )
+        except sqlite3.Error:
+            # Bookkeeping only; losing a batch just skews LRU order and stats
+            pass
+
+    def get(self, key: str) -> dict | None:
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT timestamp, etag, last_modified, link, data "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+
+        self._record_access(key, hit=row is not None)
+
+        if row is None:
+            return None
+
+        timestamp, *values, data = row
+        headers = {
+            name: value
+            for name, value in zip(CACHED_HEADERS, values)
+            if value is not None
+        }
+
+        try:
+            decoded = jsonlib.loads(decompress(data))
+        except ValueError:
+            return None
+
+        return {"timestamp": timestamp, "headers": headers, "data": decoded}
+
+    def set(self, key: str, entry: dict, body: bytes | None = None) -> None:
+        headers = entry.get("headers") or {}
+        data = _encode_body(entry, body)
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO responses "
+                    "(key, timestamp, accessed, size, etag, last_modified, "
+                    "link, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET "
+                    "timestamp = excluded.timestamp, "
+                    "accessed = excluded.accessed, size = excluded.size, "
+                    "etag = excluded.etag, "
+                    "last_modified = excluded.last_modified, "
+                    "link = excluded.link, data = excluded.data",
+                    (
+                        key,
+                        entry["timestamp"],
+                        time.time(),
+                        len(data),
+                        headers.get("ETag"),
+                        headers.get("Last-Modified"),
+                        headers.get("Link"),
+                        data,
+                    ),
+                )
+        except sqlite3.Error:
+            return
+
+        self._after_write()
+
+    def refresh(self, key: str, entry: dict) -> None:
+        headers = entry.get("headers") or {}
+        try:
+            conn = self._connect()
+            with conn:
+                updated = conn.execute(
+                    "UPDATE responses SET timestamp = ?, accessed = ?, "
+                    "etag = ?, last_modified = ?, link = ? WHERE key = ?",
+                    (
+                        entry["timestamp"],
+                        time.time(),
+                        headers.get("ETag"),
+                        headers.get("Last-Modified"),
+                        headers.get("Link"),
+                        key,
+                    ),
+                ).rowcount
+        except sqlite3.Error:
+            return
+        if not updated:
+            self.set(key, entry)
+
+    def stats(self) -> CacheStats:
+        self.flush()
+        conn = self._connect()
+        entries, size, hits = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) "
+            "FROM responses"
+        ).fetchone()
+        row = conn.execute(
+            "SELECT value FROM counters WHERE name = 'misses'"
+        ).fetchone()
+        return CacheStats(
+            entries=entries,
+            size_bytes=size,
+            hits=hits,
+            misses=row[0] if row else 0,
+        )
+
+    def prune(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_idle_seconds: Optional[float] = None,
+    ) -> int:
+        # Evict by up-to-date access times
+        self.flush()
+        conn = self._connect()
+        removed = 0
+
+        with conn:
+            if max_idle_seconds:
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE accessed < ?",
+                    (time.time() - max_idle_seconds,),
+                ).rowcount
+
+            if max_entries is not None:
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (max_entries,),
+                ).rowcount
+
+            if max_bytes is not None:
+                # Keep the most recently used entries whose running size
+                # fits the budget
+                removed += conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM ("
+                    "SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) "
+                    "AS running FROM responses) WHERE running > ?)",
+                    (max_bytes,),
+                ).rowcount
+
+        return removed
+
+    def clear(self) -> int:
+        with self._pending_lock:
+            self._pending.clear()
+            self._pending_misses = 0
+        conn = self._connect()
+        with conn:
+            removed = conn.execute("DELETE FROM responses").rowcount
+            conn.execute("DELETE FROM counters")
+        conn.execute("VACUUM")
+        _remove_locks(self.cache_dir)
+        return removed
+
+
+class MemoryCache(CacheBackend):
+    """
+    Bounded in-process LRU of decoded entries, placed in front of a disk
+    backend. Entries are shared, not copied: callers must not mutate the
+    returned data.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 1024) -> None:
+        super().__init__(max_entries=max_entries)
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, entry: dict, body: bytes | None = None) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def stats(self) -> CacheStats:
+        # Decoded objects have no cheap byte size; only entries are tracked
+        return CacheStats(
+            entries=len(self._entries),
+            size_bytes=0,
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+    def prune(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_idle_seconds: Optional[float] = None,
+    ) -> int:
+        removed = 0
+        with self._lock:
+            while max_entries is not None and len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        return removed
+
+
+CACHE_BACKENDS = {
+    "file": FileCache,
+    "sqlite": SQLiteCache,
+}
+
+
+def make_cache(
+    backend: str,
+    cache_dir: str,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> CacheBackend:
+    try:
+        cache_cls = CACHE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown cache backend: {backend}") from None
+    return cache_cls(cache_dir, max_entries=max_entries, max_bytes=max_bytes)
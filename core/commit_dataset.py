@@ -0,0 +1,363 @@
+import os
+from datetime import datetime, timezone
+from typing import Collection, Dict, Iterator, List, Literal, Tuple
+
+import numpy as np
+
+from core.github_client import (
+    COMMIT_BACKENDS,
+    GitHubAPIError,
+    GitHubClient,
+    Repository,
+)
+from core.metrics.gaps import GapStats
+from core.state import AnalysisState, RepoState
+from core.timeline_store import TimelineStore
+from core.timestamps import parse_timestamps
+
+
+# Dates are parsed in chunks as pages stream in, bounding the number of
+# raw strings held at once
+PARSE_CHUNK = 1000
+
+# All that is kept of each commit object
+COMMIT_FIELDS = ("sha", "commit.author.date")
+
+
+def _sort_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    # The API lists newest first, but rebased or imported history is
+    # not strictly ordered
+    timestamps = timestamps[::-1]
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        timestamps = np.sort(timestamps)
+    return np.ascontiguousarray(timestamps)
+
+
+def _sorted_timestamps(date_strs: List[str]) -> np.ndarray:
+    return _sort_timestamps(parse_timestamps(date_strs))
+
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class CommitDataset:
+    """
+    Commit timestamps for a set of repositories, fetched and parsed once
+    per analysis run and shared by every metric.
+
+    Commit pages are streamed and reduced to int64 epoch seconds as they
+    arrive, so only 8 bytes per commit are kept in memory.
+
+    Parsed timelines are saved to a ``TimelineStore`` and memory-mapped
+    back on later runs while fresh, skipping the API and JSON entirely.
+
+    With an ``AnalysisState`` the gap aggregates are updated
+    incrementally: untouched repositories cost no request and the rest
+    only fetch commits newer than the last run. ``commit_timestamps``
+    then holds only the commits fetched in this run.
+    """
+
+    def __init__(
+        self,
+        client: GitHubClient,
+        username: str | None = None,
+        repositories: List[Repository] | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        backend: Literal["rest", "graphql"] = "rest",
+        state: AnalysisState | None = None,
+        timelines: TimelineStore | None = None,
+    ) -> None:
+        if backend not in COMMIT_BACKENDS:
+            raise ValueError(f"Unknown commit backend: {backend}")
+        self.client = client
+        self.username = username
+        self.since = since
+        self.until = until
+        self.backend = backend
+        self.state = state
+        # Compact timelines live next to the HTTP cache by default
+        if timelines is None and client.cache_dir:
+            timelines = TimelineStore(
+                os.path.join(client.cache_dir, "timelines"), client.ttl_seconds
+            )
+        self.timelines = timelines
+        self._repositories = repositories or None
+        self._timestamps: Dict[str, np.ndarray] = {}
+        self._gap_stats: Dict[str, GapStats] = {}
+        self._repo_index: Dict[str, Repository] | None = None
+
+    def _incremental(self) -> bool:
+        # A fixed ``until`` bound can't be extended run over run
+        return self.state is not None and self.until is None
+
+    def repositories(self) -> List[Repository]:
+        if self._repositories is None:
+            if self.username:
+                self._repositories = list(
+                    self.client.iter_user_repositories(self.username)
+                )
+            else:
+                self._repositories = []
+        return self._repositories
+
+    def subset(self, repositories: List[Repository]) -> "CommitDataset":
+        """
+        A dataset over some of these repositories that shares everything
+        already fetched, so overlapping reports fetch each repository once.
+        """
+        view = CommitDataset(
+            self.client,
+            repositories=repositories,
+            since=self.since,
+            until=self.until,
+            backend=self.backend,
+            state=self.state,
+            timelines=self.timelines,
+        )
+        view._timestamps = self._timestamps
+        view._gap_stats = self._gap_stats
+        return view
+
+    def _fetch(
+        self,
+        repo_full_name: str,
+        since: str | None,
+        skip_shas: Collection[str] = (),
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Sorted commit timestamps, leaving out ``skip_shas``, and the SHAs
+        of the commits authored at the newest one.
+        """
+        commits = self.client.iter_commits(
+            repo_full_name, since=since, until=self.until, fields=COMMIT_FIELDS
+        )
+
+        chunks: List[np.ndarray] = []
+        dates: List[str] = []
+        shas: List[str | None] = []
+        newest: Tuple[int, List[str]] = (0, [])
+
+        def flush() -> None:
+            nonlocal newest
+            with self.client.stats.phase("fetch.parse"):
+                parsed = parse_timestamps(dates)
+            top = int(parsed.max())
+            at_top = [
+                sha for sha, at in zip(shas, (parsed == top).tolist()) if at and sha
+            ]
+            if not chunks or top > newest[0]:
+                newest = (top, at_top)
+            elif top == newest[0]:
+                newest[1].extend(at_top)
+            chunks.append(parsed)
+            dates.clear()
+            shas.clear()
+
+        for commit in commits:
+            if "commit" not in commit or commit.get("sha") in skip_shas:
+                continue
+            dates.append(commit["commit"]["author"]["date"])
+            shas.append(commit.get("sha"))
+            if len(dates) >= PARSE_CHUNK:
+                flush()
+        if dates:
+            flush()
+
+        if not chunks:
+            return _EMPTY, []
+        return _sort_timestamps(np.concatenate(chunks)), newest[1]
+
+    def _pushed_at(self, repo_full_name: str) -> str | None:
+        if self._repo_index is None:
+            self._repo_index = {r.full_name: r for r in self.repositories()}
+        repo = self._repo_index.get(repo_full_name)
+        return repo.pushed_at if repo else None
+
+    def _load_timeline(self, repo_full_name: str) -> np.ndarray | None:
+        if self.timelines is None:
+            return None
+        return self.timelines.load(
+            repo_full_name,
+            since=self.since,
+            until=self.until,
+            pushed_at=self._pushed_at(repo_full_name),
+        )
+
+    def _save_timeline(self, repo_full_name: str, timestamps: np.ndarray) -> None:
+        if self.timelines is not None:
+            self.timelines.save(
+                repo_full_name,
+                timestamps,
+                since=self.since,
+                until=self.until,
+                pushed_at=self._pushed_at(repo_full_name),
+            )
+
+    def _fetch_timestamps(self, repo_full_name: str) -> np.ndarray:
+        timestamps = self._load_timeline(repo_full_name)
+        if timestamps is not None:
+            return timestamps
+
+        try:
+            timestamps = self._fetch(repo_full_name, self.since)[0]
+        except Exception:
+            return _EMPTY
+
+        self._save_timeline(repo_full_name, timestamps)
+        return timestamps
+
+    def _incremental_stats(self, repo_full_name: str) -> GapStats:
+        """
+        Extend the persisted aggregates with commits newer than the last
+        one seen, skipping the request when ``pushed_at`` is unchanged.
+        """
+        pushed_at = self._pushed_at(repo_full_name)
+        previous = self.state.get(repo_full_name)
+        if previous is not None and previous.since != self.since:
+            previous = None
+
+        if previous is not None and pushed_at and previous.pushed_at == pushed_at:
+            self._timestamps[repo_full_name] = _EMPTY
+            return previous.stats
+
+        since = self.since
+        last = previous.last_timestamp if previous else None
+        if last is not None:
+            since = datetime.fromtimestamp(last, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+
+        try:
+            timestamps, newest_shas = self._fetch(
+                repo_full_name, since, previous.last_shas if previous else ()
+            )
+        except Exception:
+            self._timestamps[repo_full_name] = _EMPTY
+            return previous.stats if previous else GapStats()
+
+        last_shas = previous.last_shas if previous else []
+        if last is not None:
+            # ``since`` is inclusive, so the commits seen at the last
+            # second come back and were skipped by SHA; new commits from
+            # that same second are kept. Commits authored before it can't
+            # be placed incrementally
+            timestamps = timestamps[timestamps >= last]
+            stats = GapStats.combine([
+                previous.stats,
+                GapStats.from_timestamps(np.concatenate(([last], timestamps))),
+            ])
+        else:
+            stats = GapStats.from_timestamps(timestamps)
+
+        self._timestamps[repo_full_name] = timestamps
+        if timestamps.size:
+            if timestamps[-1] == last:
+                last_shas = last_shas + newest_shas
+            else:
+                last, last_shas = int(timestamps[-1]), newest_shas
+
+        self.state.set(
+            repo_full_name,
+            RepoState(
+                since=self.since,
+                pushed_at=pushed_at,
+                last_timestamp=last,
+                last_shas=last_shas,
+                stats=stats,
+            ),
+        )
+        return stats
+
+    def _prefetch_graphql(self, repo_full_names: List[str]) -> None:
+        missing = []
+        for full_name in repo_full_names:
+            timestamps = self._load_timeline(full_name)
+            if timestamps is None:
+                missing.append(full_name)
+            else:
+                self._timestamps[full_name] = timestamps
+        if not missing:
+            return
+
+        # A missing or rejected token is a configuration error, not a
+        # failed repository: report it instead of analyzing no commits
+        if not self.client.token:
+            raise GitHubAPIError("The graphql backend requires a token (GITHUB_TOKEN)")
+        dates, failed = self.client.graphql_commit_dates(
+            missing, since=self.since, until=self.until
+        )
+        for full_name, repo_dates in dates.items():
+            with self.client.stats.phase("fetch.parse"):
+                timestamps = _sorted_timestamps(repo_dates)
+            self._timestamps[full_name] = timestamps
+            self._save_timeline(full_name, timestamps)
+
+        # Repositories GraphQL couldn't return are fetched over REST
+        # rather than recorded as having no commits
+        if failed:
+            self.client.stats.incr("graphql_failures", len(failed))
+            failed_names = list(failed)
+            results = self.client.map_concurrent(self._fetch_timestamps, failed_names)
+            self._timestamps.update(zip(failed_names, results))
+
+    def prefetch(self) -> None:
+        """
+        Fetch every repository's commits up front: batched into a few
+        GraphQL queries with the graphql backend, otherwise over REST,
+        concurrently when the client has more than one worker.
+        """
+        pending = [
+            repo.full_name
+            for repo in self.repositories()
+            if repo.full_name not in self._timestamps
+        ]
+        if self._incremental():
+            results = self.client.map_concurrent(self._incremental_stats, pending)
+            self._gap_stats.update(zip(pending, results))
+            return
+
+        if self.backend == "graphql":
+            self._prefetch_graphql(pending)
+            return
+
+        results = self.client.map_concurrent(self._fetch_timestamps, pending)
+        for full_name, timestamps in zip(pending, results):
+            self._timestamps[full_name] = timestamps
+
+    def commit_timestamps(self, repo_full_name: str) -> np.ndarray:
+        """
+        Ascending commit epoch seconds for one repository (fetched on
+        first access).
+        """
+        if repo_full_name not in self._timestamps:
+            self._timestamps[repo_full_name] = self._fetch_timestamps(
+                repo_full_name
+            )
+        return self._timestamps[repo_full_name]
+
+    def commit_dates(self, repo_full_name: str) -> List[datetime]:
+        return [
+            datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+            for ts in self.commit_timestamps(repo_full_name).tolist()
+        ]
+
+    def gap_stats(self, repo_full_name: str) -> GapStats:
+        if repo_full_name not in self._gap_stats:
+            if self._incremental():
+                stats = self._incremental_stats(repo_full_name)
+            else:
+                stats = GapStats.from_timestamps(
+                    self.commit_timestamps(repo_full_name)
+                )
+            self._gap_stats[repo_full_name] = stats
+        return self._gap_stats[repo_full_name]
+
+    def iter_commit_timestamps(self) -> Iterator[Tuple[Repository, np.ndarray]]:
+        for repo in self.repositories():
+            yield repo, self.commit_timestamps(repo.full_name)
+
+    def combined_gap_stats(self) -> GapStats:
+        return GapStats.combine(
+            self.gap_stats(repo.full_name) for repo in self.repositories()
+        )
@@ -3,17 +3,99 @@ from __future__ import annotations
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Iterator, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from core import jsonlib
+from core.cache import CACHED_HEADERS, CacheBackend, MemoryCache, make_cache
+from core.instrumentation import RunStats
+from core.rate_limit import TokenPool
 
 GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+
+# Only the author date is requested; it is what the metrics read from
+# ``commit.author.date`` on the REST endpoint
+_HISTORY_FRAGMENT = """
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 100%s) {
+            pageInfo { hasNextPage endCursor }
+            nodes { authoredDate }
+          }
+        }
+      }
+    }"""
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-class GitHubAPIError(Exception):
-    pass
+
+# How commit histories can be fetched: paginated REST or batched GraphQL
+COMMIT_BACKENDS = ("rest", "graphql")
 
 
-@dataclass(frozen=True)
+class GitHubAPIError(Exception):
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        # HTTP status of the failed response, when there was one
+        self.status = status
+
+
+def _select_item(item: Any, paths: List[List[str]]) -> Any:
+    if not isinstance(item, dict):
+        return item
+    selected: dict = {}
+    for path in paths:
+        source, target = item, selected
+        for key in path[:-1]:
+            source = source.get(key)
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(key, {})
+        else:
+            if path[-1] in source:
+                target[path[-1]] = source[path[-1]]
+    return selected
+
+
+def select_fields(data: Any, fields: Sequence[str]) -> Any:
+    """
+    Keep only the dotted ``fields`` (e.g. ``"commit.author.date"``) of a
+    decoded object, or of every object in a list, preserving nesting.
+    """
+    paths = [field.split(".") for field in fields]
+    if isinstance(data, list):
+        return [_select_item(item, paths) for item in data]
+    return _select_item(data, paths)
+
+
+def _cached_headers(response: requests.Response) -> dict:
+    return {
+        name: response.headers[name]
+        for name in CACHED_HEADERS
+        if name in response.headers
+    }
+
+
+# Slotted: org sweeps hold many of these; RepositoryTable stores them
+# column by column for aggregation
+@dataclass(frozen=True, slots=True)
 class Repository:
     name: str
     full_name: str
@@ -22,6 +104,44 @@ class Repository:
     language: Optional[str]
     created_at: str
     updated_at: str
+    pushed_at: Optional[str] = None
+    is_archived: bool = False
+
+
+def _repository(repo: Dict[str, Any]) -> Repository:
+    return Repository(
+        name=repo["name"],
+        full_name=repo["full_name"],
+        is_fork=repo["fork"],
+        size_kb=repo["size"],
+        language=repo["language"],
+        created_at=repo["created_at"],
+        updated_at=repo["updated_at"],
+        pushed_at=repo.get("pushed_at"),
+        is_archived=repo.get("archived", False),
+    )
+
+
+def _resolve_tokens(token: Optional[str] = None) -> List[Optional[str]]:
+    """
+    Token lookup order: explicit ``token``, ``GITHUB_TOKENS``
+    (comma-separated), ``GITHUB_TOKEN_FILE`` (one token per line, ``#``
+    comments allowed), then ``GITHUB_TOKEN``.
+    """
+    if token:
+        return [token]
+
+    env_tokens = os.getenv("GITHUB_TOKENS")
+    if env_tokens:
+        return [t.strip() for t in env_tokens.split(",") if t.strip()]
+
+    token_file = os.getenv("GITHUB_TOKEN_FILE")
+    if token_file:
+        with open(token_file, "r", encoding="utf-8") as f:
+            lines = (line.strip() for line in f)
+            return [line for line in lines if line and not line.startswith("#")]
+
+    return [os.getenv("GITHUB_TOKEN")]
 
 
 class GitHubClient:
@@ -30,85 +150,200 @@ class GitHubClient:
         token: Optional[str] = None,
         cache_dir: str = ".cache",
         ttl_seconds: int = 43200,  # 12 hours
+        workers: int = 1,
+        cache_backend: str = "file",
+        cache_max_entries: Optional[int] = None,
+        cache_max_bytes: Optional[int] = None,
+        memory_cache_entries: int = 1024,
+        max_retries: int = 3,
+        tokens: Optional[List[str]] = None,
+        api_url: str = GITHUB_API_URL,
     ) -> None:
-        self.token = token or os.getenv("GITHUB_TOKEN")
+        # Overridable so the client can be pointed at a local mock server
+        self.api_url = api_url.rstrip("/")
+        self.graphql_url = f"{self.api_url}/graphql"
+        self.token_pool = TokenPool(tokens or _resolve_tokens(token))
+        self.token = self.token_pool.tokens[0]
         self.cache_dir = cache_dir
         self.ttl_seconds = ttl_seconds
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.rate_limiter = self.token_pool.limiters[self.token]
+        self.stats = RunStats()
         self.session = requests.Session()
 
+        # One pooled connection per worker so threads don't queue on the pool
+        adapter = HTTPAdapter(
+            pool_connections=self.workers, pool_maxsize=max(self.workers, 10)
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         if self.token:
             self.session.headers.update({"Authorization": f"Bearer {self.token}"})
 
         self.session.headers.update({"Accept": "application/vnd.github+json"})
 
+        # Decoded responses are kept in memory in front of the disk cache;
+        # 0 disables the memory tier
+        self.memory_cache: MemoryCache | None = None
+        if memory_cache_entries > 0:
+            self.memory_cache = MemoryCache(max_entries=memory_cache_entries)
+
+        # An empty cache_dir disables the disk cache
+        self.cache: CacheBackend | None = None
         if self.cache_dir:
-            os.makedirs(self.cache_dir, exist_ok=True)
+            self.cache = make_cache(
+                cache_backend,
+                self.cache_dir,
+                max_entries=cache_max_entries,
+                max_bytes=cache_max_bytes,
+            )
 
-    def _get_cache_path(self, url: str, params: dict | None = None) -> str:
-        import hashlib
+    def _cache_key(self, url: str, params: dict | None = None) -> str:
         import json
 
         # Create a unique key for URL + params
         key = url
         if params:
             key += json.dumps(params, sort_keys=True)
-            
-        hashed = hashlib.md5(key.encode("utf-8")).hexdigest()
-        return os.path.join(self.cache_dir, f"{hashed}.json")
-
-    def _read_cache(self, cache_path: str) -> dict | None:
-        import json
-        
-        if not os.path.exists(cache_path):
-            return None
-            
-        try:
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
+        return key
+
+    def _is_fresh(self, cached: dict | None) -> bool:
+        return (
+            cached is not None
+            and time.time() - cached["timestamp"] < self.ttl_seconds
+        )
+
+    def _read_cache(self, key: str) -> dict | None:
+        cached = None
+        if self.memory_cache is not None:
+            cached = self.memory_cache.get(key)
+            # A stale copy may have been refreshed on disk by another process
+            if self._is_fresh(cached) or self.cache is None:
+                return cached
+
+        if self.cache is None:
             return None
 
-    def _write_cache(self, cache_path: str, response: requests.Response) -> None:
-        import json
-        
+        return self._read_disk_cache(key) or cached
+
+    def _read_disk_cache(self, key: str) -> dict | None:
+        cached = self.cache.get(key)
+        if cached is not None and self.memory_cache is not None:
+            self.memory_cache.set(key, cached)
+        return cached
+
+    def _store_cache(
+        self, key: str, cache_data: dict, body: bytes | None = None
+    ) -> None:
+        if self.memory_cache is not None:
+            self.memory_cache.set(key, cache_data)
+        if self.cache is not None:
+            self.cache.set(key, cache_data, body)
+
+    def _write_cache(
+        self,
+        key: str,
+        response: requests.Response,
+        data: Any,
+        body: bytes | None = None,
+    ) -> None:
         # Only cache successful GET requests
         if response.status_code != 200:
             return
 
         cache_data = {
             "timestamp": time.time(),
-            "headers": dict(response.headers),
-            "data": response.json(),
+            "headers": _cached_headers(response),
+            "data": data,
         }
-        
-        try:
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f)
-        except OSError:
-            pass
-
-    def _handle_rate_limit(self, response: requests.Response) -> None:
-        remaining = int(response.headers.get("X-RateLimit-Remaining", 1))
-
-        if remaining <= 0:
-            reset_timestamp = int(
-                response.headers.get("X-RateLimit-Reset", time.time())
-            )
-            sleep_for = max(reset_timestamp - int(time.time()), 1)
-            time.sleep(sleep_for)
+        self._store_cache(key, cache_data, body)
 
-    def _request(self, url: str, params: dict | None = None) -> dict:
-        cache_path = self._get_cache_path(url, params)
-        cached = self._read_cache(cache_path)
-        request_headers = {}
+    def _send(
+        self,
+        send: Callable[..., requests.Response],
+        url: str,
+        priority: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request with the pooled token that has the most headroom,
+        retrying rate-limited (403/429) and server-error (5xx) responses
+        with backoff.
+        """
+        attempt = 0
+        while True:
+            token, limiter = self.token_pool.choose()
+            if len(self.token_pool) > 1:
+                # Overrides the session-wide header for this request only
+                kwargs["headers"] = {
+                    **(kwargs.get("headers") or {}),
+                    "Authorization": f"Bearer {token}",
+                }
+
+            slept = limiter.acquire(priority=priority)
+            self.stats.incr("rate_limit_sleep_seconds", slept)
+            start = time.perf_counter()
+            response = send(url, **kwargs)
+            elapsed = time.perf_counter() - start
+            limiter.update(response.headers)
+
+            self.stats.incr("requests")
+            self.stats.incr("bytes_downloaded", len(response.content or b""))
+            self.stats.observe_latency(url[len(self.api_url):], elapsed)
+
+            wait = limiter.retry_delay(response, attempt)
+            if wait is None or attempt >= self.max_retries:
+                return response
+
+            if wait > 0:
+                limiter.sleep(wait)
+                self.stats.incr("rate_limit_sleep_seconds", wait)
+            attempt += 1
+
+    def _request(
+        self,
+        url: str,
+        params: dict | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Any:
+        """
+        GET ``url`` through the cache. With ``fields``, only those dotted
+        fields of the response are kept and cached (under their own key),
+        so large pages don't linger in memory or on disk.
+        """
+        cache_key = self._cache_key(url, params)
+        if fields:
+            cache_key += "|fields=" + ",".join(fields)
+        cached = self._read_cache(cache_key)
+
+        # Cache is fresh, return immediately
+        if self._is_fresh(cached):
+            self.stats.incr("cache_hits")
+            return cached["data"]
 
-        # Check Cache TTL
+        # Single flight: one thread or process sharing the disk cache
+        # fetches the URL while the others wait, then read what it stored
+        lock = self.cache.lock(cache_key) if self.cache else nullcontext(False)
+        with lock as waited:
+            if waited:
+                cached = self._read_disk_cache(cache_key) or cached
+                if self._is_fresh(cached):
+                    self.stats.incr("cache_hits")
+                    return cached["data"]
+            return self._fetch(url, params, fields, cache_key, cached)
+
+    def _fetch(
+        self,
+        url: str,
+        params: dict | None,
+        fields: Sequence[str] | None,
+        cache_key: str,
+        cached: dict | None,
+    ) -> Any:
+        request_headers = {}
         if cached:
-            age = time.time() - cached["timestamp"]
-            if age < self.ttl_seconds:
-                # Cache is fresh, return immediately
-                return cached["data"]
-            
             # Cache is stale, try conditional request
             if "ETag" in cached["headers"]:
                 request_headers["If-None-Match"] = cached["headers"]["ETag"]
@@ -117,73 +352,240 @@ class GitHubClient:
                     "Last-Modified"
                 ]
 
-        # Make Request
-        response = self.session.get(url, params=params, headers=request_headers)
+        # Make Request; revalidations go first since a 304 is not charged
+        response = self._send(
+            self.session.get,
+            url,
+            priority=bool(request_headers),
+            params=params,
+            headers=request_headers,
+        )
 
         # Handle 304 Not Modified
         if response.status_code == 304 and cached:
+            self.stats.incr("revalidations")
             # Update timestamp to refresh TTL
             cached["timestamp"] = time.time()
             # Optionally update headers if provided in 304
-            cached["headers"].update(dict(response.headers))
-            
-            try:
-                import json
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(cached, f)
-            except OSError:
-                pass
-                
+            cached["headers"].update(_cached_headers(response))
+            # The body is unchanged; only the metadata is rewritten
+            if self.memory_cache is not None:
+                self.memory_cache.set(cache_key, cached)
+            if self.cache is not None:
+                self.cache.refresh(cache_key, cached)
             return cached["data"]
 
         if response.status_code != 200:
             raise GitHubAPIError(
-                f"GitHub API error {response.status_code}: {response.text}"
+                f"GitHub API error {response.status_code}: {response.text}",
+                status=response.status_code,
             )
 
-        self._handle_rate_limit(response)
-        self._write_cache(cache_path, response)
-        return response.json()
+        # Decode once, straight from the bytes; the cache stores the
+        # same (possibly trimmed) object the caller receives
+        data = jsonlib.loads(response.content)
+        if fields:
+            data = select_fields(data, fields)
+            self._write_cache(cache_key, response, data)
+        else:
+            # Untrimmed, the raw body is stored as-is
+            self._write_cache(cache_key, response, data, response.content)
+        return data
+
+    def _graphql(self, query: str) -> Tuple[dict, List[dict]]:
+        """
+        POST a GraphQL query and return its ``data`` with the ``errors``
+        of a partial response. Complete responses are cached by query text
+        and served while fresh; GraphQL has no ETag revalidation.
+        """
+        if not self.token:
+            raise GitHubAPIError("GitHub GraphQL API requires a token")
+
+        cache_key = self._cache_key(self.graphql_url, {"query": query})
+        cached = self._read_cache(cache_key)
+        if cached and time.time() - cached["timestamp"] < self.ttl_seconds:
+            self.stats.incr("cache_hits")
+            return cached["data"], []
+
+        response = self._send(
+            self.session.post, self.graphql_url, json={"query": query}
+        )
 
-    def iter_user_repositories(
-        self, username: str, per_page: int = 100
-    ) -> Iterator[Repository]:
+        if response.status_code != 200:
+            raise GitHubAPIError(
+                f"GitHub API error {response.status_code}: {response.text}",
+                status=response.status_code,
+            )
+
+        payload = jsonlib.loads(response.content)
+        errors = payload.get("errors") or []
+        if payload.get("data") is None:
+            raise GitHubAPIError(f"GitHub GraphQL error: {errors}")
+
+        # A partial response would pin its failed fields until it expires
+        if not errors:
+            self._store_cache(
+                cache_key,
+                {"timestamp": time.time(), "headers": {}, "data": payload["data"]},
+            )
+        return payload["data"], errors
+
+    def graphql_commit_dates(
+        self,
+        repo_full_names: Iterable[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        batch_size: int = 25,
+    ) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+        """
+        Fetch the author dates of every commit on the default branch of many
+        repositories, ``batch_size`` repositories per GraphQL query.
+
+        Each repository is queried under an alias and paged with its own
+        cursor; repositories drop out of the batch once exhausted.
+
+        Returns the dates of every repository fetched completely (empty
+        repositories map to an empty list) and the error of every one
+        that wasn't: its batch failed, or its alias came back null. A
+        rejected token (401) fails every batch and is raised.
+        """
+        import json
+
+        # Would fail every batch the same way
+        if not self.token:
+            raise GitHubAPIError("GitHub GraphQL API requires a token")
+
+        names = list(repo_full_names)
+        dates: Dict[str, List[str]] = {name: [] for name in names}
+        cursors: Dict[str, Optional[str]] = {name: None for name in names}
+        failed: Dict[str, str] = {}
+
+        filters = ""
+        if since:
+            filters += f", since: {json.dumps(since)}"
+        if until:
+            filters += f", until: {json.dumps(until)}"
+
+        while cursors:
+            batch = list(cursors)[:batch_size]
+            fields = []
+            for i, full_name in enumerate(batch):
+                owner, name = full_name.split("/", 1)
+                history_args = filters
+                if cursors[full_name]:
+                    history_args += f", after: {json.dumps(cursors[full_name])}"
+                fields.append(
+                    f"r{i}: repository(owner: {json.dumps(owner)}, "
+                    f"name: {json.dumps(name)}) {{"
+                    + _HISTORY_FRAGMENT % history_args
+                    + "\n  }"
+                )
+
+            try:
+                data, errors = self._graphql(
+                    "query {\n  " + "\n  ".join(fields) + "\n}"
+                )
+            except GitHubAPIError as e:
+                if e.status == 401:
+                    raise
+                for full_name in batch:
+                    failed[full_name] = str(e)
+                    del cursors[full_name]
+                continue
+
+            # Partial errors point at the alias they nulled out
+            alias_errors = {
+                str(error["path"][0]): error.get("message", str(error))
+                for error in errors
+                if error.get("path")
+            }
+
+            for i, full_name in enumerate(batch):
+                repo = data.get(f"r{i}")
+                if repo is None:
+                    failed[full_name] = alias_errors.get(
+                        f"r{i}", f"GitHub GraphQL error: {errors}"
+                    )
+                    del cursors[full_name]
+                    continue
+
+                target = (repo.get("defaultBranchRef") or {}).get("target") or {}
+                history = target.get("history")
+                if not history:
+                    del cursors[full_name]
+                    continue
+
+                dates[full_name].extend(
+                    node["authoredDate"] for node in history["nodes"]
+                )
+                page_info = history["pageInfo"]
+                if page_info["hasNextPage"]:
+                    cursors[full_name] = page_info["endCursor"]
+                else:
+                    del cursors[full_name]
+
+        for full_name in failed:
+            del dates[full_name]
+        return dates, failed
+
+    def map_concurrent(self, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """
+        Apply ``func`` to every item using up to ``workers`` threads.
+        Results are returned in input order.
+        """
+        items = list(items)
+        if self.workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(func, items))
+
+    def iter_commits(
+        self,
+        repo_full_name: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        per_page: int = 100,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[dict]:
+        """
+        Lazily walk every page of a repository's commit history.
+        ``since``/``until`` (ISO 8601) are filtered server-side; ``fields``
+        trims each commit to the dotted fields the caller needs.
+        """
         page = 1
+        params: dict = {"per_page": per_page}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
 
         while True:
             data = self._request(
-                f"{GITHUB_API_URL}/users/{username}/repos",
-                params={
-                    "per_page": per_page,
-                    "page": page,
-                    "sort": "updated",
-                },
+                f"{self.api_url}/repos/{repo_full_name}/commits",
+                params={**params, "page": page},
+                fields=fields,
             )
 
-            if not data:
+            if not data or not isinstance(data, list):
                 break
 
-            for repo in data:
-                yield Repository(
-                    name=repo["name"],
-                    full_name=repo["full_name"],
-                    is_fork=repo["fork"],
-                    size_kb=repo["size"],
-                    language=repo["language"],
-                    created_at=repo["created_at"],
-                    updated_at=repo["updated_at"],
-                )
+            yield from data
+
+            # A short page is the last one; skip the empty round trip
+            if len(data) < per_page:
+                break
 
             page += 1
 
-    def iter_org_repositories(
-        self, orga: str, per_page: int = 100
-    ) -> Iterator[Repository]:
+    def _iter_repository_pages(
+        self, url: str, per_page: int
+    ) -> Iterator[List[Dict[str, Any]]]:
         page = 1
 
         while True:
             data = self._request(
-                f"{GITHUB_API_URL}/orgs/{orga}/repos",
+                url,
                 params={
                     "per_page": per_page,
                     "page": page,
@@ -194,15 +596,37 @@ class GitHubClient:
             if not data:
                 break
 
-            for repo in data:
-                yield Repository(
-                    name=repo["name"],
-                    full_name=repo["full_name"],
-                    is_fork=repo["fork"],
-                    size_kb=repo["size"],
-                    language=repo["language"],
-                    created_at=repo["created_at"],
-                    updated_at=repo["updated_at"],
-                )
-
+            yield data
             page += 1
+
+    def iter_user_repository_pages(
+        self, username: str, per_page: int = 100
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        The user's repository listing as the API returns it, one JSON page
+        at a time, e.g. for ``RepositoryTable.from_listing``.
+        """
+        return self._iter_repository_pages(
+            f"{self.api_url}/users/{username}/repos", per_page
+        )
+
+    def iter_org_repository_pages(
+        self, orga: str, per_page: int = 100
+    ) -> Iterator[List[Dict[str, Any]]]:
+        return self._iter_repository_pages(
+            f"{self.api_url}/orgs/{orga}/repos", per_page
+        )
+
+    def iter_user_repositories(
+        self, username: str, per_page: int = 100
+    ) -> Iterator[Repository]:
+        for page in self.iter_user_repository_pages(username, per_page):
+            for repo in page:
+                yield _repository(repo)
+
+    def iter_org_repositories(
+        self, orga: str, per_page: int = 100
+    ) -> Iterator[Repository]:
+        for page in self.iter_org_repository_pages(orga, per_page):
+            for repo in page:
+                yield _repository(repo)
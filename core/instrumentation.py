@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request paths reduced to endpoint templates, so histograms don't grow
+# with every repository
+_ENDPOINTS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/commits$"), "/repos/{repo}/commits"),
+    (re.compile(r"^/users/[^/]+/repos$"), "/users/{user}/repos"),
+    (re.compile(r"^/orgs/[^/]+/repos$"), "/orgs/{org}/repos"),
+    (re.compile(r"^/graphql$"), "/graphql"),
+]
+
+COUNTERS = {
+    "requests": "Requests sent to the API",
+    "cache_hits": "Responses served from a fresh cache entry",
+    "revalidations": "Stale cache entries revalidated with a 304",
+    "bytes_downloaded": "Response body bytes received",
+    "rate_limit_sleep_seconds": "Seconds spent waiting on rate limits",
+    "graphql_failures": "Repositories GraphQL failed to return, refetched over REST",
+}
+
+STATS_FORMATS = ("text", "json", "prometheus")
+
+
+def endpoint_of(path: str) -> str:
+    for pattern, template in _ENDPOINTS:
+        if pattern.match(path):
+            return template
+    return path
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        # One slot per bucket plus +Inf
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        index = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+
+
+class RunStats:
+    """
+    Request, cache and timing counters for one GitHubClient.
+
+    Thread-safe; every worker records into the same instance. Phase
+    timings add up across threads, so a phase run on several workers can
+    exceed the wall-clock time.
+
+    Top-level phases don't overlap. A dotted name is a sub-phase timed
+    inside its parent, e.g. ``fetch.parse`` is the time ``fetch`` spent
+    parsing dates. Workers parse in parallel, so with more than one the
+    sub-phase is CPU-seconds summed across threads and can exceed its
+    parent's wall-clock time.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
+        self.phases: Dict[str, float] = {}
+        self.latency: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_latency(self, path: str, seconds: float) -> None:
+        endpoint = endpoint_of(path)
+        with self._lock:
+            self.latency.setdefault(endpoint, _Histogram()).observe(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "phases_seconds": {k: round(v, 6) for k, v in self.phases.items()},
+                "latency": {
+                    endpoint: {
+                        "count": hist.count,
+                        "sum_seconds": round(hist.total, 6),
+                        "buckets": dict(
+                            zip([*map(str, LATENCY_BUCKETS), "+Inf"], hist.buckets)
+                        ),
+                    }
+                    for endpoint, hist in self.latency.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        data = self.to_dict()
+        lines: List[str] = []
+        for name, value in data["counters"].items():
+            metric = f"gct_{name}_total"
+            lines.append(f"# HELP {metric} {COUNTERS.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        # Sub-phases get their own metric so summing over ``phase``
+        # doesn't count their time twice
+        phases = data["phases_seconds"]
+        lines.append("# HELP gct_phase_seconds_total Time spent per analysis phase")
+        lines.append("# TYPE gct_phase_seconds_total counter")
+        for phase, seconds in phases.items():
+            if "." not in phase:
+                lines.append(f'gct_phase_seconds_total{{phase="{phase}"}} {seconds}')
+        metric = "gct_subphase_seconds_total"
+        lines.append(
+            f"# HELP {metric} Time spent in a sub-phase of a phase, summed "
+            "across worker threads"
+        )
+        lines.append(f"# TYPE {metric} counter")
+        for name, seconds in phases.items():
+            if "." in name:
+                phase, subphase = name.split(".", 1)
+                lines.append(
+                    f'{metric}{{phase="{phase}",subphase="{subphase}"}} {seconds}'
+                )
+
+        metric = "gct_request_duration_seconds"
+        lines.append(f"# HELP {metric} API request latency by endpoint")
+        lines.append(f"# TYPE {metric} histogram")
+        for endpoint, hist in data["latency"].items():
+            cumulative = 0
+            for bound, count in hist["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{endpoint="{endpoint}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f'{metric}_sum{{endpoint="{endpoint}"}} {hist["sum_seconds"]}')
+            lines.append(f'{metric}_count{{endpoint="{endpoint}"}} {hist["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def to_text(self) -> str:
+        data = self.to_dict()
+        counters = data["counters"]
+        lines = [
+            f"Requests: {counters['requests']:g}",
+            f"Fresh cache hits: {counters['cache_hits']:g}",
+            f"304 revalidations: {counters['revalidations']:g}",
+            f"Downloaded: {counters['bytes_downloaded'] / 1024:.1f} KiB",
+            f"Rate-limit sleep: {counters['rate_limit_sleep_seconds']:.2f}s",
+        ]
+        if counters.get("graphql_failures"):
+            lines.append(
+                f"GraphQL failures refetched over REST: "
+                f"{counters['graphql_failures']:g}"
+            )
+        for name, seconds in data["phases_seconds"].items():
+            phase, _, subphase = name.partition(".")
+            if subphase:
+                lines.append(
+                    f"Phase {phase}/{subphase} (summed across threads): "
+                    f"{seconds:.3f}s"
+                )
+            else:
+                lines.append(f"Phase {phase}: {seconds:.3f}s")
+        for endpoint, hist in data["latency"].items():
+            mean = hist["sum_seconds"] / hist["count"] if hist["count"] else 0.0
+            lines.append(
+                f"Latency {endpoint}: {hist['count']} requests, "
+                f"mean {mean * 1000:.0f} ms"
+            )
+        return "\n".join(lines)
+
+    def format(self, fmt: str) -> str:
+        if fmt == "json":
+            return self.to_json()
+        if fmt == "prometheus":
+            return self.to_prometheus()
+        return self.to_text()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+# orjson decodes API pages several times faster than the standard library
+# and is used when installed (``pip install github-getsummary[fast]``).
+# GCT_JSON_BACKEND=json forces the standard library, e.g. to compare runs.
+try:
+    if os.getenv("GCT_JSON_BACKEND", "").lower() == "json":
+        raise ImportError
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Both backends raise subclasses of this on malformed input
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
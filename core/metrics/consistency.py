@@ -1,8 +1,9 @@
 from datetime import datetime
-from statistics import mean, stdev
-from typing import List
+from typing import Dict, List, Sequence
 
+from core.commit_dataset import CommitDataset
 from core.github_client import GitHubClient, Repository
+from core.metrics.gaps import GapStats, gap_days
 
 
 class ConsistencyMetric:
@@ -15,68 +16,48 @@ class ConsistencyMetric:
         client: GitHubClient,
         username: str | None = None,
         repositories: List[Repository] | None = None,
+        dataset: CommitDataset | None = None,
     ) -> None:
         self.client = client
         self.username = username
         self.repositories = repositories
+        self.dataset = dataset or CommitDataset(
+            client, username=username, repositories=repositories
+        )
 
     def _commit_dates(self, repo_full_name: str) -> List[datetime]:
-        try:
-            commits = self.client._request(
-                f"https://api.github.com/repos/{repo_full_name}/commits",
-                params={"per_page": 100},
-            )
-        except Exception:
-            return []
-
-        dates: List[datetime] = []
-        if not commits or not isinstance(commits, list):
-            return dates
-            
-        for commit in commits:
-            if "commit" in commit:
-                date_str = commit["commit"]["author"]["date"]
-                dates.append(datetime.fromisoformat(date_str.replace("Z", "")))
-
-        return dates
+        return self.dataset.commit_dates(repo_full_name)
 
     def _commit_gaps(self) -> List[int]:
         gaps: List[int] = []
 
-        if self.repositories:
-            repos = self.repositories
-        elif self.username:
-            repos = list(self.client.iter_user_repositories(self.username))
-        else:
-            return []
-
-        for repo in repos:
-            dates = sorted(self._commit_dates(repo.full_name))
-            for i in range(1, len(dates)):
-                gaps.append((dates[i] - dates[i - 1]).days)
+        for _, timestamps in self.dataset.iter_commit_timestamps():
+            gaps.extend(gap_days(timestamps).tolist())
 
         return gaps
 
+    def gap_stats(self) -> GapStats:
+        return self.dataset.combined_gap_stats()
+
     def average_gap_days(self) -> float:
-        gaps = self._commit_gaps()
-        if not gaps:
+        stats = self.gap_stats()
+        if not stats.count:
             return 0.0
-        return round(mean(gaps), 2)
+        return round(stats.mean(), 2)
 
     def gap_variance(self) -> float:
-        gaps = self._commit_gaps()
-        if len(gaps) < 2:
+        stats = self.gap_stats()
+        if stats.count < 2:
             return 0.0
-        return round(stdev(gaps), 2)
+        return round(stats.stdev(), 2)
 
     def coefficient_of_variation(self) -> float:
-        gaps = self._commit_gaps()
-
-        if len(gaps) < 2:
-            return 0.0
-
-        avg = mean(gaps)
-        if avg == 0:
-            return 0.0
-
-        return round(stdev(gaps) / avg, 2)
+        return round(self.gap_stats().coefficient_of_variation(), 2)
+
+    def gap_percentiles(
+        self, qs: Sequence[float] = (25, 50, 75, 90)
+    ) -> Dict[float, float]:
+        return {
+            q: round(value, 2)
+            for q, value in self.gap_stats().percentiles(qs).items()
+        }
@@ -0,0 +1,122 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from core.github_client import GitHubClient, Repository
+from core.metrics.gaps import GapStats
+from core.timestamps import parse_timestamps
+
+CONTRIBUTOR_FIELDS = ("author.login", "commit.author.date")
+
+
+class ContributorMetric:
+    """
+    Consistency and yearly timelines for every contributor across a set
+    of repositories (typically an organization's), from one pass over
+    their commit histories.
+
+    Commits are grouped by the GitHub login of their author. Commits
+    whose author email isn't linked to an account have no login and are
+    left out. As with a user's analysis, gaps are measured between a
+    contributor's consecutive commits within each repository and then
+    combined across repositories.
+    """
+
+    def __init__(
+        self,
+        client: GitHubClient,
+        repositories: List[Repository],
+        since: str | None = None,
+        until: str | None = None,
+    ) -> None:
+        self.client = client
+        self.repositories = repositories
+        self.since = since
+        self.until = until
+        self._stats: Dict[str, GapStats] | None = None
+        self._commits: Dict[str, int] = {}
+
+    def _repo_stats(self, repo_full_name: str) -> Dict[str, Tuple[int, GapStats]]:
+        """
+        Commit count and gap stats per author login for one repository.
+        """
+        logins: List[str] = []
+        dates: List[str] = []
+        try:
+            for commit in self.client.iter_commits(
+                repo_full_name,
+                since=self.since,
+                until=self.until,
+                fields=CONTRIBUTOR_FIELDS,
+            ):
+                login = (commit.get("author") or {}).get("login")
+                if login and "commit" in commit:
+                    logins.append(login)
+                    dates.append(commit["commit"]["author"]["date"])
+        except Exception:
+            return {}
+        if not dates:
+            return {}
+
+        # Sort by (author, time) once, then slice each author's run
+        names, codes = np.unique(logins, return_inverse=True)
+        timestamps = parse_timestamps(dates)
+        order = np.lexsort((timestamps, codes))
+        timestamps, codes = timestamps[order], codes[order]
+        bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+
+        return {
+            str(name): (
+                int(end - start),
+                GapStats.from_timestamps(timestamps[start:end]),
+            )
+            for name, start, end in zip(names, bounds[:-1], bounds[1:])
+        }
+
+    def gap_stats(self) -> Dict[str, GapStats]:
+        """
+        Combined gap stats per contributor login, fetched on first use.
+        """
+        if self._stats is None:
+            names = [repo.full_name for repo in self.repositories]
+            stats: Dict[str, GapStats] = {}
+            commits: Dict[str, int] = {}
+            for per_author in self.client.map_concurrent(self._repo_stats, names):
+                for login, (count, repo_stats) in per_author.items():
+                    stats.setdefault(login, GapStats()).merge(repo_stats)
+                    commits[login] = commits.get(login, 0) + count
+            self._stats = dict(sorted(stats.items()))
+            self._commits = commits
+        return self._stats
+
+    def commit_counts(self) -> Dict[str, int]:
+        self.gap_stats()
+        return {login: self._commits[login] for login in self._stats}
+
+    def average_gap_days(self) -> Dict[str, float]:
+        return {
+            login: round(stats.mean(), 2) if stats.count else 0.0
+            for login, stats in self.gap_stats().items()
+        }
+
+    def gap_variance(self) -> Dict[str, float]:
+        return {
+            login: round(stats.stdev(), 2) if stats.count >= 2 else 0.0
+            for login, stats in self.gap_stats().items()
+        }
+
+    def yearly_average_gap(self) -> Dict[str, Dict[int, float]]:
+        return {
+            login: {year: round(avg, 2) for year, avg in stats.yearly_mean().items()}
+            for login, stats in self.gap_stats().items()
+        }
+
+    def gap_percentiles(
+        self, qs: Sequence[float] = (25, 50, 75, 90)
+    ) -> Dict[str, Dict[float, float]]:
+        return {
+            login: {
+                q: round(value, 2) for q, value in stats.percentiles(qs).items()
+            }
+            for login, stats in self.gap_stats().items()
+        }
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+
+def _year_of(timestamp: int) -> int:
+    return datetime.fromtimestamp(int(timestamp), timezone.utc).year
+
+
+def gap_days(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Whole-day gaps between consecutive ascending epoch-second timestamps.
+    """
+    return np.diff(timestamps) // SECONDS_PER_DAY
+
+
+@dataclass
+class GapStats:
+    """
+    Running aggregates of day gaps between consecutive commits.
+
+    Sums are kept as integers so mean and stdev are exact regardless of
+    the order in which repositories are merged. Per-repository stats are
+    built from int64 timestamp arrays with NumPy; merging is cheap.
+    """
+
+    count: int = 0
+    total: int = 0
+    total_sq: int = 0
+    # year -> [count, total]
+    by_year: Dict[int, List[int]] = field(default_factory=dict)
+    # gap in days -> occurrences; enough to plot the distribution without
+    # keeping every gap
+    histogram: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, gap: int, year: int) -> None:
+        self.count += 1
+        self.total += gap
+        self.total_sq += gap * gap
+        bucket = self.by_year.setdefault(year, [0, 0])
+        bucket[0] += 1
+        bucket[1] += gap
+        self.histogram[gap] = self.histogram.get(gap, 0) + 1
+
+    def merge(self, other: GapStats) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        for year, (count, total) in other.by_year.items():
+            bucket = self.by_year.setdefault(year, [0, 0])
+            bucket[0] += count
+            bucket[1] += total
+        for gap, count in other.histogram.items():
+            self.histogram[gap] = self.histogram.get(gap, 0) + count
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "total_sq": self.total_sq,
+            "by_year": {str(year): bucket for year, bucket in self.by_year.items()},
+            "histogram": {str(gap): n for gap, n in self.histogram.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> GapStats:
+        return cls(
+            count=data["count"],
+            total=data["total"],
+            total_sq=data["total_sq"],
+            by_year={int(year): list(b) for year, b in data["by_year"].items()},
+            histogram={int(gap): n for gap, n in data["histogram"].items()},
+        )
+
+    @classmethod
+    def combine(cls, stats: Iterable[GapStats]) -> GapStats:
+        combined = cls()
+        for item in stats:
+            combined.merge(item)
+        return combined
+
+    @classmethod
+    def from_timestamps(cls, timestamps: Iterable[int] | np.ndarray) -> GapStats:
+        """
+        Aggregate gaps from ascending epoch-second timestamps in vectorized
+        passes. A gap is attributed to the UTC year of its later commit.
+        """
+        ts = np.asarray(timestamps, dtype=np.int64)
+        if ts.size < 2:
+            return cls()
+
+        gaps = gap_days(ts)
+
+        # Year of each later commit via the Jan 1st boundaries it falls in
+        first_year, last_year = _year_of(ts[1]), _year_of(ts[-1])
+        years = np.arange(first_year, last_year + 1)
+        year_starts = np.array(
+            [datetime(y, 1, 1, tzinfo=timezone.utc).timestamp() for y in years],
+            dtype=np.int64,
+        )
+        year_idx = np.searchsorted(year_starts, ts[1:], side="right") - 1
+        year_counts = np.bincount(year_idx, minlength=years.size)
+        year_totals = np.bincount(year_idx, weights=gaps, minlength=years.size)
+
+        gap_counts = np.bincount(gaps)
+        present = np.flatnonzero(gap_counts)
+
+        return cls(
+            count=int(gaps.size),
+            total=int(gaps.sum()),
+            total_sq=int(np.dot(gaps, gaps)),
+            by_year={
+                int(years[i]): [int(year_counts[i]), int(round(year_totals[i]))]
+                for i in np.flatnonzero(year_counts)
+            },
+            histogram=dict(zip(present.tolist(), gap_counts[present].tolist())),
+        )
+
+    def mean(self) -> float:
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    def stdev(self) -> float:
+        """
+        Sample standard deviation, matching ``statistics.stdev``.
+        """
+        if self.count < 2:
+            return 0.0
+        numerator = self.count * self.total_sq - self.total * self.total
+        return math.sqrt(numerator / (self.count * (self.count - 1)))
+
+    def coefficient_of_variation(self) -> float:
+        avg = self.mean()
+        if self.count < 2 or avg == 0:
+            return 0.0
+        return self.stdev() / avg
+
+    def percentiles(self, qs: Sequence[float]) -> Dict[float, float]:
+        """
+        Gap percentiles with linear interpolation (``numpy.percentile``'s
+        default), computed from the histogram.
+        """
+        if not self.count:
+            return {q: 0.0 for q in qs}
+
+        values = np.array(sorted(self.histogram), dtype=np.float64)
+        # Rank of the last occurrence of each distinct gap
+        last_rank = np.cumsum([self.histogram[int(v)] for v in values]) - 1
+
+        positions = np.asarray(qs, dtype=np.float64) / 100 * (self.count - 1)
+        lower = np.floor(positions)
+        low_vals = values[np.searchsorted(last_rank, lower)]
+        high_vals = values[np.searchsorted(last_rank, np.ceil(positions))]
+        result = low_vals + (high_vals - low_vals) * (positions - lower)
+        return dict(zip(qs, result.tolist()))
+
+    def yearly_mean(self) -> Dict[int, float]:
+        return {
+            year: total / count
+            for year, (count, total) in self.by_year.items()
+            if count
+        }
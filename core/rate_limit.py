@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import requests
+
+# Retry-After is absent on most secondary rate limits; GitHub asks
+# clients to wait at least a minute before retrying those
+SECONDARY_LIMIT_WAIT = 60.0
+MAX_BACKOFF = 60.0
+
+
+def _header_number(headers: Mapping, name: str) -> Optional[float]:
+    try:
+        value = headers.get(name)
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Tracks the primary rate-limit budget from response headers and paces
+    requests so it lasts until the reset time.
+
+    Requests run at full speed while more than ``low_water`` of the
+    budget is left. Below that they are spaced evenly over what remains
+    of the window, and with nothing left they wait for the reset.
+    Priority requests (cache revalidations, which GitHub does not charge
+    for when they return 304) skip pacing but still wait on an empty
+    budget.
+    """
+
+    def __init__(
+        self,
+        low_water: float = 0.1,
+        backoff_base: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.low_water = low_water
+        self.backoff_base = backoff_base
+        self.sleep = sleep
+        self.clock = clock
+        self.limit: Optional[float] = None
+        self.remaining: Optional[float] = None
+        self.reset: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def update(self, headers: Mapping) -> None:
+        limit = _header_number(headers, "X-RateLimit-Limit")
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset = _header_number(headers, "X-RateLimit-Reset")
+
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                self.remaining = remaining
+            if reset is not None:
+                self.reset = reset
+
+    def delay(self, priority: bool = False) -> float:
+        """
+        Seconds to wait before the next request may be sent.
+        """
+        with self._lock:
+            if self.remaining is None or self.reset is None:
+                return 0.0
+
+            window = self.reset - self.clock()
+            if window <= 0:
+                # The budget has been refilled since the last response
+                return 0.0
+            if self.remaining <= 0:
+                return window + 1
+            if priority:
+                return 0.0
+
+            limit = self.limit or self.remaining
+            if self.remaining > limit * self.low_water:
+                return 0.0
+            return window / self.remaining
+
+    def headroom(self) -> float:
+        """
+        Requests left in the current window (infinite when unknown or
+        already reset).
+        """
+        with self._lock:
+            if self.remaining is None or self.reset is None:
+                return float("inf")
+            if self.reset <= self.clock():
+                return float("inf")
+            return self.remaining
+
+    def acquire(self, priority: bool = False) -> float:
+        """
+        Wait until a request may be sent; returns the seconds slept.
+        """
+        wait = self.delay(priority)
+        if wait > 0:
+            self.sleep(wait)
+
+        # Reserve a unit of budget so concurrent workers pace off each
+        # other until the next response reports the real figure
+        with self._lock:
+            if self.remaining is not None and self.remaining > 0:
+                self.remaining -= 1
+        return max(wait, 0.0)
+
+    def retry_delay(
+        self, response: requests.Response, attempt: int
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying ``response``, or None when it
+        should not be retried.
+        """
+        status = response.status_code
+        if status not in (403, 429) and status < 500:
+            return None
+
+        retry_after = _header_number(response.headers, "Retry-After")
+        if retry_after is not None:
+            return max(retry_after, 0.0)
+
+        backoff = min(self.backoff_base * 2**attempt, MAX_BACKOFF)
+        if status >= 500:
+            return backoff
+
+        remaining = _header_number(response.headers, "X-RateLimit-Remaining")
+        if remaining == 0:
+            # acquire() waits for the reset, or a pool routes elsewhere
+            return 0.0
+        if "secondary rate limit" in (response.text or "").lower():
+            return max(SECONDARY_LIMIT_WAIT, backoff)
+        if status == 429:
+            return backoff
+
+        # A plain 403 is a permission error, not a rate limit
+        return None
+
+
+class TokenPool:
+    """
+    Several API tokens, each with its own RateLimiter. Every request is
+    routed to the token with the most headroom, so throughput grows with
+    the number of tokens. ``None`` stands for an anonymous client.
+    """
+
+    def __init__(self, tokens: List[Optional[str]], **limiter_kwargs) -> None:
+        self.tokens = list(dict.fromkeys(tokens)) or [None]
+        self.limiters: Dict[Optional[str], RateLimiter] = {
+            token: RateLimiter(**limiter_kwargs) for token in self.tokens
+        }
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def choose(self) -> Tuple[Optional[str], RateLimiter]:
+        # max() keeps the first of equal candidates, so fresh tokens are
+        # used in order until their budgets are known
+        token = max(self.tokens, key=lambda t: self.limiters[t].headroom())
+        return token, self.limiters[token]
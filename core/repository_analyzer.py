@@ -1,9 +1,11 @@
-from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable, Dict, List
+from typing import Iterable, Dict, List, Tuple, Union
+
+import numpy as np
 
 from core.github_client import Repository
+from core.repository_table import MISSING, RepositoryTable
+from core.timestamps import years_of
 
 
 @dataclass(frozen=True)
@@ -15,48 +17,72 @@ class RepositorySnapshot:
 
 
 class RepositoryAnalyzer:
-    def __init__(self, repositories: Iterable[Repository]) -> None:
-        self.repositories = list(repositories)
+    def __init__(
+        self, repositories: Union[RepositoryTable, Iterable[Repository]]
+    ) -> None:
+        if isinstance(repositories, RepositoryTable):
+            self.table = repositories
+        else:
+            self.table = RepositoryTable.from_repositories(repositories)
 
-    def _filter_relevant(self) -> List[Repository]:
+    def _filter_relevant(self) -> RepositoryTable:
         """
-        Remove forks and invalid repositories.
+        Remove forks and repositories without a creation date.
         """
-        return [
-            repo for repo in self.repositories
-            if not repo.is_fork
-        ]
-
-    def group_by_year(self) -> Dict[int, List[Repository]]:
-        grouped: Dict[int, List[Repository]] = defaultdict(list)
+        table = self.table
+        return table.take(~table.is_fork & (table.created_at != MISSING))
 
-        for repo in self._filter_relevant():
-            year = datetime.fromisoformat(
-                repo.created_at.replace("Z", "")
-            ).year
-            grouped[year].append(repo)
+    def _years(self, table: RepositoryTable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distinct creation years, ascending, and each row's index into them.
+        """
+        return np.unique(years_of(table.created_at), return_inverse=True)
 
-        return dict(grouped)
+    def group_by_year(self) -> Dict[int, RepositoryTable]:
+        """
+        One sub-table per creation year, each in listing order.
+        """
+        table = self._filter_relevant()
+        years, inverse = self._years(table)
+        # Stable, so each year keeps the listing order
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(years) + 1))
+        return {
+            year: table.take(order[start:end])
+            for year, start, end in zip(
+                years.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()
+            )
+        }
 
     def yearly_snapshots(self) -> List[RepositorySnapshot]:
-        snapshots: List[RepositorySnapshot] = []
-
-        for year, repos in sorted(self.group_by_year().items()):
-            total_size = sum(r.size_kb for r in repos)
-            avg_size = total_size / len(repos)
-
-            languages: Dict[str, int] = defaultdict(int)
-            for repo in repos:
-                if repo.language:
-                    languages[repo.language] += 1
-
-            snapshots.append(
-                RepositorySnapshot(
-                    year=year,
-                    total_repos=len(repos),
-                    avg_size_kb=round(avg_size, 2),
-                    languages=dict(languages),
-                )
-            )
+        table = self._filter_relevant()
+        years, inverse = self._years(table)
+        totals = np.bincount(inverse, minlength=len(years))
+        sizes = np.bincount(inverse, weights=table.size_kb, minlength=len(years))
 
-        return snapshots
+        # Count (year, language) pairs, keeping each year's languages in
+        # order of first appearance, as filling a dict row by row would
+        width = max(len(table.languages), 1)
+        has_language = table.language_codes >= 0
+        pairs = (
+            inverse[has_language].astype(np.int64) * width
+            + table.language_codes[has_language]
+        )
+        keys, first, counts = np.unique(pairs, return_index=True, return_counts=True)
+        order = np.argsort(first)
+        languages: List[Dict[str, int]] = [{} for _ in years]
+        for key, count in zip(keys[order].tolist(), counts[order].tolist()):
+            year_index, code = divmod(key, width)
+            languages[year_index][table.languages[code]] = count
+
+        return [
+            RepositorySnapshot(
+                year=year,
+                total_repos=total,
+                avg_size_kb=round(size / total, 2),
+                languages=langs,
+            )
+            for year, total, size, langs in zip(
+                years.tolist(), totals.tolist(), sizes.tolist(), languages
+            )
+        ]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Optional
+
+from core.github_client import Repository
+
+
+@dataclass(frozen=True)
+class RepositoryFilter:
+    """
+    Drops repositories from a listing using only the listing metadata,
+    before any of their commits are requested. The defaults keep every
+    repository.
+    """
+
+    exclude_forks: bool = False
+    exclude_archived: bool = False
+    # GitHub reports 0 for empty repositories
+    min_size_kb: int = 0
+    # ISO timestamp; repositories neither pushed to nor updated since are
+    # dropped
+    active_since: Optional[str] = None
+    # Lowercased language names; an empty include set allows any language
+    languages: FrozenSet[str] = frozenset()
+    exclude_languages: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_options(
+        cls,
+        exclude_forks: bool = False,
+        exclude_archived: bool = False,
+        min_size_kb: int = 0,
+        active_since: Optional[str] = None,
+        languages: Iterable[str] = (),
+        exclude_languages: Iterable[str] = (),
+    ) -> RepositoryFilter:
+        return cls(
+            exclude_forks=exclude_forks,
+            exclude_archived=exclude_archived,
+            min_size_kb=min_size_kb,
+            active_since=active_since,
+            languages=frozenset(lang.lower() for lang in languages),
+            exclude_languages=frozenset(lang.lower() for lang in exclude_languages),
+        )
+
+    def accepts(self, repo: Repository) -> bool:
+        if self.exclude_forks and repo.is_fork:
+            return False
+        if self.exclude_archived and repo.is_archived:
+            return False
+        if repo.size_kb < self.min_size_kb:
+            return False
+
+        if self.active_since is not None:
+            # Both are GitHub's fixed-width UTC format, so they compare as
+            # strings
+            last_active = max(
+                filter(None, (repo.pushed_at, repo.updated_at)), default=""
+            )
+            if last_active < self.active_since:
+                return False
+
+        language = (repo.language or "").lower()
+        if self.languages and language not in self.languages:
+            return False
+        return language not in self.exclude_languages
+
+    def apply(self, repositories: Iterable[Repository]) -> List[Repository]:
+        if self == RepositoryFilter():
+            return list(repositories)
+        return [repo for repo in repositories if self.accepts(repo)]
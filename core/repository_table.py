@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from core.github_client import Repository
+from core.timestamps import parse_timestamps
+
+# Epoch value standing in for a missing timestamp (e.g. a repository that
+# was never pushed to)
+MISSING = np.iinfo(np.int64).min
+
+
+def _epochs(values: Sequence[Optional[str]]) -> np.ndarray:
+    result = np.full(len(values), MISSING, dtype=np.int64)
+    present = [i for i, value in enumerate(values) if value]
+    if present:
+        result[present] = parse_timestamps([values[i] for i in present])
+    return result
+
+
+def _iso(epochs: np.ndarray) -> List[Optional[str]]:
+    missing = epochs == MISSING
+    strings = np.datetime_as_string(
+        np.where(missing, 0, epochs).astype("datetime64[s]"), unit="s"
+    )
+    return [
+        None if gone else f"{text}Z" for text, gone in zip(strings.tolist(), missing)
+    ]
+
+
+class RepositoryTable:
+    """
+    Repositories stored column by column: one NumPy array per numeric
+    field, timestamps as int64 epoch seconds (MISSING when absent) and
+    languages as int32 codes into a shared, interned vocabulary (-1 for
+    none). Aggregations run on the columns without a Python object per
+    repository; rows are only rebuilt as Repository on request, with
+    timestamps in GitHub's ``...Z`` form.
+    """
+
+    def __init__(
+        self,
+        full_names: List[str],
+        is_fork: np.ndarray,
+        is_archived: np.ndarray,
+        size_kb: np.ndarray,
+        language_codes: np.ndarray,
+        languages: List[str],
+        created_at: np.ndarray,
+        updated_at: np.ndarray,
+        pushed_at: np.ndarray,
+    ) -> None:
+        self.full_names = full_names
+        self.is_fork = is_fork
+        self.is_archived = is_archived
+        self.size_kb = size_kb
+        self.language_codes = language_codes
+        self.languages = languages
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.pushed_at = pushed_at
+
+    @classmethod
+    def from_repositories(
+        cls, repositories: Iterable[Repository]
+    ) -> RepositoryTable:
+        repos = list(repositories)
+        return cls._from_columns(
+            full_names=[repo.full_name for repo in repos],
+            is_fork=[repo.is_fork for repo in repos],
+            is_archived=[repo.is_archived for repo in repos],
+            size_kb=[repo.size_kb for repo in repos],
+            languages=[repo.language for repo in repos],
+            created_at=[repo.created_at for repo in repos],
+            updated_at=[repo.updated_at for repo in repos],
+            pushed_at=[repo.pushed_at for repo in repos],
+        )
+
+    @classmethod
+    def from_listing(cls, pages: Iterable[Sequence[dict]]) -> RepositoryTable:
+        """
+        Build the columns straight from repository listing pages as the
+        API returns them (``GitHubClient.iter_user_repository_pages``),
+        without a Repository per row.
+        """
+        items = [repo for page in pages for repo in page]
+        return cls._from_columns(
+            full_names=[repo["full_name"] for repo in items],
+            is_fork=[repo["fork"] for repo in items],
+            is_archived=[repo.get("archived", False) for repo in items],
+            size_kb=[repo["size"] for repo in items],
+            languages=[repo["language"] for repo in items],
+            created_at=[repo["created_at"] for repo in items],
+            updated_at=[repo["updated_at"] for repo in items],
+            pushed_at=[repo.get("pushed_at") for repo in items],
+        )
+
+    @classmethod
+    def _from_columns(
+        cls,
+        full_names: List[str],
+        is_fork: List[bool],
+        is_archived: List[bool],
+        size_kb: List[Optional[int]],
+        languages: List[Optional[str]],
+        created_at: List[Optional[str]],
+        updated_at: List[Optional[str]],
+        pushed_at: List[Optional[str]],
+    ) -> RepositoryTable:
+        codes: List[int] = []
+        vocabulary: Dict[str, int] = {}
+        for language in languages:
+            if language is None:
+                codes.append(-1)
+            else:
+                code = vocabulary.get(language)
+                if code is None:
+                    code = vocabulary[sys.intern(language)] = len(vocabulary)
+                codes.append(code)
+
+        return cls(
+            full_names=full_names,
+            is_fork=np.array(is_fork, dtype=bool),
+            is_archived=np.array(is_archived, dtype=bool),
+            size_kb=np.array([size or 0 for size in size_kb], dtype=np.int64),
+            language_codes=np.array(codes, dtype=np.int32),
+            languages=list(vocabulary),
+            created_at=_epochs(created_at),
+            updated_at=_epochs(updated_at),
+            pushed_at=_epochs(pushed_at),
+        )
+
+    def __len__(self) -> int:
+        return len(self.full_names)
+
+    def __iter__(self) -> Iterator[Repository]:
+        return iter(self.rows(np.arange(len(self))))
+
+    def __getitem__(self, index: int) -> Repository:
+        return self.rows([index])[0]
+
+    def take(self, selection: np.ndarray) -> RepositoryTable:
+        """
+        Sub-table for a boolean mask or an array of row indices, sharing
+        the language vocabulary.
+        """
+        indices = np.arange(len(self))[selection]
+        return RepositoryTable(
+            full_names=[self.full_names[i] for i in indices.tolist()],
+            is_fork=self.is_fork[indices],
+            is_archived=self.is_archived[indices],
+            size_kb=self.size_kb[indices],
+            language_codes=self.language_codes[indices],
+            languages=self.languages,
+            created_at=self.created_at[indices],
+            updated_at=self.updated_at[indices],
+            pushed_at=self.pushed_at[indices],
+        )
+
+    def rows(self, indices: Sequence[int] | np.ndarray) -> List[Repository]:
+        indices = np.asarray(indices, dtype=np.int64)
+        created = _iso(self.created_at[indices])
+        updated = _iso(self.updated_at[indices])
+        pushed = _iso(self.pushed_at[indices])
+        repos = []
+        for row, i in enumerate(indices.tolist()):
+            full_name = self.full_names[i]
+            code = int(self.language_codes[i])
+            repos.append(
+                Repository(
+                    name=full_name.rsplit("/", 1)[-1],
+                    full_name=full_name,
+                    is_fork=bool(self.is_fork[i]),
+                    size_kb=int(self.size_kb[i]),
+                    language=self.languages[code] if code >= 0 else None,
+                    created_at=created[row] or "",
+                    updated_at=updated[row] or "",
+                    pushed_at=pushed[row],
+                    is_archived=bool(self.is_archived[i]),
+                )
+            )
+        return repos
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from core.github_client import GitHubAPIError, GitHubClient
+from core.use_cases import LOGIN, Target, analyze_repositories, since_iso
+
+# (kind, name, since, top)
+AnalysisKey = Tuple[str, str, Optional[str], Optional[int]]
+
+
+class NotFound(Exception):
+    pass
+
+
+class TelemetryService:
+    """
+    Serves ``analyze_repositories`` results from one long-lived
+    GitHubClient, so its connection pool and caches stay warm between
+    requests.
+
+    Concurrent requests for the same analysis share one in-flight
+    computation. At most ``max_concurrency`` analyses run at once; each
+    fetches with up to ``client.workers`` concurrent requests, which
+    bounds the load on GitHub.
+    """
+
+    def __init__(
+        self,
+        client: GitHubClient,
+        max_concurrency: int = 4,
+    ) -> None:
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency))
+        self._in_flight: Dict[AnalysisKey, Future] = {}
+        self._lock = threading.Lock()
+
+    def _compute(self, key: AnalysisKey) -> str:
+        kind, name, since, top = key
+        if kind == "org":
+            repos = list(self.client.iter_org_repositories(name))
+            if top:
+                repos = repos[:top]
+        else:
+            repos = list(self.client.iter_user_repositories(name))
+
+        if not repos:
+            raise NotFound("No repositories found.")
+        return analyze_repositories(self.client, repos, fmt="json", since=since)
+
+    def _done(self, key: AnalysisKey, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def analyze(
+        self, target: Target, since_days: int = 0, top: int | None = None
+    ) -> str:
+        """
+        The JSON report for ``target`` over the last ``since_days`` days
+        (0 = all history), joining a running computation of the same
+        analysis when there is one.
+        """
+        kind, name = target
+        key: AnalysisKey = (kind, name, since_iso(since_days), top)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._executor.submit(self._compute, key)
+                self._in_flight[key] = future
+                future.add_done_callback(lambda f: self._done(key, f))
+        return future.result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: TelemetryServer
+
+    def _reply(
+        self, status: int, body: str, content_type: str = "application/json"
+    ) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str) -> None:
+        self._reply(status, json.dumps({"error": message}))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        if parts == ["healthz"]:
+            self._reply(200, json.dumps({"status": "ok"}))
+            return
+        if parts == ["metrics"]:
+            self._reply(
+                200,
+                self.server.service.client.stats.to_prometheus(),
+                "text/plain; version=0.0.4",
+            )
+            return
+        if len(parts) != 2 or parts[0] not in ("user", "org"):
+            self._error(404, "Use /user/<login> or /org/<login>.")
+            return
+
+        kind, name = parts
+        query = parse_qs(url.query)
+        try:
+            # Same defaults as ``gct user`` / ``gct org``
+            default_since = "180" if kind == "user" else "0"
+            since = int(query.get("since", [default_since])[0])
+            top = int(query["top"][0]) if "top" in query else None
+        except ValueError:
+            self._error(400, "since and top must be integers.")
+            return
+        if not LOGIN.fullmatch(name):
+            self._error(400, f"Invalid login: {name!r}")
+            return
+
+        try:
+            body = self.server.service.analyze((kind, name), since, top)
+        except NotFound as e:
+            self._error(404, str(e))
+        except GitHubAPIError as e:
+            self._error(502, str(e))
+        except Exception as e:
+            self._error(500, f"{type(e).__name__}: {e}")
+        else:
+            self._reply(200, body)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class TelemetryServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP front end for a TelemetryService.
+
+    GET /user/<login>?since=<days> and /org/<login>?top=<n>&since=<days>
+    return the JSON report; GET /healthz answers without touching GitHub
+    and GET /metrics exposes the client's counters to Prometheus.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: TelemetryService,
+        quiet: bool = False,
+    ) -> None:
+        self.service = service
+        self.quiet = quiet
+        super().__init__(address, _Handler)
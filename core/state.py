@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from core.metrics.gaps import GapStats
+
+
+@dataclass
+class RepoState:
+    """
+    What a previous run learned about one repository's commit history.
+    """
+
+    # ``since`` window the aggregates were built for; a different window
+    # needs a full refetch
+    since: Optional[str]
+    pushed_at: Optional[str]
+    last_timestamp: Optional[int]
+    # Every commit authored at ``last_timestamp``: the next run asks for
+    # commits since that second and must tell these apart from new ones
+    last_shas: List[str] = field(default_factory=list)
+    stats: GapStats = field(default_factory=GapStats)
+
+    def to_dict(self) -> dict:
+        return {
+            "since": self.since,
+            "pushed_at": self.pushed_at,
+            "last_timestamp": self.last_timestamp,
+            "last_shas": self.last_shas,
+            "stats": self.stats.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RepoState:
+        return cls(
+            since=data["since"],
+            pushed_at=data["pushed_at"],
+            last_timestamp=data["last_timestamp"],
+            last_shas=data["last_shas"],
+            stats=GapStats.from_dict(data["stats"]),
+        )
+
+
+class AnalysisState:
+    """
+    Per-repository state persisted between runs as one JSON file, so
+    incremental runs only fetch commits newer than the last one seen.
+    """
+
+    FILENAME = "state.json"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._repos: Dict[str, RepoState] = {}
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._repos = {
+                name: RepoState.from_dict(repo) for name, repo in data.items()
+            }
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            # Missing or unreadable state just means a full run
+            self._repos = {}
+
+    @classmethod
+    def in_dir(cls, cache_dir: str) -> AnalysisState:
+        return cls(os.path.join(cache_dir, cls.FILENAME))
+
+    def get(self, repo_full_name: str) -> Optional[RepoState]:
+        with self._lock:
+            return self._repos.get(repo_full_name)
+
+    def set(self, repo_full_name: str, state: RepoState) -> None:
+        with self._lock:
+            self._repos[repo_full_name] = state
+
+    def save(self) -> None:
+        with self._lock:
+            data = {name: repo.to_dict() for name, repo in self._repos.items()}
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
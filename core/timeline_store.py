@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+from core.cache import PRUNE_EVERY, CacheStats
+
+# File layout: a 64-byte header followed by ``count`` little-endian int64
+# epoch seconds in ascending order.
+#   magic (4s) | version (I) | fetched_at (d) | count (Q) | pushed_at (32s)
+MAGIC = b"GCTL"
+VERSION = 1
+HEADER = struct.Struct("<4sIdQ32s")
+HEADER_SIZE = 64
+
+# Timelines are keyed by the ``since`` window, which moves daily, so old
+# windows are never read again. Saves drop timelines unused this long.
+AUTO_PRUNE_IDLE_SECONDS = 30 * 86400
+
+
+class TimelineStore:
+    """
+    Compact per-repository commit timelines derived from the API
+    responses, stored next to the HTTP cache.
+
+    A timeline is fresh while younger than ``ttl_seconds``, or for as long
+    as the repository's ``pushed_at`` matches the one it was built from.
+    Fresh timelines are memory-mapped, so loading one neither decodes JSON
+    nor copies the data.
+
+    File mtimes are touched on each fresh load and serve as the idle
+    clock for ``prune``.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self._saves = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(
+        self, repo_full_name: str, since: str | None, until: str | None
+    ) -> str:
+        key = f"{repo_full_name}|{since or ''}|{until or ''}"
+        hashed = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{hashed}.tl")
+
+    def load(
+        self,
+        repo_full_name: str,
+        since: str | None = None,
+        until: str | None = None,
+        pushed_at: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        The stored timeline if it is fresh, else None.
+        """
+        path = self.path(repo_full_name, since, until)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read(HEADER.size)
+        except OSError:
+            return None
+
+        if len(raw) != HEADER.size:
+            return None
+        magic, version, fetched_at, count, stored_pushed = HEADER.unpack(raw)
+        if magic != MAGIC or version != VERSION:
+            return None
+
+        stored_pushed = stored_pushed.rstrip(b"\0").decode("ascii") or None
+        unchanged = pushed_at is not None and stored_pushed == pushed_at
+        if not unchanged and time.time() - fetched_at >= self.ttl_seconds:
+            return None
+
+        try:
+            os.utime(path)
+            if count == 0:
+                return np.empty(0, dtype=np.int64)
+            return np.memmap(
+                path, dtype="<i8", mode="r", offset=HEADER_SIZE, shape=(count,)
+            )
+        except (OSError, ValueError):
+            # Removed meanwhile, or truncated
+            return None
+
+    def save(
+        self,
+        repo_full_name: str,
+        timestamps: np.ndarray,
+        since: str | None = None,
+        until: str | None = None,
+        pushed_at: Optional[str] = None,
+    ) -> None:
+        path = self.path(repo_full_name, since, until)
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            time.time(),
+            len(timestamps),
+            (pushed_at or "").encode("ascii")[:32],
+        ).ljust(HEADER_SIZE, b"\0")
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(np.asarray(timestamps, dtype="<i8").tobytes())
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._saves += 1
+        if self._saves % PRUNE_EVERY == 1:
+            self.prune(max_idle_seconds=AUTO_PRUNE_IDLE_SECONDS)
+
+    def _timelines(self) -> list[tuple[float, int, str]]:
+        """
+        (mtime, size, path) for every stored timeline.
+        """
+        timelines = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".tl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            timelines.append((st.st_mtime, st.st_size, path))
+        return timelines
+
+    def stats(self) -> CacheStats:
+        timelines = self._timelines()
+        return CacheStats(
+            entries=len(timelines), size_bytes=sum(size for _, size, _ in timelines)
+        )
+
+    def prune(self, max_idle_seconds: float) -> int:
+        """
+        Remove timelines not loaded or saved for ``max_idle_seconds``.
+        Returns the number removed.
+        """
+        cutoff = time.time() - max_idle_seconds
+        removed = 0
+        for mtime, _, path in self._timelines():
+            if mtime >= cutoff:
+                continue
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith((".tl", ".tmp")):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Sequence
+
+import numpy as np
+
+# Fixed layouts GitHub uses, by string length:
+#   19: 2024-01-31T12:34:56         (no zone, read as UTC)
+#   20: 2024-01-31T12:34:56Z
+#   25: 2024-01-31T12:34:56+02:00
+_FAST_LENGTHS = (19, 20, 25)
+
+
+def _days_from_civil(
+    year: np.ndarray, month: np.ndarray, day: np.ndarray
+) -> np.ndarray:
+    """
+    Days since 1970-01-01 for proleptic Gregorian dates (H. Hinnant's
+    algorithm), vectorized.
+    """
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    yoe = year - era * 400
+    mp = (month + 9) % 12
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_SEPARATORS = {4: "-", 7: "-", 10: "T", 13: ":", 16: ":"}
+
+
+def _field(digits: np.ndarray, start: int, width: int) -> np.ndarray:
+    weights = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return digits[:, start:start + width] @ weights
+
+
+def _days_in_month(year: np.ndarray, month: np.ndarray) -> np.ndarray:
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    return days[np.clip(month, 0, 12)] + (leap & (month == 2))
+
+
+def _valid_rows(chars: np.ndarray, length: int) -> np.ndarray:
+    digits = chars[:, _DIGITS]
+    valid = np.all((digits >= ord("0")) & (digits <= ord("9")), axis=1)
+    for pos, sep in _SEPARATORS.items():
+        valid &= chars[:, pos] == ord(sep)
+    if length == 20:
+        valid &= chars[:, 19] == ord("Z")
+    elif length == 25:
+        valid &= (chars[:, 19] == ord("+")) | (chars[:, 19] == ord("-"))
+        valid &= chars[:, 22] == ord(":")
+
+    # Out-of-range fields are left to datetime.fromisoformat, which
+    # rejects them
+    values = chars.astype(np.int64) - ord("0")
+    year = _field(values, 0, 4)
+    month = _field(values, 5, 2)
+    day = _field(values, 8, 2)
+    valid &= year >= 1
+    valid &= (month >= 1) & (month <= 12)
+    valid &= (day >= 1) & (day <= _days_in_month(year, month))
+    valid &= _field(values, 11, 2) <= 23
+    valid &= _field(values, 14, 2) <= 59
+    valid &= _field(values, 17, 2) <= 59
+    if length == 25:
+        valid &= _field(values, 20, 2) <= 23
+        valid &= _field(values, 23, 2) <= 59
+    return valid
+
+
+def _parse_fixed(chars: np.ndarray, length: int) -> np.ndarray:
+    digits = chars.astype(np.int64) - ord("0")
+
+    def field(start: int, width: int) -> np.ndarray:
+        return _field(digits, start, width)
+
+    days = _days_from_civil(field(0, 4), field(5, 2), field(8, 2))
+    seconds = days * 86400 + field(11, 2) * 3600 + field(14, 2) * 60 + field(17, 2)
+
+    if length == 25:
+        sign = np.where(chars[:, 19] == ord("-"), -1, 1)
+        seconds -= sign * (field(20, 2) * 3600 + field(23, 2) * 60)
+
+    return seconds
+
+
+def _parse_slow(date_str: str) -> int:
+    parsed = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def parse_timestamps(date_strs: Sequence[str]) -> np.ndarray:
+    """
+    Convert ISO-8601 strings to int64 epoch seconds, in input order.
+
+    GitHub's fixed layouts (``Z``, ``±HH:MM`` or no zone, read as UTC)
+    are validated and decoded arithmetically on a byte matrix, with no
+    per-item ``datetime``; anything else falls back to
+    ``datetime.fromisoformat``.
+    """
+    count = len(date_strs)
+    result = np.empty(count, dtype=np.int64)
+    lengths = np.fromiter(map(len, date_strs), dtype=np.int64, count=count)
+    slow = ~np.isin(lengths, _FAST_LENGTHS)
+
+    for length in _FAST_LENGTHS:
+        indices = np.flatnonzero(lengths == length)
+        if not indices.size:
+            continue
+
+        group = date_strs if indices.size == count else [
+            date_strs[i] for i in indices
+        ]
+        raw = "".join(group).encode("utf-8")
+        if len(raw) != indices.size * length:
+            # Non-ASCII text; byte offsets no longer line up
+            slow[indices] = True
+            continue
+
+        chars = np.frombuffer(raw, dtype=np.uint8).reshape(-1, length)
+        valid = _valid_rows(chars, length)
+        result[indices[valid]] = _parse_fixed(chars[valid], length)
+        slow[indices[~valid]] = True
+
+    for i in np.flatnonzero(slow):
+        result[i] = _parse_slow(date_strs[i])
+
+    return result
+
+
+def years_of(timestamps: np.ndarray) -> np.ndarray:
+    """
+    UTC calendar year of each epoch-second timestamp.
+    """
+    years = timestamps.astype("datetime64[s]").astype("datetime64[Y]")
+    return years.astype(np.int64) + 1970
@@ -1,29 +1,82 @@
 from __future__ import annotations
 import json
 import os
-from typing import Literal
+import re
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Literal
+
+from core.github_client import GitHubAPIError, GitHubClient, Repository
+
+if TYPE_CHECKING:
+    from core.commit_dataset import CommitDataset
+    from core.repository_filter import RepositoryFilter
+    from core.state import AnalysisState
+    from visualization.render import ChartJob
+
+# NumPy and matplotlib are imported inside analyze_repositories, on the
+# paths that use them, so the CLI starts without paying for either
+
+# GitHub logins: alphanumerics and single hyphens. Also keeps report
+# directory names safe.
+LOGIN = re.compile(r"[A-Za-z0-9](?:-?[A-Za-z0-9])*")
+
+
+def since_iso(days: int) -> str | None:
+    """
+    Convert a day window to an ISO timestamp truncated to midnight UTC, so
+    the request (and its cache key) stays stable for the whole day.
+    """
+    if days <= 0:
+        return None
+    start = datetime.now(timezone.utc) - timedelta(days=days)
+    return start.strftime("%Y-%m-%dT00:00:00Z")
 
-from core.github_client import GitHubClient, Repository
-from core.metrics.consistency import ConsistencyMetric
-from core.metrics.timeline import TimelineMetric
-from visualization.consistency_plot import ConsistencyPlot
-from visualization.timeline_plot import TimelinePlot
 
 def analyze_repositories(
     client: GitHubClient,
     repos: list[Repository],
     output_path: str | None = None,
     fmt: Literal["md", "html", "json"] = "md",
+    since: str | None = None,
+    backend: Literal["rest", "graphql"] = "rest",
+    state: AnalysisState | None = None,
+    charts: list[ChartJob] | None = None,
+    dataset: CommitDataset | None = None,
 ) -> str:
-    # Consistency Metrics
-    cons_metric = ConsistencyMetric(client, repositories=repos)
-    gaps = cons_metric._commit_gaps()
-    mean_gap = cons_metric.average_gap_days()
-    variance_gap = cons_metric.gap_variance()
+    """
+    Compute the metrics for ``repos`` and write the report.
 
-    # Timeline Metrics
-    time_metric = TimelineMetric(client, repositories=repos)
-    timeline_data = time_metric.yearly_average_gap()
+    Charts are rendered in worker processes before returning. When
+    ``charts`` is given they are appended to it instead, so a caller
+    producing many reports can render them all in one pool. A prefetched
+    ``dataset`` covering ``repos`` replaces fetching here.
+    """
+    from core.commit_dataset import CommitDataset
+    from core.metrics.consistency import ConsistencyMetric
+    from core.metrics.timeline import TimelineMetric
+
+    stats = client.stats
+
+    # Commits are fetched once per repository and shared by every metric
+    if dataset is None:
+        dataset = CommitDataset(
+            client, repositories=repos, since=since, backend=backend, state=state
+        )
+        with stats.phase("fetch"):
+            dataset.prefetch()
+            if state is not None:
+                state.save()
+
+    with stats.phase("metrics"):
+        # Consistency Metrics
+        cons_metric = ConsistencyMetric(client, repositories=repos, dataset=dataset)
+        gap_histogram = cons_metric.gap_stats().histogram
+        mean_gap = cons_metric.average_gap_days()
+        variance_gap = cons_metric.gap_variance()
+
+        # Timeline Metrics
+        time_metric = TimelineMetric(client, repositories=repos, dataset=dataset)
+        timeline_data = time_metric.yearly_average_gap()
 
     metrics = {
         "mean_gap_days": mean_gap,
@@ -32,25 +85,37 @@ def analyze_repositories(
     }
 
     if fmt == "json":
-        result = json.dumps(metrics, indent=2)
-        if output_path:
-            with open(output_path, "w") as f:
-                f.write(result)
+        with stats.phase("report"):
+            result = json.dumps(metrics, indent=2)
+            if output_path:
+                with open(output_path, "w") as f:
+                    f.write(result)
         return result
 
     # Generate Plots
-    reports_dir = os.path.dirname(output_path) if output_path else "reports"
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    # Plot Consistency
-    if gaps:
-        plot_cons = ConsistencyPlot(gaps)
-        plot_cons.plot(os.path.join(reports_dir, "consistency.png"))
-    
-    # Plot Timeline
-    if timeline_data:
-        plot_time = TimelinePlot(timeline_data)
-        plot_time.plot(os.path.join(reports_dir, "timeline.png"))
+    with stats.phase("plot"):
+        from visualization.consistency_plot import ConsistencyPlot
+        from visualization.render import render_charts
+        from visualization.timeline_plot import TimelinePlot
+
+        reports_dir = os.path.dirname(output_path) if output_path else "reports"
+        os.makedirs(reports_dir, exist_ok=True)
+
+        jobs: list[ChartJob] = []
+        # Plot Consistency
+        if gap_histogram:
+            plot_cons = ConsistencyPlot.from_histogram(gap_histogram)
+            jobs.append((plot_cons, os.path.join(reports_dir, "consistency.png")))
+
+        # Plot Timeline
+        if timeline_data:
+            plot_time = TimelinePlot(timeline_data)
+            jobs.append((plot_time, os.path.join(reports_dir, "timeline.png")))
+
+        if charts is not None:
+            charts.extend(jobs)
+        else:
+            render_charts(jobs)
 
     # Generate Text Report
     if fmt == "html":
@@ -79,7 +144,317 @@ def analyze_repositories(
         """
 
     if output_path:
-        with open(output_path, "w", encoding="utf-8") as f:
+        with stats.phase("report"), open(output_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    return content
+
+
+def analyze_contributors(
+    client: GitHubClient,
+    repos: list[Repository],
+    output_path: str | None = None,
+    fmt: Literal["md", "html", "json"] = "md",
+    since: str | None = None,
+    charts: list[ChartJob] | None = None,
+) -> str:
+    """
+    Per-contributor report for ``repos``: every author's consistency and
+    yearly timeline, from a single pass over the repositories' commits.
+    Charts go to ``<reports dir>/contributors/<login>.png``.
+    """
+    from core.metrics.contributors import ContributorMetric
+
+    stats = client.stats
+    metric = ContributorMetric(client, repos, since=since)
+    # The single pass fetches, parses and aggregates together
+    with stats.phase("fetch"):
+        commits = metric.commit_counts()
+    with stats.phase("metrics"):
+        means = metric.average_gap_days()
+        variances = metric.gap_variance()
+        timelines = metric.yearly_average_gap()
+
+    contributors = {
+        login: {
+            "commits": commits[login],
+            "mean_gap_days": means[login],
+            "variance_gap_days": variances[login],
+            "yearly_average_gap": timelines[login],
+        }
+        for login in commits
+    }
+
+    if fmt == "json":
+        with stats.phase("report"):
+            result = json.dumps(
+                {"total_repos": len(repos), "contributors": contributors}, indent=2
+            )
+            if output_path:
+                with open(output_path, "w") as f:
+                    f.write(result)
+        return result
+
+    # Generate Plots
+    with stats.phase("plot"):
+        from visualization.render import render_charts
+        from visualization.timeline_plot import TimelinePlot
+
+        reports_dir = os.path.dirname(output_path) if output_path else "reports"
+        charts_dir = os.path.join(reports_dir, "contributors")
+        os.makedirs(charts_dir, exist_ok=True)
+
+        jobs: list[ChartJob] = []
+        images = {}
+        for login, data in contributors.items():
+            if data["yearly_average_gap"]:
+                # Bot logins carry brackets, e.g. dependabot[bot]
+                filename = re.sub(r"[^A-Za-z0-9._-]", "_", login) + ".png"
+                images[login] = f"contributors/{filename}"
+                plot = TimelinePlot(data["yearly_average_gap"])
+                jobs.append((plot, os.path.join(charts_dir, filename)))
+
+        if charts is not None:
+            charts.extend(jobs)
+        else:
+            render_charts(jobs)
+
+    # Generate Text Report
+    header = ["Contributor", "Commits", "Mean Gap (days)", "Variance", "Timeline"]
+    table = [
+        [
+            login,
+            str(data["commits"]),
+            f"{data['mean_gap_days']:.2f}",
+            f"{data['variance_gap_days']:.2f}",
+            images.get(login),
+        ]
+        for login, data in contributors.items()
+    ]
+
+    if fmt == "html":
+        rows = "".join(
+            "<tr>"
+            + "".join(f"<td>{cell}</td>" for cell in cells[:-1])
+            + (f'<td><img src="{cells[-1]}" /></td>' if cells[-1] else "<td></td>")
+            + "</tr>"
+            for cells in table
+        )
+        head = "".join(f"<th>{cell}</th>" for cell in header)
+        content = f"""
+        <html>
+        <body>
+            <h1>Career Telemetry: Contributors</h1>
+            <p>Repos: {len(repos)}</p>
+            <p>Contributors: {len(contributors)}</p>
+            <table><tr>{head}</tr>{rows}</table>
+        </body>
+        </html>
+        """
+    else:
+        rows = "\n".join(
+            "| "
+            + " | ".join(cells[:-1])
+            + (f" | ![{cells[0]}]({cells[-1]}) |" if cells[-1] else " |  |")
+            for cells in table
+        )
+        content = f"""
+# Career Telemetry Report: Contributors
+
+- Repositories Analyzed: {len(repos)}
+- Contributors: {len(contributors)}
+
+| {" | ".join(header)} |
+| --- | --- | --- | --- | --- |
+{rows}
+        """
+
+    if output_path:
+        with stats.phase("report"), open(output_path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    return content
+
+
+Target = tuple[Literal["user", "org"], str]
+
+
+def _list_repositories(
+    client: GitHubClient,
+    target: Target,
+    top: int | None,
+    repo_filter: RepositoryFilter | None = None,
+) -> list[Repository]:
+    kind, name = target
+    if kind == "org":
+        repos = list(client.iter_org_repositories(name))
+    else:
+        repos = list(client.iter_user_repositories(name))
+    if repo_filter is not None:
+        repos = repo_filter.apply(repos)
+    if kind == "org" and top:
+        repos = repos[:top]
+    return repos
+
+
+def _summary_content(summary: dict, fmt: str) -> str:
+    if fmt == "json":
+        return json.dumps(summary, indent=2)
+
+    rows = []
+    for row in summary["targets"]:
+        if "error" in row:
+            cells = [row["target"], "-", "-", "-", row["error"]]
+        else:
+            cells = [
+                row["target"],
+                str(row["total_repos"]),
+                f"{row['mean_gap_days']:.2f}",
+                f"{row['variance_gap_days']:.2f}",
+                row["report"] or "",
+            ]
+        rows.append(cells)
+
+    header = ["Target", "Repos", "Mean Gap (days)", "Variance", "Report"]
+    if fmt == "html":
+        table = "".join(
+            "<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
+            for cells in [header, *rows]
+        )
+        return f"""
+        <html>
+        <body>
+            <h1>Career Telemetry Summary</h1>
+            <p>Unique Repos: {summary['unique_repos']}</p>
+            <p>Mean Gap: {summary['mean_gap_days']:.2f} days</p>
+            <p>Variance: {summary['variance_gap_days']:.2f}</p>
+            <table>{table}</table>
+        </body>
+        </html>
+        """
+
+    lines = [
+        "| " + " | ".join(cells) + " |"
+        for cells in [header, ["---"] * len(header), *rows]
+    ]
+    return f"""
+# Career Telemetry Summary
+
+- Unique Repositories Analyzed: {summary['unique_repos']}
+- Mean Gap: {summary['mean_gap_days']:.2f} days
+- Variance: {summary['variance_gap_days']:.2f}
+
+""" + "\n".join(lines) + "\n"
+
+
+def analyze_batch(
+    client: GitHubClient,
+    targets: list[Target],
+    output_dir: str = "reports/batch",
+    fmt: Literal["md", "html", "json"] = "md",
+    since: str | None = None,
+    backend: Literal["rest", "graphql"] = "rest",
+    state: AnalysisState | None = None,
+    top: int | None = None,
+    repo_filter: RepositoryFilter | None = None,
+) -> str:
+    """
+    Analyze several users and organizations with one client, writing a
+    report per target under ``output_dir/<kind>-<name>/`` and a combined
+    summary next to them. Returns the summary.
+
+    Repositories listed by several targets are fetched once, and every
+    target's charts are rendered together at the end. A target that
+    can't be listed is reported in the summary instead of failing the run.
+    ``repo_filter`` drops repositories from each listing before ``top``
+    and before any commits are fetched.
+    """
+    from core.commit_dataset import CommitDataset
+    from core.metrics.consistency import ConsistencyMetric
+
+    targets = list(dict.fromkeys(targets))
+    target_repos: dict[Target, list[Repository]] = {}
+    errors: dict[Target, str] = {}
+    for target in targets:
+        try:
+            target_repos[target] = _list_repositories(
+                client, target, top, repo_filter
+            )
+        except GitHubAPIError as e:
+            errors[target] = str(e)
+
+    unique = list(
+        {
+            repo.full_name: repo
+            for repos in target_repos.values()
+            for repo in repos
+        }.values()
+    )
+    dataset = CommitDataset(
+        client, repositories=unique, since=since, backend=backend, state=state
+    )
+    with client.stats.phase("fetch"):
+        dataset.prefetch()
+        if state is not None:
+            state.save()
+
+    charts: list[ChartJob] = []
+    rows = []
+    for target in targets:
+        kind, name = target
+        label = f"{kind}:{name}"
+        if target in errors:
+            rows.append({"target": label, "error": errors[target]})
+            continue
+
+        repos = target_repos[target]
+        view = dataset.subset(repos)
+        report = None
+        if repos:
+            target_dir = os.path.join(output_dir, f"{kind}-{name}")
+            os.makedirs(target_dir, exist_ok=True)
+            report = os.path.join(target_dir, f"report.{fmt}")
+            analyze_repositories(
+                client,
+                repos,
+                output_path=report,
+                fmt=fmt,
+                charts=charts,
+                dataset=view,
+            )
+
+        with client.stats.phase("metrics"):
+            metric = ConsistencyMetric(client, repositories=repos, dataset=view)
+            rows.append(
+                {
+                    "target": label,
+                    "total_repos": len(repos),
+                    "mean_gap_days": metric.average_gap_days(),
+                    "variance_gap_days": metric.gap_variance(),
+                    "report": report,
+                }
+            )
+
+    if charts:
+        from visualization.render import render_charts
+
+        with client.stats.phase("plot"):
+            render_charts(charts)
+
+    with client.stats.phase("metrics"):
+        overall = ConsistencyMetric(client, repositories=unique, dataset=dataset)
+        summary = {
+            "targets": rows,
+            "unique_repos": len(unique),
+            "mean_gap_days": overall.average_gap_days(),
+            "variance_gap_days": overall.gap_variance(),
+        }
+
+    with client.stats.phase("report"):
+        content = _summary_content(summary, fmt)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(
+            os.path.join(output_dir, f"summary.{fmt}"), "w", encoding="utf-8"
+        ) as f:
             f.write(content)
-            
     return content
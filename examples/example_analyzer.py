@@ -1,10 +1,11 @@
 from core.github_client import GitHubClient
 from core.repository_analyzer import RepositoryAnalyzer
+from core.repository_table import RepositoryTable
 
 client = GitHubClient()
-repos = list(client.iter_user_repositories("octocat"))
+table = RepositoryTable.from_listing(client.iter_user_repository_pages("octocat"))
 
-analyzer = RepositoryAnalyzer(repos)
+analyzer = RepositoryAnalyzer(table)
 snapshots = analyzer.yearly_snapshots()
 
 for snap in snapshots:
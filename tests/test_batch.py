@@ -0,0 +1,101 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from cli import app
+from core.github_client import GitHubAPIError, GitHubClient, Repository
+from core.use_cases import analyze_batch
+
+runner = CliRunner()
+
+
+def _repo(full_name):
+    return Repository(full_name.split("/")[1], full_name, False, 10, None, "", "")
+
+
+def _commits(*dates):
+    return [
+        {"sha": f"s{i}", "commit": {"author": {"date": date}}}
+        for i, date in enumerate(dates)
+    ]
+
+
+def _client():
+    client = GitHubClient(token="abc", cache_dir="")
+    shared = _repo("acme/shared")
+
+    def user_repos(name):
+        if name == "ghost":
+            raise GitHubAPIError("GitHub API error 404: Not Found")
+        return iter([_repo("alice/tool"), shared])
+
+    client.iter_user_repositories = MagicMock(side_effect=user_repos)
+    client.iter_org_repositories = MagicMock(
+        return_value=iter([shared, _repo("acme/app")])
+    )
+    client.iter_commits = MagicMock(
+        side_effect=lambda *args, **kwargs: iter(
+            _commits("2024-01-11T00:00:00Z", "2024-01-01T00:00:00Z")
+        )
+    )
+    return client
+
+
+def test_batch_fetches_shared_repositories_once(tmp_path):
+    client = _client()
+    targets = [("user", "alice"), ("org", "acme"), ("user", "ghost")]
+
+    summary = json.loads(
+        analyze_batch(client, targets, output_dir=str(tmp_path), fmt="json")
+    )
+
+    fetched = [call.args[0] for call in client.iter_commits.call_args_list]
+    assert sorted(fetched) == ["acme/app", "acme/shared", "alice/tool"]
+
+    assert summary["unique_repos"] == 3
+    assert summary["mean_gap_days"] == 10.0
+    alice, acme, ghost = summary["targets"]
+    assert alice["target"] == "user:alice" and alice["total_repos"] == 2
+    assert acme["target"] == "org:acme" and acme["total_repos"] == 2
+    assert "404" in ghost["error"]
+
+    report = json.loads((tmp_path / "user-alice" / "report.json").read_text())
+    assert report["total_repos"] == 2
+    assert (tmp_path / "org-acme" / "report.json").exists()
+    assert (tmp_path / "summary.json").exists()
+
+
+def test_batch_renders_charts_per_target(tmp_path):
+    client = _client()
+    summary = analyze_batch(
+        client, [("user", "alice"), ("org", "acme")], output_dir=str(tmp_path)
+    )
+
+    assert "| user:alice | 2 | 10.00 |" in summary
+    for target in ("user-alice", "org-acme"):
+        assert (tmp_path / target / "report.md").exists()
+        assert (tmp_path / target / "consistency.png").exists()
+    phases = client.stats.to_dict()["phases_seconds"]
+    assert {"fetch", "metrics", "plot", "report"} <= set(phases)
+
+
+def test_cli_batch_reads_targets_from_stdin():
+    with patch("cli.analyze_batch") as mock_batch:
+        mock_batch.return_value = "Summary"
+        result = runner.invoke(
+            app, ["batch"], input="# team\nalice\norg:acme\n\nuser:bob  # lead\n"
+        )
+
+    assert result.exit_code == 0
+    assert "Summary" in result.stdout
+    targets = mock_batch.call_args.args[1]
+    assert targets == [("user", "alice"), ("org", "acme"), ("user", "bob")]
+
+
+def test_cli_batch_rejects_invalid_targets():
+    result = runner.invoke(app, ["batch"], input="team:alice\n")
+    assert result.exit_code != 0
+
+    result = runner.invoke(app, ["batch"], input="../etc\n")
+    assert result.exit_code != 0
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.corpus import SyntheticCorpus
+from benchmarks.mock_github import MockGitHubServer
+from core.github_client import GitHubClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def corpus():
+    return SyntheticCorpus(["bench"], repos=5, commits=450, seed=1)
+
+
+@pytest.fixture
+def server(corpus):
+    server = MockGitHubServer(corpus).start()
+    yield server
+    server.stop()
+
+
+def test_corpus_is_deterministic_and_long_tailed(corpus):
+    again = SyntheticCorpus(["bench"], repos=5, commits=450, seed=1)
+    counts = [repo.commits for repo in corpus.repos["bench"]]
+
+    assert sum(counts) == corpus.total_commits == 450
+    assert counts == sorted(counts, reverse=True)
+    repo = corpus.repos["bench"][0]
+    assert repo.commit(7) == again.repos["bench"][0].commit(7)
+    timestamps = [repo.timestamp(i) for i in range(repo.commits)]
+    assert timestamps == sorted(timestamps)
+
+
+def test_mock_serves_paginated_history(corpus, server):
+    client = GitHubClient(token="bench", cache_dir="", api_url=server.url)
+    repos = list(client.iter_user_repositories("bench"))
+    assert [r.full_name for r in repos] == [
+        r.full_name for r in corpus.repos["bench"]
+    ]
+
+    busiest = corpus.repos["bench"][0]
+    commits = list(client.iter_commits(busiest.full_name))
+    assert len(commits) == busiest.commits > 100
+    # Newest first
+    dates = [c["commit"]["author"]["date"] for c in commits]
+    assert dates == sorted(dates, reverse=True)
+
+    since = dates[len(dates) // 2]
+    recent = list(client.iter_commits(busiest.full_name, since=since))
+    assert [c["commit"]["author"]["date"] for c in recent] == [
+        d for d in dates if d >= since
+    ]
+
+
+def test_mock_revalidates_with_304(corpus, server):
+    client = GitHubClient(
+        token="bench", cache_dir="", ttl_seconds=0, api_url=server.url
+    )
+    list(client.iter_user_repositories("bench"))
+    list(client.iter_user_repositories("bench"))
+
+    assert server.not_modified == 2  # the listing page and the empty page
+    assert client.stats.to_dict()["counters"]["revalidations"] == 2
+
+
+def test_benchmark_harness(tmp_path):
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.run", "run",
+            "--preset", "tiny", "--output", str(output),
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    )
+
+    phases = json.loads(output.read_text())["phases"]
+    assert phases["cold"]["counters"]["requests"] > 0
+    assert phases["warm"]["counters"]["requests"] == 0
+    revalidate = phases["revalidate"]["counters"]
+    assert revalidate["revalidations"] == revalidate["requests"] > 0
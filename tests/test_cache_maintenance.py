@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+from core.cache import FileCache, SQLiteCache
+
+
+def entry(data):
+    return {"timestamp": time.time(), "headers": {}, "data": data}
+
+
+@pytest.mark.parametrize("cache_cls", [FileCache, SQLiteCache])
+def test_prune_evicts_least_recently_used(tmp_path, cache_cls):
+    cache = cache_cls(str(tmp_path))
+    for i in range(5):
+        cache.set(f"key{i}", entry(i))
+        time.sleep(0.01)
+
+    # Touch key0 so it becomes the most recently used
+    cache.get("key0")
+
+    assert cache.prune(max_entries=2) == 3
+    assert cache.get("key0") is not None
+    assert cache.get("key4") is not None
+    assert cache.get("key1") is None
+    assert cache.stats().entries == 2
+
+
+@pytest.mark.parametrize("cache_cls", [FileCache, SQLiteCache])
+def test_clear_removes_everything(tmp_path, cache_cls):
+    cache = cache_cls(str(tmp_path))
+    # Random payloads, so compression can't shrink them below the asserts
+    cache.set("a", entry(os.urandom(150).hex()))
+    cache.set("b", entry(os.urandom(150).hex()))
+
+    assert cache.stats().size_bytes > 200
+    assert cache.clear() == 2
+    assert cache.stats().entries == 0
+
+
+def test_sqlite_byte_cap_enforced_on_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path), max_bytes=1000)
+    cache.set("big", entry(os.urandom(1000).hex()))
+
+    assert cache.stats().entries == 0
+
+
+def test_sqlite_stats_persist_hits_and_misses(tmp_path):
+    cache = SQLiteCache(str(tmp_path))
+    cache.set("a", entry(1))
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    # Counts are written in batches; flush() runs at exit in a real run
+    cache.flush()
+
+    stats = SQLiteCache(str(tmp_path)).stats()
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_sqlite_lookups_do_not_write(tmp_path):
+    cache = SQLiteCache(str(tmp_path))
+    cache.set("a", entry(1))
+    conn = cache._connect()
+    changes = conn.total_changes
+
+    for _ in range(10):
+        cache.get("a")
+        cache.get("missing")
+
+    assert conn.total_changes == changes
+    assert (cache.stats().hits, cache.stats().misses) == (10, 10)
+
+
+def test_sqlite_drops_a_cache_with_another_schema_version(tmp_path):
+    import sqlite3
+
+    conn = sqlite3.connect(str(tmp_path / SQLiteCache.FILENAME))
+    conn.execute("CREATE TABLE responses (key TEXT PRIMARY KEY, data TEXT)")
+    conn.execute("INSERT INTO responses VALUES ('a', '1')")
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteCache(str(tmp_path))
+    assert cache.get("a") is None
+    cache.set("a", entry(1))
+    assert SQLiteCache(str(tmp_path)).get("a")["data"] == 1
+
+
+@pytest.mark.parametrize("cache_cls", [FileCache, SQLiteCache])
+def test_lock_files_stay_bounded(tmp_path, cache_cls):
+    from core.cache import LOCK_DIR, LOCK_SLOTS
+
+    cache = cache_cls(str(tmp_path))
+    for i in range(LOCK_SLOTS * 2):
+        with cache.lock(f"https://api.github.com/page{i}"):
+            pass
+    lock_dir = tmp_path / LOCK_DIR
+    assert len(os.listdir(lock_dir)) <= LOCK_SLOTS
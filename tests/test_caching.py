@@ -4,6 +4,8 @@ import os
 import tempfile
 import pytest
 from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from core.cache import FileCache, SQLiteCache
 from core.github_client import GitHubClient
 
 @pytest.fixture
@@ -11,12 +13,20 @@ def temp_cache_dir():
     with tempfile.TemporaryDirectory() as tmpdirname:
         yield tmpdirname
 
+def cache_files(cache_dir):
+    # Entries only, not the locks/ directory
+    return [
+        name for name in os.listdir(cache_dir)
+        if os.path.isfile(os.path.join(cache_dir, name))
+    ]
+
 def test_cache_miss_writes_to_disk(temp_cache_dir):
     with patch("requests.Session.get") as mock_get:
         # Setup Mock
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"data": "fresh"}
+        mock_response.content = b'{"data": "fresh"}'
         mock_response.headers = {"ETag": "123", "X-RateLimit-Remaining": "10"}
         mock_get.return_value = mock_response
 
@@ -28,31 +38,27 @@ def test_cache_miss_writes_to_disk(temp_cache_dir):
         
         # Verify cache file created
         # We don't know the hash exactly without re-hashing, so check directory list
-        files = os.listdir(temp_cache_dir)
+        files = cache_files(temp_cache_dir)
         assert len(files) == 1
         
-        # Verify content
-        with open(os.path.join(temp_cache_dir, files[0]), "r") as f:
-            cached = json.load(f)
-            assert cached["data"] == {"data": "fresh"}
-            assert cached["headers"]["ETag"] == "123"
+        # Verify content: compressed body, only the headers worth keeping
+        with open(os.path.join(temp_cache_dir, files[0]), "rb") as f:
+            assert b"fresh" not in f.read()
+        cached = client.cache.get("https://api.github.com/test")
+        assert cached["data"] == {"data": "fresh"}
+        assert cached["headers"] == {"ETag": "123"}
 
 def test_cache_hit_fresh_no_request(temp_cache_dir):
     with patch("requests.Session.get") as mock_get:
         client = GitHubClient(token="abc", cache_dir=temp_cache_dir, ttl_seconds=3600)
         
         # Seed Cache
-        import hashlib
         url = "https://api.github.com/test"
-        hashed = hashlib.md5(url.encode("utf-8")).hexdigest()
-        cache_path = os.path.join(temp_cache_dir, f"{hashed}.json")
-        
-        with open(cache_path, "w") as f:
-            json.dump({
-                "timestamp": time.time(), # Now
-                "headers": {"ETag": "123"},
-                "data": {"data": "cached"}
-            }, f)
+        client.cache.set(url, {
+            "timestamp": time.time(), # Now
+            "headers": {"ETag": "123"},
+            "data": {"data": "cached"}
+        })
 
         # Call
         data = client._request(url)
@@ -68,18 +74,13 @@ def test_cache_hit_stale_returns_304(temp_cache_dir):
         )  # Short TTL
         
         # Seed Stale Cache
-        import hashlib
         url = "https://api.github.com/test"
-        hashed = hashlib.md5(url.encode("utf-8")).hexdigest()
-        cache_path = os.path.join(temp_cache_dir, f"{hashed}.json")
-        
         start_time = time.time() - 100
-        with open(cache_path, "w") as f:
-            json.dump({
-                "timestamp": start_time,
-                "headers": {"ETag": "123"},
-                "data": {"data": "old"}
-            }, f)
+        client.cache.set(url, {
+            "timestamp": start_time,
+            "headers": {"ETag": "123"},
+            "data": {"data": "old"}
+        })
 
         # Setup Mock 304
         mock_response = MagicMock()
@@ -97,9 +98,7 @@ def test_cache_hit_stale_returns_304(temp_cache_dir):
         assert kwargs["headers"]["If-None-Match"] == "123"
         
         # Verify timestamp updated
-        with open(cache_path, "r") as f:
-            cached = json.load(f)
-            assert cached["timestamp"] > start_time
+        assert client.cache.get(url)["timestamp"] > start_time
 
 def test_cache_does_not_save_errors(temp_cache_dir):
     with patch("requests.Session.get") as mock_get:
@@ -116,4 +115,156 @@ def test_cache_does_not_save_errors(temp_cache_dir):
             client._request("https://api.github.com/bad")
             
         # Verify no cache
-        assert len(os.listdir(temp_cache_dir)) == 0
+        assert len(cache_files(temp_cache_dir)) == 0
+
+def test_sqlite_cache_roundtrip_and_revalidation(temp_cache_dir):
+    with patch("requests.Session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"id": 1}]
+        mock_response.content = b'[{"id": 1}]'
+        mock_response.headers = {
+            "ETag": "abc",
+            "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "X-RateLimit-Remaining": "10",
+        }
+        mock_get.return_value = mock_response
+
+        client = GitHubClient(
+            token="abc", cache_dir=temp_cache_dir, ttl_seconds=3600,
+            cache_backend="sqlite",
+        )
+        url = "https://api.github.com/test"
+        assert client._request(url, params={"page": 1}) == [{"id": 1}]
+        assert client._request(url, params={"page": 1}) == [{"id": 1}]
+        mock_get.assert_called_once()
+        assert cache_files(temp_cache_dir)[0].startswith("cache.sqlite3")
+
+        # Expire the entry; the next call revalidates with the stored ETag
+        client.ttl_seconds = 0
+        mock_response.status_code = 304
+        assert client._request(url, params={"page": 1}) == [{"id": 1}]
+        kwargs = mock_get.call_args.kwargs
+        assert kwargs["headers"]["If-None-Match"] == "abc"
+        assert kwargs["headers"]["If-Modified-Since"].startswith("Mon")
+
+
+def test_sqlite_cache_concurrent_writers(temp_cache_dir):
+    from concurrent.futures import ThreadPoolExecutor
+    from core.cache import SQLiteCache
+
+    cache = SQLiteCache(temp_cache_dir)
+
+    def write(i):
+        cache.set(f"key{i}", {"timestamp": time.time(), "headers": {}, "data": i})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(64)))
+
+    assert [cache.get(f"key{i}")["data"] for i in range(64)] == list(range(64))
+
+def test_memory_tier_serves_repeat_lookups(temp_cache_dir):
+    with patch("requests.Session.get") as mock_get:
+        client = GitHubClient(token="abc", cache_dir=temp_cache_dir, ttl_seconds=3600)
+        url = "https://api.github.com/test"
+        client.cache.set(
+            client._cache_key(url),
+            {"timestamp": time.time(), "headers": {}, "data": {"data": "cached"}},
+        )
+        client.cache.get = MagicMock(wraps=client.cache.get)
+
+        assert client._request(url) == {"data": "cached"}
+        assert client._request(url) == {"data": "cached"}
+
+        client.cache.get.assert_called_once()
+        mock_get.assert_not_called()
+        assert client.memory_cache.hits == 1
+
+
+def test_memory_cache_evicts_least_recently_used():
+    from core.cache import MemoryCache
+
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", {"data": 1})
+    cache.set("b", {"data": 2})
+    cache.get("a")
+    cache.set("c", {"data": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"data": 1}
+    assert cache.stats().entries == 2
+
+
+def test_requested_fields_are_projected_and_cached_separately(temp_cache_dir):
+    page = [
+        {
+            "sha": "a1",
+            "author": None,
+            "commit": {"author": {"date": "2024-01-01T00:00:00Z", "name": "x"}},
+            "files": [{"patch": "..."}],
+        }
+    ]
+    with patch("requests.Session.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps(page).encode()
+        mock_response.headers = {"ETag": "e1", "X-RateLimit-Remaining": "10"}
+        mock_get.return_value = mock_response
+
+        client = GitHubClient(token="abc", cache_dir=temp_cache_dir, ttl_seconds=3600)
+        url = "https://api.github.com/repos/me/a/commits"
+        fields = ("sha", "author.login", "commit.author.date")
+        expected = [
+            {"sha": "a1", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}}
+        ]
+
+        assert client._request(url, fields=fields) == expected
+        # Served from the cache, already projected
+        assert client._request(url, fields=fields) == expected
+        assert mock_get.call_count == 1
+        mock_response.json.assert_not_called()
+
+        # The full document is a different cache entry
+        assert client._request(url) == page
+        assert mock_get.call_count == 2
+
+
+def test_concurrent_clients_fetch_each_url_once(temp_cache_dir):
+    # Separate clients share only the cache directory, like separate
+    # processes would
+    calls = []
+
+    def slow_get(url, **kwargs):
+        calls.append(url)
+        time.sleep(0.2)
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b'{"data": "fresh"}'
+        response.headers = {"ETag": "e1", "X-RateLimit-Remaining": "10"}
+        return response
+
+    clients = [
+        GitHubClient(
+            token="abc", cache_dir=temp_cache_dir, memory_cache_entries=0
+        )
+        for _ in range(4)
+    ]
+    url = "https://api.github.com/test"
+    with patch("requests.Session.get", side_effect=slow_get):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda c: c._request(url), clients))
+
+    assert results == [{"data": "fresh"}] * 4
+    assert calls == [url]
+    assert sum(c.stats.to_dict()["counters"]["cache_hits"] for c in clients) == 3
+
+
+@pytest.mark.parametrize("cache_cls", [FileCache, SQLiteCache])
+def test_refresh_updates_metadata_only(temp_cache_dir, cache_cls):
+    cache = cache_cls(temp_cache_dir)
+    cache.set("k", {"timestamp": 1.0, "headers": {"ETag": "a"}, "data": [1, 2]})
+    cache.refresh("k", {"timestamp": 2.0, "headers": {"ETag": "b"}, "data": None})
+
+    assert cache.get("k") == {
+        "timestamp": 2.0, "headers": {"ETag": "b"}, "data": [1, 2]
+    }
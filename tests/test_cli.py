@@ -42,3 +42,40 @@ def test_cli_org_execution_mocked():
         # Expect exit code 1 because no repos found
         assert result.exit_code == 1
         assert "No repositories found" in result.stdout
+
+def test_cli_org_passes_workers_to_client():
+    with patch("cli.GitHubClient") as mock_client_cls, \
+         patch("cli.analyze_repositories") as mock_analyze:
+        mock_client = mock_client_cls.return_value
+        mock_client.iter_org_repositories.return_value = [MagicMock()]
+        mock_analyze.return_value = "Report Content"
+
+        result = runner.invoke(app, ["org", "testorg", "--workers", "8"])
+
+        assert result.exit_code == 0
+        assert mock_client_cls.call_args.kwargs["workers"] == 8
+        assert mock_analyze.call_args.args[0] is mock_client
+
+def test_cli_cache_stats_and_clear(tmp_path):
+    from core.cache import SQLiteCache
+
+    SQLiteCache(str(tmp_path)).set(
+        "key", {"timestamp": 0, "headers": {}, "data": [1, 2, 3]}
+    )
+
+    result = runner.invoke(app, ["cache", "stats", "--cache-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Entries: 1" in result.stdout
+    assert "Commit timelines: 0" in result.stdout
+
+    result = runner.invoke(app, ["cache", "clear", "--cache-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Removed 1 entries" in result.stdout
+
+def test_cli_validates_cache_backend():
+    with patch("cli.GitHubClient") as mock_client_cls:
+        for args in (["user", "alice"], ["serve"], ["cache", "stats"]):
+            result = runner.invoke(app, [*args, "--cache-backend", "redis"])
+            assert result.exit_code == 2
+            assert "'redis'" in result.output
+    mock_client_cls.assert_not_called()
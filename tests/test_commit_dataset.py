@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock
+
+from core.commit_dataset import CommitDataset
+from core.github_client import GitHubClient, Repository
+from core.metrics.consistency import ConsistencyMetric
+from core.metrics.timeline import TimelineMetric
+
+
+def make_repo(full_name):
+    return Repository(
+        name=full_name.split("/")[1],
+        full_name=full_name,
+        is_fork=False,
+        size_kb=10,
+        language="Python",
+        created_at="2020-01-01T00:00:00Z",
+        updated_at="2021-01-01T00:00:00Z",
+    )
+
+
+def make_commits(*dates):
+    return [{"commit": {"author": {"date": d}}} for d in dates]
+
+
+def make_client(**kwargs):
+    client = GitHubClient(token="abc", cache_dir="", **kwargs)
+    client._request = MagicMock()
+    return client
+
+
+def test_commits_fetched_once_per_repository():
+    client = make_client()
+    client._request.return_value = make_commits(
+        "2021-01-11T00:00:00Z",
+        "2021-01-01T00:00:00Z",
+        "2020-12-30T00:00:00Z",
+    )
+    repos = [make_repo("me/a"), make_repo("me/b")]
+    dataset = CommitDataset(client, repositories=repos)
+
+    cons = ConsistencyMetric(client, repositories=repos, dataset=dataset)
+    timeline = TimelineMetric(client, repositories=repos, dataset=dataset)
+
+    assert cons._commit_gaps() == [2, 10, 2, 10]
+    assert cons.average_gap_days() == 6.0
+    assert cons.gap_variance() == 4.62
+    assert timeline.yearly_average_gap() == {2021: 6.0}
+    assert client._request.call_count == 2
+
+
+def test_failed_fetch_yields_no_dates():
+    client = make_client()
+    client._request.side_effect = Exception("boom")
+    dataset = CommitDataset(client, repositories=[make_repo("me/a")])
+
+    assert list(dataset.commit_timestamps("me/a")) == []
+    assert ConsistencyMetric(client, dataset=dataset).average_gap_days() == 0.0
+
+
+def test_prefetch_with_workers_keeps_repository_order():
+    client = GitHubClient(token="abc", cache_dir="", workers=4)
+    names = [f"me/repo{i}" for i in range(8)]
+
+    def fake_request(url, params=None, fields=None):
+        day = int(url.rsplit("/repo", 1)[1].split("/")[0]) + 1
+        return make_commits(f"2021-01-{day:02d}T00:00:00Z", "2021-01-01T00:00:00Z")
+
+    client._request = fake_request
+    dataset = CommitDataset(client, repositories=[make_repo(n) for n in names])
+    dataset.prefetch()
+
+    gaps = ConsistencyMetric(client, dataset=dataset)._commit_gaps()
+    assert gaps == list(range(8))
+
+
+def test_commit_history_is_paginated_with_since():
+    client = make_client()
+    newest_first = [f"2021-03-{day:02d}T00:00:00Z" for day in range(28, 0, -1)]
+    pages = {
+        1: make_commits(*newest_first[:10]),
+        2: make_commits(*newest_first[10:20]),
+        3: make_commits(*newest_first[20:]),
+    }
+    client._request.side_effect = lambda url, params=None, fields=None: pages[
+        params["page"]
+    ]
+
+    commits = list(
+        client.iter_commits("me/a", since="2021-01-01T00:00:00Z", per_page=10)
+    )
+
+    assert len(commits) == 28
+    assert client._request.call_count == 3
+    params = client._request.call_args.kwargs["params"]
+    assert params["since"] == "2021-01-01T00:00:00Z"
+
+    dataset = CommitDataset(client, repositories=[make_repo("me/a")])
+    dataset.client.iter_commits = lambda name, since, until, fields=None: iter(commits)
+    stats = dataset.gap_stats("me/a")
+    assert (stats.count, stats.total) == (27, 27)
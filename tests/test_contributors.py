@@ -0,0 +1,118 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from cli import app
+from core.github_client import GitHubClient, Repository
+from core.metrics.contributors import ContributorMetric
+from core.use_cases import analyze_contributors
+
+runner = CliRunner()
+
+HISTORY = {
+    # Newest first, as the API lists them
+    "acme/app": [
+        ("alice", "2024-01-21T00:00:00Z"),
+        ("bob", "2024-01-15T00:00:00Z"),
+        ("alice", "2024-01-11T00:00:00Z"),
+        (None, "2024-01-05T00:00:00Z"),
+        ("alice", "2024-01-01T00:00:00Z"),
+        ("bob", "2023-12-31T00:00:00Z"),
+    ],
+    "acme/lib": [
+        ("bob", "2024-02-10T00:00:00Z"),
+        ("alice", "2024-02-02T00:00:00Z"),
+        ("bob", "2024-02-01T00:00:00Z"),
+    ],
+}
+
+
+def _repo(full_name):
+    return Repository(full_name.split("/")[1], full_name, False, 10, None, "", "")
+
+
+def _client():
+    client = GitHubClient(token="abc", cache_dir="")
+
+    def iter_commits(full_name, since=None, until=None, fields=None):
+        for i, (login, date) in enumerate(HISTORY[full_name]):
+            yield {
+                "sha": f"{full_name}-{i}",
+                "author": {"login": login} if login else None,
+                "commit": {"author": {"date": date}},
+            }
+
+    client.iter_commits = MagicMock(side_effect=iter_commits)
+    return client
+
+
+def test_contributor_stats_in_one_pass():
+    client = _client()
+    metric = ContributorMetric(client, [_repo("acme/app"), _repo("acme/lib")])
+
+    assert metric.commit_counts() == {"alice": 4, "bob": 4}
+    # alice: 10, 10 in app (lib has one commit); bob: 15 in app, 9 in lib
+    assert metric.average_gap_days() == {"alice": 10.0, "bob": 12.0}
+    assert metric.yearly_average_gap() == {
+        "alice": {2024: 10.0},
+        "bob": {2024: 12.0},
+    }
+    assert metric.gap_variance()["alice"] == 0.0
+
+    # Each repository's history is walked once for every contributor
+    assert client.iter_commits.call_count == 2
+
+
+def test_analyze_contributors_json(tmp_path):
+    output = tmp_path / "team.json"
+    result = json.loads(
+        analyze_contributors(
+            _client(), [_repo("acme/app")], output_path=str(output), fmt="json"
+        )
+    )
+
+    assert result["total_repos"] == 1
+    assert set(result["contributors"]) == {"alice", "bob"}
+    assert result["contributors"]["bob"]["commits"] == 2
+    assert json.loads(output.read_text()) == result
+
+
+def test_analyze_contributors_renders_a_chart_per_contributor(tmp_path):
+    client = _client()
+    content = analyze_contributors(
+        client,
+        [_repo("acme/app"), _repo("acme/lib")],
+        output_path=str(tmp_path / "team.md"),
+    )
+
+    assert "| alice | 4 | 10.00 | 0.00 |" in content
+    assert (tmp_path / "contributors" / "alice.png").exists()
+    assert (tmp_path / "contributors" / "bob.png").exists()
+    phases = client.stats.to_dict()["phases_seconds"]
+    assert {"fetch", "metrics", "plot", "report"} <= set(phases)
+
+
+def test_cli_org_by_contributor():
+    with patch("cli.GitHubClient") as mock_client_cls, \
+         patch("cli.analyze_contributors") as mock_analyze:
+        mock_client_cls.return_value.iter_org_repositories.return_value = [
+            _repo("acme/app")
+        ]
+        mock_analyze.return_value = "Contributors Report"
+
+        result = runner.invoke(app, ["org", "acme", "--by-contributor"])
+
+    assert result.exit_code == 0
+    assert "Contributors Report" in result.stdout
+    mock_analyze.assert_called_once()
+
+
+def test_cli_by_contributor_rejects_unsupported_options():
+    with patch("cli.analyze_contributors") as mock_analyze:
+        for option in (["--backend", "graphql"], ["--incremental"]):
+            result = runner.invoke(app, ["org", "acme", "--by-contributor", *option])
+            assert result.exit_code == 2
+            assert option[0] in result.output
+
+    mock_analyze.assert_not_called()
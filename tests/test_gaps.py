@@ -0,0 +1,53 @@
+import random
+import time
+from statistics import mean, stdev
+
+import pytest
+
+from core.metrics.gaps import SECONDS_PER_DAY, GapStats
+
+
+def test_gap_stats_match_statistics_module():
+    rng = random.Random(7)
+    timestamps = sorted(rng.randrange(1_500_000_000, 1_700_000_000) for _ in range(500))
+    gaps = [(b - a) // SECONDS_PER_DAY for a, b in zip(timestamps, timestamps[1:])]
+
+    stats = GapStats.from_timestamps(timestamps)
+
+    assert stats.count == len(gaps)
+    assert round(stats.mean(), 2) == round(mean(gaps), 2)
+    assert round(stats.stdev(), 2) == round(stdev(gaps), 2)
+
+
+def test_gap_stats_attribute_gap_to_later_year_and_merge():
+    new_year = 1609459200  # 2021-01-01T00:00:00Z
+    first = GapStats.from_timestamps([new_year - 2 * SECONDS_PER_DAY, new_year])
+    second = GapStats.from_timestamps([new_year, new_year + 4 * SECONDS_PER_DAY])
+
+    combined = GapStats.combine([first, second])
+
+    assert combined.yearly_mean() == {2021: 3.0}
+    assert combined.count == 2
+
+
+def test_vectorized_stats_match_python_reference():
+    import numpy as np
+    from collections import defaultdict
+
+    rng = random.Random(11)
+    timestamps = sorted(rng.randrange(1_400_000_000, 1_700_000_000) for _ in range(800))
+    gaps = [(b - a) // SECONDS_PER_DAY for a, b in zip(timestamps, timestamps[1:])]
+    by_year = defaultdict(list)
+    for ts, gap in zip(timestamps[1:], gaps):
+        by_year[time.gmtime(ts).tm_year].append(gap)
+
+    stats = GapStats.from_timestamps(np.array(timestamps, dtype=np.int64))
+
+    assert stats.yearly_mean() == pytest.approx(
+        {year: mean(values) for year, values in by_year.items()}
+    )
+    assert round(stats.coefficient_of_variation(), 2) == round(
+        stdev(gaps) / mean(gaps), 2
+    )
+    expected = np.percentile(gaps, [10, 50, 95])
+    assert list(stats.percentiles([10, 50, 95]).values()) == pytest.approx(expected)
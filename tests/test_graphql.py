@@ -0,0 +1,178 @@
+import json
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.commit_dataset import CommitDataset
+from core.github_client import GitHubAPIError, GitHubClient, Repository
+
+
+def history(dates, next_cursor=None):
+    return {
+        "defaultBranchRef": {
+            "target": {
+                "history": {
+                    "pageInfo": {
+                        "hasNextPage": next_cursor is not None,
+                        "endCursor": next_cursor,
+                    },
+                    "nodes": [{"authoredDate": d} for d in dates],
+                }
+            }
+        }
+    }
+
+
+def graphql_response(data, errors=None):
+    payload = {"data": data}
+    if errors:
+        payload["errors"] = errors
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"X-RateLimit-Remaining": "4999"}
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+def test_graphql_batches_repositories_and_follows_cursors():
+    responses = [
+        # Round 1: both repositories in one query, r0 has another page
+        graphql_response({
+            "r0": history(["2021-01-03T00:00:00Z"], next_cursor="abc"),
+            "r1": history(["2021-02-01T00:00:00Z"]),
+        }),
+        # Round 2: only r0 remains
+        graphql_response({"r0": history(["2021-01-01T00:00:00Z"])}),
+    ]
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+         patch("requests.Session.post", side_effect=responses) as mock_post:
+        client = GitHubClient(token="abc", cache_dir=cache_dir)
+        dates, failed = client.graphql_commit_dates(["me/a", "me/b"])
+
+        assert dates == {
+            "me/a": ["2021-01-03T00:00:00Z", "2021-01-01T00:00:00Z"],
+            "me/b": ["2021-02-01T00:00:00Z"],
+        }
+        assert failed == {}
+        assert mock_post.call_count == 2
+        second_query = mock_post.call_args.kwargs["json"]["query"]
+        assert 'after: "abc"' in second_query
+        assert "me/b" not in second_query and '"b"' not in second_query
+
+
+def test_graphql_backend_feeds_commit_dataset():
+    repo = Repository(
+        name="a",
+        full_name="me/a",
+        is_fork=False,
+        size_kb=1,
+        language=None,
+        created_at="2020-01-01T00:00:00Z",
+        updated_at="2020-01-01T00:00:00Z",
+    )
+    client = GitHubClient(token="abc", cache_dir="")
+    client.graphql_commit_dates = MagicMock(
+        return_value=(
+            {"me/a": ["2021-01-05T00:00:00Z", "2021-01-01T00:00:00Z"]},
+            {},
+        )
+    )
+
+    dataset = CommitDataset(client, repositories=[repo], backend="graphql")
+    dataset.prefetch()
+
+    assert dataset.gap_stats("me/a").total == 4
+    client.graphql_commit_dates.assert_called_once()
+
+
+def test_graphql_keeps_partial_results_and_reports_failures():
+    not_found = {
+        "type": "NOT_FOUND",
+        "path": ["r1"],
+        "message": "Could not resolve to a Repository with the name 'me/gone'.",
+    }
+    responses = [
+        # First batch: r1 is nulled out by a partial error
+        graphql_response(
+            {"r0": history(["2021-01-01T00:00:00Z"]), "r1": None}, [not_found]
+        ),
+        # Second batch fails outright
+        graphql_response(None, [{"message": "Query timed out"}]),
+    ]
+
+    with patch("requests.Session.post", side_effect=responses):
+        client = GitHubClient(token="abc", cache_dir="")
+        dates, failed = client.graphql_commit_dates(
+            ["me/a", "me/gone", "me/c"], batch_size=2
+        )
+
+    assert dates == {"me/a": ["2021-01-01T00:00:00Z"]}
+    assert failed["me/gone"] == not_found["message"]
+    assert "Query timed out" in failed["me/c"]
+
+
+def test_graphql_dataset_refetches_failed_repositories_over_rest(tmp_path):
+    repos = [Repository(name, f"me/{name}", False, 1, None, "", "") for name in "ab"]
+    client = GitHubClient(token="abc", cache_dir=str(tmp_path))
+    client.graphql_commit_dates = MagicMock(
+        return_value=({"me/a": ["2021-01-01T00:00:00Z"]}, {"me/b": "timeout"})
+    )
+    client.iter_commits = MagicMock(
+        return_value=[
+            {"sha": "c1", "commit": {"author": {"date": "2021-01-03T00:00:00Z"}}},
+            {"sha": "c0", "commit": {"author": {"date": "2021-01-01T00:00:00Z"}}},
+        ]
+    )
+
+    dataset = CommitDataset(client, repositories=repos, backend="graphql")
+    dataset.prefetch()
+
+    client.iter_commits.assert_called_once()
+    assert client.iter_commits.call_args.args[0] == "me/b"
+    assert dataset.gap_stats("me/b").total == 2
+    assert client.stats.counters["graphql_failures"] == 1
+
+
+def test_graphql_requires_token():
+    with patch.dict("os.environ", {}, clear=True):
+        client = GitHubClient(token=None, cache_dir="")
+        with pytest.raises(GitHubAPIError):
+            client.graphql_commit_dates(["me/a"])
+
+
+def test_graphql_dataset_surfaces_missing_or_rejected_token():
+    repo = Repository("a", "me/a", False, 1, None, "", "")
+    with patch.dict("os.environ", {}, clear=True):
+        client = GitHubClient(token=None, cache_dir="")
+    dataset = CommitDataset(client, repositories=[repo], backend="graphql")
+    with pytest.raises(GitHubAPIError, match="requires a token"):
+        dataset.prefetch()
+
+    client = GitHubClient(token="expired", cache_dir="")
+    client.graphql_commit_dates = MagicMock(
+        side_effect=GitHubAPIError("GitHub API error 401: Bad credentials", 401)
+    )
+    dataset = CommitDataset(client, repositories=[repo], backend="graphql")
+    with pytest.raises(GitHubAPIError):
+        dataset.prefetch()
+
+
+def test_cli_validates_backend():
+    from typer.testing import CliRunner
+
+    from cli import app
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["user", "me", "--backend", "grapql"])
+    assert result.exit_code == 2
+    assert "grapql" in result.output
+
+    with patch.dict("os.environ", {}, clear=True), \
+         patch("core.github_client.GitHubClient.iter_user_repositories") as listing:
+        result = runner.invoke(app, ["user", "me", "--backend", "graphql"])
+    assert result.exit_code == 2
+    assert "GITHUB_TOKEN" in result.output
+    listing.assert_not_called()
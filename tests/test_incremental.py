@@ -0,0 +1,119 @@
+from dataclasses import replace
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from core.commit_dataset import CommitDataset
+from core.github_client import GitHubClient, Repository
+from core.metrics.gaps import GapStats
+from cli import app
+from core.state import AnalysisState
+
+REPO = Repository(
+    name="a",
+    full_name="me/a",
+    is_fork=False,
+    size_kb=1,
+    language=None,
+    created_at="2020-01-01T00:00:00Z",
+    updated_at="2021-01-01T00:00:00Z",
+    pushed_at="2021-01-10T00:00:00Z",
+)
+
+
+def commit(sha, date):
+    return {"sha": sha, "commit": {"author": {"date": date}}}
+
+
+def run(client, state, repo):
+    dataset = CommitDataset(client, repositories=[repo], state=state)
+    dataset.prefetch()
+    state.save()
+    return dataset.gap_stats(repo.full_name)
+
+
+def test_incremental_runs_fetch_only_new_commits(tmp_path):
+    history = [
+        commit("c3", "2021-01-10T00:00:00Z"),
+        commit("c2", "2021-01-04T00:00:00Z"),
+        commit("c1", "2021-01-01T00:00:00Z"),
+    ]
+    client = GitHubClient(token="abc", cache_dir="")
+    client._request = MagicMock(return_value=history)
+    path = str(tmp_path / "state.json")
+
+    first = run(client, AnalysisState(path), REPO)
+    assert (first.count, first.total) == (2, 9)
+
+    # Unchanged pushed_at: served from the saved state without a request
+    client._request.reset_mock()
+    second = run(client, AnalysisState(path), REPO)
+    client._request.assert_not_called()
+    assert second == first
+
+    # New push: only commits since the last one are requested and merged
+    client._request.return_value = [
+        commit("c5", "2021-01-20T00:00:00Z"),
+        commit("c4", "2021-01-12T00:00:00Z"),
+        commit("c3", "2021-01-10T00:00:00Z"),
+    ]
+    pushed = replace(REPO, pushed_at="2021-01-20T00:00:00Z")
+    third = run(client, AnalysisState(path), pushed)
+
+    params = client._request.call_args.kwargs["params"]
+    assert params["since"] == "2021-01-10T00:00:00Z"
+    full = GapStats.from_timestamps(
+        [1609459200, 1609718400, 1610236800, 1610409600, 1611100800]
+    )
+    assert third == full
+    assert AnalysisState(path).get("me/a").last_shas == ["c5"]
+
+
+def test_incremental_keeps_commits_from_the_boundary_second(tmp_path):
+    day = 86400
+    c1, c2, c3, c4 = (
+        commit("c1", "2021-01-01T00:00:00Z"),
+        commit("c2", "2021-01-04T00:00:00Z"),
+        commit("c3", "2021-01-04T00:00:00Z"),
+        commit("c4", "2021-01-10T00:00:00Z"),
+    )
+    client = GitHubClient(token="abc", cache_dir="")
+    client._request = MagicMock(return_value=[c2, c1])
+    path = str(tmp_path / "state.json")
+    run(client, AnalysisState(path), REPO)
+
+    # c3 shares c2's second: only c2 itself is already counted
+    client._request.return_value = [c3, c2]
+    pushed = replace(REPO, pushed_at="2021-01-05T00:00:00Z")
+    run(client, AnalysisState(path), pushed)
+    assert AnalysisState(path).get("me/a").last_shas == ["c2", "c3"]
+
+    client._request.return_value = [c4, c3, c2]
+    pushed = replace(REPO, pushed_at="2021-01-11T00:00:00Z")
+    stats = run(client, AnalysisState(path), pushed)
+
+    start = 1609459200
+    assert stats == GapStats.from_timestamps(
+        [start, start + 3 * day, start + 3 * day, start + 9 * day]
+    )
+    assert (stats.count, stats.histogram) == (3, {0: 1, 3: 1, 6: 1})
+
+
+def test_cli_rejects_since_with_incremental():
+    runner = CliRunner()
+    with patch("cli.GitHubClient") as mock_client_cls:
+        for args in (["user", "me"], ["batch", "-"]):
+            result = runner.invoke(
+                app, [*args, "--incremental", "--since", "30"], input="me\n"
+            )
+            assert result.exit_code == 2
+            assert "--since" in result.output
+    mock_client_cls.assert_not_called()
+
+    with patch("cli.GitHubClient") as mock_client_cls, \
+         patch("cli.analyze_repositories") as mock_analyze:
+        mock_client_cls.return_value.iter_user_repositories.return_value = [REPO]
+        mock_analyze.return_value = "Report"
+        result = runner.invoke(app, ["user", "me", "--incremental"])
+    assert result.exit_code == 0
+    assert mock_analyze.call_args.kwargs["since"] is None
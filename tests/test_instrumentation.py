@@ -0,0 +1,169 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from typer.testing import CliRunner
+
+from cli import app
+from core.github_client import GitHubClient, Repository
+from core.instrumentation import RunStats, endpoint_of
+from core.use_cases import analyze_repositories
+
+runner = CliRunner()
+
+
+def _response(status, body=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = body
+    response.json.return_value = json.loads(body) if body else None
+    response.headers = headers or {}
+    return response
+
+
+def test_endpoint_templates():
+    assert endpoint_of("/repos/acme/app/commits") == "/repos/{repo}/commits"
+    assert endpoint_of("/users/alice/repos") == "/users/{user}/repos"
+    assert endpoint_of("/orgs/acme/repos") == "/orgs/{org}/repos"
+    assert endpoint_of("/rate_limit") == "/rate_limit"
+
+
+def test_phases_and_latency():
+    stats = RunStats()
+    with stats.phase("fetch"):
+        time.sleep(0.01)
+    with stats.phase("fetch"):
+        pass
+    stats.observe_latency("/users/a/repos", 0.02)
+    stats.observe_latency("/users/b/repos", 0.3)
+    stats.observe_latency("/users/c/repos", 30)
+
+    data = stats.to_dict()
+    assert data["phases_seconds"]["fetch"] >= 0.01
+    latency = data["latency"]["/users/{user}/repos"]
+    assert latency["count"] == 3
+    assert latency["buckets"]["0.05"] == 1
+    assert latency["buckets"]["0.5"] == 1
+    assert latency["buckets"]["+Inf"] == 1
+
+
+def test_prometheus_export():
+    stats = RunStats()
+    stats.incr("requests", 3)
+    stats.observe_latency("/orgs/acme/repos", 0.2)
+    stats.observe_latency("/orgs/acme/repos", 0.7)
+
+    text = stats.to_prometheus()
+    assert "# TYPE gct_requests_total counter" in text
+    assert "gct_requests_total 3" in text
+    # Buckets are cumulative
+    metric = 'gct_request_duration_seconds_bucket{endpoint="/orgs/{org}/repos"'
+    assert f'{metric},le="0.1"}} 0' in text
+    assert f'{metric},le="0.25"}} 1' in text
+    assert f'{metric},le="1.0"}} 2' in text
+    assert f'{metric},le="+Inf"}} 2' in text
+    assert 'gct_request_duration_seconds_count{endpoint="/orgs/{org}/repos"} 2' in text
+
+
+def test_client_records_requests_hits_and_revalidations():
+    url = "https://api.github.com/users/alice/repos"
+    body = b'[{"id": 1}]'
+    with patch("requests.Session.get") as mock_get:
+        mock_get.side_effect = [
+            _response(200, body, {"ETag": "abc"}),
+            _response(304),
+        ]
+        client = GitHubClient(token="abc", cache_dir="", ttl_seconds=3600)
+
+        client._request(url)
+        client._request(url)  # fresh hit
+        client.ttl_seconds = 0
+        client._request(url)  # stale, revalidated with a 304
+
+    counters = client.stats.to_dict()["counters"]
+    assert counters["requests"] == 2
+    assert counters["cache_hits"] == 1
+    assert counters["revalidations"] == 1
+    assert counters["bytes_downloaded"] == len(body)
+    latency = client.stats.to_dict()["latency"]["/users/{user}/repos"]
+    assert latency["count"] == 2
+
+
+def test_client_records_rate_limit_sleep():
+    sleeps = []
+    with patch("requests.Session.get") as mock_get:
+        mock_get.side_effect = [
+            _response(429, b"", {"Retry-After": "2"}),
+            _response(200, b"[]"),
+        ]
+        client = GitHubClient(token="abc", cache_dir="")
+        client.rate_limiter.sleep = sleeps.append
+        client._request("https://api.github.com/users/alice/repos")
+
+    assert sleeps == [2.0]
+    assert client.stats.to_dict()["counters"]["rate_limit_sleep_seconds"] == 2.0
+
+
+def test_analysis_phases(tmp_path):
+    client = GitHubClient(token="abc", cache_dir="")
+    client.iter_commits = MagicMock(
+        return_value=iter(
+            [
+                {"sha": "b", "commit": {"author": {"date": "2024-01-11T00:00:00Z"}}},
+                {"sha": "a", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}},
+            ]
+        )
+    )
+    repos = [Repository("app", "acme/app", False, 10, None, "", "")]
+    analyze_repositories(
+        client, repos, output_path=str(tmp_path / "report.md"), fmt="md"
+    )
+
+    phases = client.stats.to_dict()["phases_seconds"]
+    assert set(phases) == {"fetch", "fetch.parse", "metrics", "plot", "report"}
+    assert phases["fetch.parse"] <= phases["fetch"]
+
+    text = client.stats.to_text()
+    assert "Phase fetch/parse (summed across threads):" in text
+    prometheus = client.stats.to_prometheus()
+    assert 'gct_subphase_seconds_total{phase="fetch",subphase="parse"}' in prometheus
+    assert 'gct_phase_seconds_total{phase="fetch.parse"}' not in prometheus
+
+
+def test_cli_stats_file(tmp_path):
+    stats_file = tmp_path / "stats.prom"
+    with patch("core.github_client.GitHubClient.iter_user_repositories") as mock_iter, \
+         patch("cli.analyze_repositories") as mock_analyze:
+        mock_iter.return_value = [MagicMock()]
+        mock_analyze.return_value = "{}"
+        result = runner.invoke(
+            app,
+            [
+                "user", "alice", "--format", "json",
+                "--stats-format", "prometheus", "--stats-file", str(stats_file),
+            ],
+        )
+
+    assert result.exit_code == 0
+    assert "gct_requests_total" in stats_file.read_text()
+
+
+def test_cli_stats_json_on_stderr():
+    with patch("core.github_client.GitHubClient.iter_user_repositories") as mock_iter, \
+         patch("cli.analyze_repositories") as mock_analyze:
+        mock_iter.return_value = [MagicMock()]
+        mock_analyze.return_value = "{}"
+        result = runner.invoke(
+            app, ["user", "alice", "--stats", "--stats-format", "json"]
+        )
+
+    assert result.exit_code == 0
+    assert "counters" in json.loads(result.stderr)
+
+
+def test_cli_validates_stats_format():
+    with patch("cli.GitHubClient") as mock_client_cls:
+        result = runner.invoke(app, ["user", "alice", "--stats-format", "yaml"])
+    assert result.exit_code == 2
+    assert "'yaml'" in result.output
+    mock_client_cls.assert_not_called()
@@ -0,0 +1,110 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.github_client import GitHubAPIError, GitHubClient
+from core.rate_limit import RateLimiter
+
+
+def make_limiter(remaining, limit=5000, reset_in=100.0):
+    limiter = RateLimiter(clock=lambda: 1000.0, sleep=MagicMock())
+    limiter.update({
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(1000.0 + reset_in),
+    })
+    return limiter
+
+
+def make_response(status, headers=None, text="", data=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.text = text
+    response.json.return_value = data
+    response.content = json.dumps(data).encode()
+    return response
+
+
+def test_full_speed_while_budget_is_healthy():
+    assert make_limiter(remaining=4000).delay() == 0.0
+
+
+def test_paces_requests_over_the_window_when_budget_is_low():
+    limiter = make_limiter(remaining=100)
+
+    assert limiter.delay() == pytest.approx(1.0)
+    assert limiter.delay(priority=True) == 0.0
+
+
+def test_waits_for_reset_when_budget_is_exhausted():
+    limiter = make_limiter(remaining=0)
+
+    assert limiter.delay() == pytest.approx(101.0)
+    assert limiter.delay(priority=True) == pytest.approx(101.0)
+
+
+def test_client_retries_secondary_limit_with_retry_after(tmp_path):
+    responses = [
+        make_response(429, {"Retry-After": "7"}),
+        make_response(502),
+        make_response(200, {"X-RateLimit-Remaining": "10"}, data=[1]),
+    ]
+    with patch("requests.Session.get", side_effect=responses) as mock_get:
+        client = GitHubClient(token="abc", cache_dir=str(tmp_path))
+        client.rate_limiter.sleep = MagicMock()
+
+        assert client._request("https://api.github.com/test") == [1]
+
+        assert mock_get.call_count == 3
+        waits = [c.args[0] for c in client.rate_limiter.sleep.call_args_list]
+        assert waits == [7.0, 2.0]
+
+
+def test_client_does_not_retry_permission_errors(tmp_path):
+    with patch(
+        "requests.Session.get", return_value=make_response(403, text="Forbidden")
+    ) as mock_get:
+        client = GitHubClient(token="abc", cache_dir=str(tmp_path))
+
+        with pytest.raises(GitHubAPIError):
+            client._request("https://api.github.com/test")
+        mock_get.assert_called_once()
+
+
+def test_tokens_read_from_environment(tmp_path):
+    token_file = tmp_path / "tokens.txt"
+    token_file.write_text("# service tokens\nt1\n\nt2\n")
+
+    with patch.dict("os.environ", {"GITHUB_TOKENS": "a, b,a"}, clear=True):
+        assert GitHubClient(cache_dir="").token_pool.tokens == ["a", "b"]
+    with patch.dict(
+        "os.environ", {"GITHUB_TOKEN_FILE": str(token_file)}, clear=True
+    ):
+        assert GitHubClient(cache_dir="").token_pool.tokens == ["t1", "t2"]
+
+
+def test_pool_routes_to_token_with_most_headroom(tmp_path):
+    exhausted = make_response(
+        403,
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "9999999999"},
+        text="API rate limit exceeded",
+    )
+    ok = make_response(
+        200,
+        {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "9999999999"},
+        data=[1],
+    )
+    with patch("requests.Session.get", side_effect=[exhausted, ok]) as mock_get:
+        client = GitHubClient(cache_dir=str(tmp_path), tokens=["t1", "t2"])
+        for limiter in client.token_pool.limiters.values():
+            limiter.sleep = MagicMock()
+
+        assert client._request("https://api.github.com/test") == [1]
+
+        used = [c.kwargs["headers"]["Authorization"] for c in mock_get.call_args_list]
+        assert used == ["Bearer t1", "Bearer t2"]
+        for limiter in client.token_pool.limiters.values():
+            limiter.sleep.assert_not_called()
+        assert client.token_pool.choose()[0] == "t2"
@@ -0,0 +1,45 @@
+import sys
+
+from visualization.consistency_plot import ConsistencyPlot
+from visualization.render import render_charts
+from visualization.timeline_plot import TimelinePlot
+
+PNG_MAGIC = b"\x89PNG"
+
+
+def _jobs(directory, count):
+    jobs = []
+    for i in range(count):
+        gaps = ConsistencyPlot([1, 2, 2, 5])
+        timeline = TimelinePlot({2022: 3.0, 2023: 1.5})
+        jobs.append((gaps, str(directory / f"gaps{i}.png")))
+        jobs.append((timeline, str(directory / f"timeline{i}.png")))
+    return jobs
+
+
+def test_render_charts_in_worker_processes(tmp_path):
+    jobs = _jobs(tmp_path, 3)
+    paths = render_charts(jobs, processes=2)
+
+    assert paths == [path for _, path in jobs]
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read(4) == PNG_MAGIC
+
+
+def test_render_charts_in_process_without_pyplot(tmp_path):
+    jobs = _jobs(tmp_path, 1)
+    render_charts(jobs, processes=1)
+
+    for _, path in jobs:
+        with open(path, "rb") as f:
+            assert f.read(4) == PNG_MAGIC
+    assert "matplotlib.pyplot" not in sys.modules
+
+
+def test_empty_plots_write_nothing(tmp_path):
+    render_charts(
+        [(ConsistencyPlot([]), str(tmp_path / "a.png")),
+         (TimelinePlot({}), str(tmp_path / "b.png"))]
+    )
+    assert list(tmp_path.iterdir()) == []
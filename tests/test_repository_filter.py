@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from cli import app
+from core.github_client import Repository
+from core.repository_filter import RepositoryFilter
+
+runner = CliRunner()
+
+
+def _repo(name, fork=False, size=10, language="Python", pushed="2024-06-01T00:00:00Z",
+          archived=False):
+    return Repository(
+        name, f"acme/{name}", fork, size, language,
+        "2020-01-01T00:00:00Z", "2021-01-01T00:00:00Z", pushed, archived,
+    )
+
+
+REPOS = [
+    _repo("app"),
+    _repo("fork", fork=True),
+    _repo("empty", size=0),
+    _repo("old", pushed="2019-01-01T00:00:00Z"),
+    _repo("never-pushed", pushed=None),
+    _repo("site", language="HTML"),
+    _repo("notes", language=None),
+    _repo("legacy", archived=True),
+]
+
+
+def _names(repos):
+    return [repo.name for repo in repos]
+
+
+def test_default_filter_keeps_everything():
+    assert RepositoryFilter().apply(REPOS) == REPOS
+
+
+def test_filters_on_listing_metadata():
+    repo_filter = RepositoryFilter.from_options(
+        exclude_forks=True,
+        exclude_archived=True,
+        min_size_kb=1,
+        active_since="2022-01-01T00:00:00Z",
+    )
+    assert _names(repo_filter.apply(REPOS)) == ["app", "site", "notes"]
+
+
+def test_activity_falls_back_to_updated_at():
+    repo_filter = RepositoryFilter(active_since="2020-06-01T00:00:00Z")
+    # updated_at (2021) is recent enough for both
+    assert "old" in _names(repo_filter.apply(REPOS))
+    assert "never-pushed" in _names(repo_filter.apply(REPOS))
+
+
+def test_language_include_and_exclude_ignore_case():
+    only_python = RepositoryFilter.from_options(languages=["python"])
+    assert "site" not in _names(only_python.apply(REPOS))
+    assert "notes" not in _names(only_python.apply(REPOS))
+
+    no_html = RepositoryFilter.from_options(exclude_languages=["html"])
+    assert _names(no_html.apply(REPOS)) == [
+        name for name in _names(REPOS) if name != "site"
+    ]
+
+
+def test_cli_org_filters_before_top():
+    with patch("cli.GitHubClient") as mock_client_cls, \
+         patch("cli.analyze_repositories") as mock_analyze:
+        mock_client_cls.return_value.iter_org_repositories.return_value = REPOS
+        mock_analyze.return_value = "Report Content"
+
+        result = runner.invoke(
+            app,
+            ["org", "acme", "--exclude-forks", "--min-size", "1", "--top", "2"],
+        )
+
+    assert result.exit_code == 0
+    assert "Skipping 2 filtered repositories." in result.stdout
+    assert _names(mock_analyze.call_args.args[1]) == ["app", "old"]
@@ -0,0 +1,135 @@
+import random
+from collections import defaultdict
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from core.github_client import GitHubClient, Repository
+from core.repository_analyzer import RepositoryAnalyzer
+from core.repository_table import RepositoryTable
+
+
+def _random_repos(count, seed=5):
+    rng = random.Random(seed)
+
+    def iso():
+        epoch = rng.randrange(1_200_000_000, 1_800_000_000)
+        return datetime.fromtimestamp(epoch, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+
+    return [
+        Repository(
+            f"r{i}", f"me/r{i}", rng.random() < 0.2, rng.randrange(0, 5000),
+            rng.choice(["Python", "Go", "Rust", None]), iso(), iso(),
+            rng.choice([iso(), None]), rng.random() < 0.1,
+        )
+        for i in range(count)
+    ]
+
+
+def _reference_snapshots(repos):
+    # The per-object aggregation RepositoryAnalyzer used to do
+    grouped = defaultdict(list)
+    for repo in repos:
+        if not repo.is_fork:
+            grouped[int(repo.created_at[:4])].append(repo)
+    snapshots = []
+    for year, year_repos in sorted(grouped.items()):
+        languages = defaultdict(int)
+        for repo in year_repos:
+            if repo.language:
+                languages[repo.language] += 1
+        snapshots.append(
+            (
+                year,
+                len(year_repos),
+                round(sum(r.size_kb for r in year_repos) / len(year_repos), 2),
+                list(languages.items()),
+            )
+        )
+    return snapshots
+
+
+def test_repository_is_slotted():
+    repo = _random_repos(1)[0]
+    assert not hasattr(repo, "__dict__")
+    with pytest.raises(AttributeError):
+        repo.size_kb = 1
+
+
+def test_table_round_trips_rows():
+    repos = _random_repos(50)
+    table = RepositoryTable.from_repositories(repos)
+
+    assert len(table) == 50
+    assert list(table) == repos
+    assert table[7] == repos[7]
+    assert sorted(table.languages) == ["Go", "Python", "Rust"]
+    assert list(table.take(table.is_fork)) == [r for r in repos if r.is_fork]
+
+
+def test_snapshots_match_per_object_aggregation():
+    repos = _random_repos(2000)
+    table = RepositoryTable.from_repositories(repos)
+    snapshots = RepositoryAnalyzer(table).yearly_snapshots()
+
+    assert [
+        (s.year, s.total_repos, s.avg_size_kb, list(s.languages.items()))
+        for s in snapshots
+    ] == _reference_snapshots(repos)
+
+
+def test_group_by_year_keeps_listing_order():
+    repos = _random_repos(300)
+    grouped = RepositoryAnalyzer(repos).group_by_year()
+
+    for year, year_table in grouped.items():
+        assert year_table.full_names == [
+            r.full_name
+            for r in repos
+            if not r.is_fork and int(r.created_at[:4]) == year
+        ]
+    assert RepositoryAnalyzer([]).yearly_snapshots() == []
+
+
+def _listing_json(repo):
+    return {
+        "name": repo.name,
+        "full_name": repo.full_name,
+        "fork": repo.is_fork,
+        "size": repo.size_kb,
+        "language": repo.language,
+        "created_at": repo.created_at,
+        "updated_at": repo.updated_at,
+        "pushed_at": repo.pushed_at,
+        "archived": repo.is_archived,
+    }
+
+
+def test_table_from_listing_pages_matches_rows():
+    repos = _random_repos(250)
+    items = [_listing_json(repo) for repo in repos]
+    client = GitHubClient(token="abc", cache_dir="")
+    pages = [items[:100], items[100:200], items[200:], []]
+    client._request = MagicMock(side_effect=pages)
+
+    table = RepositoryTable.from_listing(client.iter_user_repository_pages("me"))
+    expected = RepositoryTable.from_repositories(repos)
+
+    assert list(table) == repos
+    assert table.languages == expected.languages
+    for column in ("is_fork", "is_archived", "size_kb", "pushed_at"):
+        np.testing.assert_array_equal(getattr(table, column), getattr(expected, column))
+
+
+def test_group_by_year_keeps_timestamps_exact():
+    repo = _random_repos(1)[0]
+    item = dict(_listing_json(repo), fork=False, created_at="2021-01-01T01:30:00+02:00")
+    grouped = RepositoryAnalyzer(RepositoryTable.from_listing([[item]])).group_by_year()
+
+    # 2020-12-31T23:30:00Z: grouped by the UTC year, epoch kept as parsed
+    assert list(grouped) == [2020]
+    assert grouped[2020].created_at.tolist() == [1609457400]
@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import urlopen
+
+import pytest
+
+from core.github_client import GitHubClient
+from core.server import TelemetryServer, TelemetryService
+
+REPOS = {"alice": ["alice/tool"], "bob": ["bob/app"]}
+COMMIT_DATES = ["2024-01-21T00:00:00Z", "2024-01-11T00:00:00Z", "2024-01-01T00:00:00Z"]
+
+
+class MockGitHub(ThreadingHTTPServer):
+    """
+    Minimal GitHub REST API: user repository listings and commit pages.
+    Slow enough that concurrent requests overlap.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), MockGitHubHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            status, body = self._route()
+        finally:
+            with server.lock:
+                server.active -= 1
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self):
+        url = urlsplit(self.path)
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        parts = url.path.strip("/").split("/")
+
+        if parts[0] == "users" and parts[2] == "repos":
+            if parts[1] not in REPOS:
+                return 404, {"message": "Not Found"}
+            names = REPOS[parts[1]] if page == 1 else []
+            return 200, [
+                {
+                    "name": name.split("/")[1],
+                    "full_name": name,
+                    "fork": False,
+                    "size": 10,
+                    "language": "Python",
+                    "created_at": "2023-01-01T00:00:00Z",
+                    "updated_at": "2024-01-21T00:00:00Z",
+                    "pushed_at": "2024-01-21T00:00:00Z",
+                }
+                for name in names
+            ]
+        if parts[0] == "repos" and parts[-1] == "commits":
+            return 200, [
+                {"sha": f"s{i}", "commit": {"author": {"date": date}}}
+                for i, date in enumerate(COMMIT_DATES)
+            ]
+        return 404, {"message": "Not Found"}
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def github():
+    server = MockGitHub()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _serve(github, max_concurrency=4, memory_cache_entries=0):
+    # No caches by default, so every analysis reaches the mock server
+    client = GitHubClient(
+        token="abc",
+        cache_dir="",
+        memory_cache_entries=memory_cache_entries,
+        api_url=github.url,
+    )
+    service = TelemetryService(client, max_concurrency=max_concurrency)
+    server = TelemetryServer(("127.0.0.1", 0), service, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _get(server, path):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    try:
+        with urlopen(url, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def telemetry(github):
+    server = _serve(github)
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.shutdown()
+
+
+def test_serves_json_report(telemetry):
+    status, body = _get(telemetry, "/user/alice?since=0")
+    assert status == 200
+    assert body == {"mean_gap_days": 10.0, "variance_gap_days": 0.0, "total_repos": 1}
+
+
+def test_concurrent_requests_share_one_computation(github, telemetry):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: _get(telemetry, "/user/alice"), range(8)))
+
+    assert all(status == 200 for status, _ in results)
+    listings = [path for path in github.requests if path.startswith("/users/")]
+    commits = [path for path in github.requests if "/commits" in path]
+    # One analysis: two listing pages (the second is empty) and one commit page
+    assert len(listings) == 2
+    assert len(commits) == 1
+
+    # Finished computations are not reused; the next request recomputes
+    _get(telemetry, "/user/alice")
+    assert len([p for p in github.requests if "/commits" in p]) == 2
+
+
+def test_bounded_concurrency(github):
+    server = _serve(github, max_concurrency=1)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda u: _get(server, f"/user/{u}"), ["alice", "bob"]))
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+    assert github.max_active == 1
+
+
+def test_warm_cache_across_requests(github):
+    server = _serve(github, memory_cache_entries=1024)
+    try:
+        _get(server, "/user/alice")
+        count = len(github.requests)
+        status, _ = _get(server, "/user/alice")
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.shutdown()
+
+    assert status == 200
+    assert len(github.requests) == count
+
+
+def test_errors(telemetry):
+    assert _get(telemetry, "/healthz") == (200, {"status": "ok"})
+    assert _get(telemetry, "/user/ghost")[0] == 502
+    assert _get(telemetry, "/user/..%2Fetc")[0] == 400
+    assert _get(telemetry, "/user/alice?since=soon")[0] == 400
+    assert _get(telemetry, "/repos/alice")[0] == 404
+
+
+def test_metrics_endpoint(telemetry):
+    _get(telemetry, "/user/alice")
+    url = f"http://127.0.0.1:{telemetry.server_port}/metrics"
+    with urlopen(url, timeout=10) as response:
+        text = response.read().decode("utf-8")
+
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert "gct_requests_total 3" in text
+    assert 'endpoint="/repos/{repo}/commits"' in text
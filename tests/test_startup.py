@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("numpy", "matplotlib")
+
+
+def _run(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", textwrap.dedent(code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _imported_modules(code):
+    # -X importtime writes one "import time: self | cumulative | name"
+    # line per module to stderr
+    result = _run(code, "-X", "importtime")
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_cli_import_skips_heavy_dependencies():
+    modules = _imported_modules("import cli")
+    assert "cli" in modules
+    for heavy in HEAVY_MODULES:
+        assert heavy not in modules
+
+
+def test_help_skips_heavy_dependencies():
+    result = _run(
+        """
+        import sys
+        from typer.testing import CliRunner
+        from cli import app
+
+        assert CliRunner().invoke(app, ["--help"]).exit_code == 0
+        print(",".join(m for m in ("numpy", "matplotlib") if m in sys.modules))
+        """
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_json_report_skips_matplotlib():
+    result = _run(
+        """
+        import sys
+        from core.github_client import GitHubClient, Repository
+        from core.use_cases import analyze_repositories
+
+        client = GitHubClient(token="abc", cache_dir="")
+        client.iter_commits = lambda *args, **kwargs: iter(
+            [{"sha": "a", "commit": {"author": {"date": "2024-01-01T00:00:00Z"}}}]
+        )
+        repos = [Repository("r", "u/r", False, 0, None, "", "")]
+        analyze_repositories(client, repos, fmt="json")
+        print("matplotlib" in sys.modules)
+        """
+    )
+    assert result.stdout.strip() == "False"
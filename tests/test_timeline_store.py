@@ -0,0 +1,98 @@
+import os
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from core.commit_dataset import CommitDataset
+from core.github_client import GitHubClient, Repository
+from core.timeline_store import TimelineStore
+
+REPO = Repository(
+    name="a",
+    full_name="me/a",
+    is_fork=False,
+    size_kb=1,
+    language=None,
+    created_at="2020-01-01T00:00:00Z",
+    updated_at="2021-01-01T00:00:00Z",
+    pushed_at="2021-01-10T00:00:00Z",
+)
+
+
+def test_timeline_roundtrip_is_memory_mapped(tmp_path):
+    store = TimelineStore(str(tmp_path), ttl_seconds=3600)
+    store.save("me/a", np.array([1, 2, 3], dtype=np.int64), since="2021-01-01")
+
+    loaded = store.load("me/a", since="2021-01-01")
+
+    assert isinstance(loaded, np.memmap)
+    assert loaded.tolist() == [1, 2, 3]
+    assert store.load("me/a") is None  # different since window
+
+
+def test_stale_timeline_is_fresh_while_pushed_at_matches(tmp_path):
+    store = TimelineStore(str(tmp_path), ttl_seconds=0)
+    store.save("me/a", np.array([5], dtype=np.int64), pushed_at="p1")
+    time.sleep(0.01)
+
+    assert store.load("me/a") is None
+    assert store.load("me/a", pushed_at="p2") is None
+    assert store.load("me/a", pushed_at="p1").tolist() == [5]
+
+
+def test_warm_run_reads_timeline_instead_of_api(tmp_path):
+    client = GitHubClient(token="abc", cache_dir=str(tmp_path))
+    client._request = MagicMock(return_value=[
+        {"sha": "b", "commit": {"author": {"date": "2021-01-05T00:00:00Z"}}},
+        {"sha": "a", "commit": {"author": {"date": "2021-01-01T00:00:00Z"}}},
+    ])
+
+    first = CommitDataset(client, repositories=[REPO])
+    first.prefetch()
+    client._request.reset_mock()
+
+    second = CommitDataset(client, repositories=[REPO])
+    second.prefetch()
+
+    client._request.assert_not_called()
+    assert second.gap_stats("me/a") == first.gap_stats("me/a")
+    assert second.gap_stats("me/a").total == 4
+
+
+def test_prune_drops_idle_timelines(tmp_path):
+    from typer.testing import CliRunner
+
+    from cli import app
+
+    store = TimelineStore(str(tmp_path / "timelines"), ttl_seconds=3600)
+    store.save("me/a", np.array([1], dtype=np.int64), since="2021-01-01")
+    store.save("me/a", np.array([1], dtype=np.int64), since="2021-01-02")
+    # Yesterday's window, last used 40 days ago
+    old = time.time() - 40 * 86400
+    os.utime(store.path("me/a", "2021-01-01", None), (old, old))
+    # Loading counts as use
+    os.utime(store.path("me/a", "2021-01-02", None), (old, old))
+    assert store.load("me/a", since="2021-01-02") is not None
+
+    assert store.stats().entries == 2
+    result = CliRunner().invoke(
+        app, ["cache", "prune", "--cache-dir", str(tmp_path), "--max-age-days", "30"]
+    )
+    assert result.exit_code == 0
+    assert "Removed 1 commit timelines." in result.stdout
+    assert store.load("me/a", since="2021-01-02") is not None
+    assert store.stats().entries == 1
+
+
+def test_saving_prunes_long_unused_timelines(tmp_path):
+    store = TimelineStore(str(tmp_path), ttl_seconds=3600)
+    store.save("me/a", np.array([1], dtype=np.int64), since="2021-01-01")
+    old = time.time() - 40 * 86400
+    os.utime(store.path("me/a", "2021-01-01", None), (old, old))
+
+    # A new process's first save sweeps the directory
+    TimelineStore(str(tmp_path), ttl_seconds=3600).save(
+        "me/a", np.array([1], dtype=np.int64), since="2021-01-02"
+    )
+    assert store.stats().entries == 1
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from core.repository_analyzer import RepositoryAnalyzer
+from core.github_client import Repository
+from core.timestamps import parse_timestamps, years_of
+
+
+def reference(date_str):
+    parsed = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def test_bulk_parser_matches_fromisoformat():
+    rng = random.Random(3)
+    date_strs = [
+        datetime.fromtimestamp(rng.randrange(0, 4_000_000_000), timezone.utc)
+        .strftime("%Y-%m-%dT%H:%M:%SZ")
+        for _ in range(1000)
+    ]
+    date_strs += [
+        "2024-02-29T23:30:00+05:30",
+        "2024-03-01T01:00:00-08:00",
+        "2019-07-04T12:00:00",
+        "2020-01-01T00:00:00.250Z",  # fractional seconds take the slow path
+    ]
+
+    assert parse_timestamps(date_strs).tolist() == [reference(d) for d in date_strs]
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "2024-13-45T25:61:61Z",
+        "2024-02-30T00:00:00Z",
+        "2023-02-29T00:00:00Z",
+        "2024-01-01T24:00:00",
+        "2024-01-01T00:00:60Z",
+        "2024-01-01T00:00:00+24:00",
+    ],
+)
+def test_bulk_parser_rejects_out_of_range_fields(date_str):
+    with pytest.raises(ValueError):
+        reference(date_str)
+    with pytest.raises(ValueError):
+        parse_timestamps(["2024-01-01T00:00:00Z", date_str])
+
+
+def test_years_of_and_group_by_year():
+    repos = [
+        Repository("a", "me/a", False, 10, "Python",
+                   "2019-12-31T23:59:59Z", "2020-01-01T00:00:00Z"),
+        Repository("b", "me/b", False, 20, "Go",
+                   "2020-01-01T00:00:00Z", "2020-01-01T00:00:00Z"),
+        Repository("c", "me/c", True, 30, "Go",
+                   "2020-06-01T00:00:00Z", "2020-06-01T00:00:00Z"),
+    ]
+
+    assert years_of(parse_timestamps(["1970-01-01T00:00:00Z"])).tolist() == [1970]
+    grouped = RepositoryAnalyzer(repos).group_by_year()
+    assert {year: [r.name for r in rs] for year, rs in grouped.items()} == {
+        2019: ["a"],
+        2020: ["b"],
+    }
@@ -1,5 +1,6 @@
-import matplotlib.pyplot as plt
-from typing import List
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from typing import Dict, List
 from pathlib import Path
 
 from core.github_client import GitHubClient
@@ -7,21 +8,31 @@ from core.metrics.consistency import ConsistencyMetric
 
 
 class ConsistencyPlot:
-    def __init__(self, gaps: List[int]) -> None:
+    def __init__(self, gaps: List[int], counts: List[int] | None = None) -> None:
+        # ``counts`` weights each gap, so a gap histogram can be plotted
+        # without expanding it
         self.gaps = gaps
+        self.counts = counts
+
+    @classmethod
+    def from_histogram(cls, histogram: Dict[int, int]) -> "ConsistencyPlot":
+        gaps = sorted(histogram)
+        return cls(gaps, [histogram[gap] for gap in gaps])
 
     def plot(self, output_path: str) -> None:
         if not self.gaps:
             return
 
-        plt.figure(figsize=(10, 5))
-        plt.hist(self.gaps, bins=20)
-        plt.title("Distribuição dos Intervalos entre Commits (dias)")
-        plt.xlabel("Dias entre commits")
-        plt.ylabel("Frequência")
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
+        # A standalone Agg figure: no pyplot state, no GUI backend
+        fig = Figure(figsize=(10, 5))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.hist(self.gaps, bins=20, weights=self.counts)
+        ax.set_title("Distribuição dos Intervalos entre Commits (dias)")
+        ax.set_xlabel("Dias entre commits")
+        ax.set_ylabel("Frequência")
+        fig.tight_layout()
+        fig.savefig(output_path)
 
 
 def plot_commit_gaps(username: str, output_dir: str = "reports") -> Path:
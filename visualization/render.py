@@ -0,0 +1,40 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Union
+
+from visualization.consistency_plot import ConsistencyPlot
+from visualization.timeline_plot import TimelinePlot
+
+# A chart and the file it is written to. Plots only hold plain data, so
+# jobs pickle cheaply into worker processes.
+ChartJob = Tuple[Union[ConsistencyPlot, TimelinePlot], str]
+
+
+def _render(job: ChartJob) -> str:
+    plot, output_path = job
+    plot.plot(output_path)
+    return output_path
+
+
+def render_charts(
+    jobs: Sequence[ChartJob], processes: Optional[int] = None
+) -> List[str]:
+    """
+    Render every chart, in parallel worker processes when there is more
+    than one, and return the output paths in job order.
+
+    Rendering is CPU-bound and matplotlib holds the GIL, so threads would
+    not help. ``processes`` defaults to one per CPU, capped at the number
+    of jobs.
+    """
+    jobs = list(jobs)
+    workers = min(len(jobs), processes or os.cpu_count() or 1)
+    if workers <= 1:
+        return [_render(job) for job in jobs]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_render, jobs))
+    except (OSError, NotImplementedError):
+        # No process support (restricted sandboxes); render in-process
+        return [_render(job) for job in jobs]
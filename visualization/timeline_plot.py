@@ -1,4 +1,5 @@
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from typing import Dict
 
 from core.github_client import GitHubClient
@@ -17,15 +18,16 @@ class TimelinePlot:
         years = sorted(self.data.keys())
         values = [self.data[y] for y in years]
 
-        plt.figure(figsize=(10, 5))
-        plt.plot(years, values, marker="o")
-        plt.title("Evolução da Regularidade de Commits ao Longo dos Anos")
-        plt.xlabel("Ano")
-        plt.ylabel("Média de dias entre commits")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.savefig(output_path)
-        plt.close()
+        fig = Figure(figsize=(10, 5))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.plot(years, values, marker="o")
+        ax.set_title("Evolução da Regularidade de Commits ao Longo dos Anos")
+        ax.set_xlabel("Ano")
+        ax.set_ylabel("Média de dias entre commits")
+        ax.grid(True)
+        fig.tight_layout()
+        fig.savefig(output_path)
 
 
 def plot_timeline(username: str, output_dir="reports") -> str: